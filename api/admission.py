@@ -0,0 +1,159 @@
+"""
+Control de admisión: límite de tasa por cliente (token bucket), tope
+global de peticiones en curso y una cola FIFO corta para el exceso.
+
+Todo corre en el hilo del event loop, así que no hace falta ningún lock:
+entre dos `await` el estado no cambia.
+"""
+
+import asyncio
+import math
+from collections import OrderedDict
+from time import monotonic
+from typing import Optional
+
+from datastructures.LinkedQueue import LinkedQueue
+from observability.metrics import registry
+
+admission_decisions = registry.counter(
+    "rentview_admission_decisions_total",
+    "Decisiones del control de admisión",
+    ("decision",),
+)
+
+
+class TokenBucket:
+    """Cubeta de fichas: `rate` fichas por segundo, hasta `capacity` acumuladas."""
+
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, capacity: float, now: float) -> None:
+        self.tokens = capacity
+        self.updated = now
+
+    def take(self, rate: float, capacity: float, now: float) -> float:
+        """
+        Consume una ficha si hay.
+
+        Returns:
+            0 si se consumió; si no, los segundos hasta que haya una
+        """
+        self.tokens = min(capacity, self.tokens + (now - self.updated) * rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / rate
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        rate: float = 0.0,
+        burst: int = 20,
+        max_in_flight: int = 64,
+        max_queue: int = 128,
+        queue_timeout: float = 1.0,
+        max_clients: int = 10_000,
+    ) -> None:
+        """
+        Args:
+            rate: Peticiones por segundo por cliente (0 desactiva el límite)
+            burst: Ráfaga máxima por cliente
+            max_in_flight: Peticiones atendidas a la vez
+            max_queue: Peticiones que pueden esperar turno
+            queue_timeout: Segundos máximos de espera en la cola
+            max_clients: Cubetas retenidas (se descartan las menos recientes)
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._queue: LinkedQueue[asyncio.Future] = LinkedQueue()
+        self.in_flight = 0
+        self.waiting = 0
+
+    def check_rate(self, client: str) -> float:
+        """0 si el cliente puede pasar; si no, segundos sugeridos de espera."""
+        if self.rate <= 0:
+            return 0.0
+        now = monotonic()
+        bucket = self._buckets.get(client)
+        if bucket is None:
+            bucket = self._buckets[client] = TokenBucket(self.burst, now)
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(client)
+        wait = bucket.take(self.rate, self.burst, now)
+        if wait:
+            admission_decisions.inc(("rejected_rate",))
+        return wait
+
+    async def acquire(self) -> Optional[str]:
+        """
+        Espera un lugar entre las peticiones en curso.
+
+        Returns:
+            None si la petición fue admitida (debe llamar a `release`), o
+            el motivo del rechazo: "queue_full" o "timeout"
+        """
+        if self.in_flight < self.max_in_flight and self.waiting == 0:
+            self.in_flight += 1
+            admission_decisions.inc(("admitted",))
+            return None
+        if self.waiting >= self.max_queue:
+            admission_decisions.inc(("rejected_queue_full",))
+            return "queue_full"
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._queue.enqueue(future)
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(future, self.queue_timeout)
+        except asyncio.TimeoutError:
+            if future.done() and not future.cancelled():
+                # El lugar llegó justo al vencer el plazo: se aprovecha.
+                admission_decisions.inc(("admitted_after_wait",))
+                return None
+            self.waiting -= 1
+            self._purge()
+            admission_decisions.inc(("rejected_timeout",))
+            return "timeout"
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()
+            else:
+                self.waiting -= 1
+            raise
+        admission_decisions.inc(("admitted_after_wait",))
+        return None
+
+    def release(self) -> None:
+        """Libera el lugar; si alguien espera, se lo pasa en orden FIFO."""
+        while not self._queue.is_empty():
+            future = self._queue.dequeue()
+            if not future.done():
+                # El lugar pasa directo al siguiente: in_flight no cambia.
+                self.waiting -= 1
+                future.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def retry_after(self) -> int:
+        """Segundos sugeridos en Retry-After cuando el servidor está saturado."""
+        return max(1, math.ceil(self.queue_timeout))
+
+    def _purge(self) -> None:
+        # Las esperas vencidas quedan en la cola hasta que `release` las
+        # saltea; si se acumulan demasiadas, se reconstruye la cola.
+        if self._queue.size() <= 2 * self.max_queue:
+            return
+        pending: LinkedQueue[asyncio.Future] = LinkedQueue()
+        for future in self._queue:
+            if not future.done():
+                pending.enqueue(future)
+        self._queue = pending
@@ -0,0 +1,126 @@
+"""
+Archivos estáticos con huella de contenido y precomprimidos.
+
+Al arrancar se lee cada archivo de `static/`, se calcula un hash de su
+contenido y se guarda junto con su versión gzip. Las plantillas piden la
+URL con `asset("css/styles.css")`, que devuelve p. ej.
+"/static/css/styles.3f2a9c1b7d.css": como la URL cambia cuando cambia el
+contenido, la respuesta se puede cachear para siempre (immutable) y las
+visitas repetidas no vuelven a pedir el archivo.
+
+Las URL sin huella siguen funcionando a través de StaticFiles, sin
+cabeceras de caché largas.
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+from typing import Dict, List, Optional, Tuple
+
+from api.middleware import ASGIApp, Receive, Scope, Send
+
+IMMUTABLE = b"public, max-age=31536000, immutable"
+
+
+def _media_type(path: str) -> str:
+    media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    return f"{media_type}; charset=utf-8" if media_type.startswith("text/") else media_type
+
+
+class Asset:
+    __slots__ = ("path", "url", "body", "gzipped", "etag", "media_type")
+
+    def __init__(self, path: str, url: str, body: bytes, gzipped: Optional[bytes], etag: bytes, media_type: str) -> None:
+        self.path = path
+        self.url = url
+        self.body = body
+        self.gzipped = gzipped
+        self.etag = etag
+        self.media_type = media_type
+
+
+class AssetManifest:
+    def __init__(self, directory: str, prefix: str = "/static") -> None:
+        self.directory = directory
+        self.prefix = prefix
+        self._by_path: Dict[str, Asset] = {}
+        self._by_fingerprint: Dict[str, Asset] = {}
+
+    def build(self) -> None:
+        """Calcula huellas y versiones gzip de todos los archivos (una vez, al arrancar)."""
+        self._by_path.clear()
+        self._by_fingerprint.clear()
+        for root, _dirs, files in os.walk(self.directory):
+            for name in sorted(files):
+                full = os.path.join(root, name)
+                path = os.path.relpath(full, self.directory).replace(os.sep, "/")
+                with open(full, "rb") as fh:
+                    body = fh.read()
+                digest = hashlib.sha256(body).hexdigest()[:10]
+                stem, ext = os.path.splitext(path)
+                fingerprinted = f"{stem}.{digest}{ext}"
+                gzipped = gzip.compress(body, compresslevel=9, mtime=0)
+                asset = Asset(
+                    path=path,
+                    url=f"{self.prefix}/{fingerprinted}",
+                    body=body,
+                    # Sólo se guarda si de verdad ahorra bytes (imágenes ya comprimidas, no).
+                    gzipped=gzipped if len(gzipped) < len(body) else None,
+                    etag=f'"{digest}"'.encode(),
+                    media_type=_media_type(path),
+                )
+                self._by_path[path] = asset
+                self._by_fingerprint[fingerprinted] = asset
+
+    def url(self, path: str) -> str:
+        """URL con huella para usar en las plantillas (la URL simple si el archivo no existe)."""
+        asset = self._by_path.get(path)
+        return asset.url if asset is not None else f"{self.prefix}/{path}"
+
+    def get(self, fingerprinted: str) -> Optional[Asset]:
+        return self._by_fingerprint.get(fingerprinted)
+
+
+class StaticAssets:
+    """
+    App ASGI para el montaje de /static: sirve desde memoria las URL con
+    huella (gzip si el cliente lo acepta, ETag y caché immutable) y delega
+    el resto en `fallback` (StaticFiles).
+    """
+
+    def __init__(self, manifest: AssetManifest, fallback: ASGIApp) -> None:
+        self.manifest = manifest
+        self.fallback = fallback
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Dentro de un montaje, `path` sigue siendo la ruta completa y
+        # `root_path` trae el prefijo del montaje.
+        path = scope["path"]
+        root_path = scope.get("root_path", "")
+        if path.startswith(root_path):
+            path = path[len(root_path):]
+        asset = self.manifest.get(path.lstrip("/"))
+        if asset is None or scope["method"] not in ("GET", "HEAD"):
+            await self.fallback(scope, receive, send)
+            return
+
+        request_headers = dict(scope["headers"])
+        headers: List[Tuple[bytes, bytes]] = [
+            (b"cache-control", IMMUTABLE),
+            (b"etag", asset.etag),
+            (b"vary", b"Accept-Encoding"),
+        ]
+        if request_headers.get(b"if-none-match") == asset.etag:
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        body = asset.body
+        if asset.gzipped is not None and b"gzip" in request_headers.get(b"accept-encoding", b"").lower():
+            body = asset.gzipped
+            headers.append((b"content-encoding", b"gzip"))
+        headers.append((b"content-type", asset.media_type.encode()))
+        headers.append((b"content-length", str(len(body)).encode()))
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": body if scope["method"] == "GET" else b""})
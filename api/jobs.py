@@ -0,0 +1,336 @@
+"""
+Planificador de trabajos en segundo plano: barridos de huérfanos,
+recálculo de agregados y demás mantenimiento que no debe correr dentro
+de una petición.
+
+Los trabajos corren en el event loop, en `workers` tareas asyncio, igual
+que los handlers: las estructuras de los repositorios no tienen locks y
+así un trabajo nunca se intercala a mitad de una escritura. Un trabajo
+largo debe ser una corrutina que ceda (`await asyncio.sleep(0)`) entre
+tramos para no frenar las peticiones.
+
+Hay dos montículos: `_timers` ordena por hora de ejecución y `_ready` por
+prioridad (menor número = más urgente). Cada worker pasa a `_ready` lo
+que ya venció y toma el más prioritario. Cancelar marca el trabajo y los
+montículos lo descartan al sacarlo.
+
+Un trabajo con `retry` tiene que terminar (p. ej. un barrido que deja
+entidades ocultas hasta completarse): no se puede cancelar, y si falla
+o lo corta un `stop` vuelve a encolarse.
+"""
+
+import asyncio
+import heapq
+import inspect
+from collections import deque
+from dataclasses import dataclass
+from itertools import count
+from time import monotonic, perf_counter
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, List, Optional, Tuple
+
+JobFn = Callable[[], Optional[Awaitable[None]]]
+
+# Prioridades sugeridas.
+URGENT = -10
+NORMAL = 0
+DEFERRED = 10
+
+
+@dataclass(slots=True, eq=False)
+class Job:
+    id: int
+    name: str
+    fn: JobFn
+    priority: int = NORMAL
+    # Segundos entre ejecuciones; None = una sola vez.
+    interval: Optional[float] = None
+    # Momento (monotonic) de la próxima ejecución.
+    due: float = 0.0
+    # Clave de deduplicación: mientras haya un trabajo pendiente con la
+    # misma clave, encolar otro devuelve el existente.
+    key: Optional[Hashable] = None
+    # Segundos antes de reintentar un fallo; None = no se reintenta.
+    retry: Optional[float] = None
+    state: str = "pending"  # "pending" | "running" | "done" | "failed" | "cancelled"
+    cancelled: bool = False
+    runs: int = 0
+    failures: int = 0
+    last_error: Optional[str] = None
+    last_duration: float = 0.0
+
+    def describe(self, now: float) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "priority": self.priority,
+            "interval": self.interval,
+            "state": self.state,
+            "due_in": round(max(self.due - now, 0.0), 3) if self.state == "pending" else None,
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_error": self.last_error,
+            "last_duration_ms": round(self.last_duration * 1000, 3),
+        }
+
+
+class JobScheduler:
+    def __init__(self, workers: int = 2, history: int = 100) -> None:
+        self.workers = workers
+        self._timers: List[Tuple[float, int, Job]] = []
+        self._ready: List[Tuple[int, int, Job]] = []
+        # Trabajos vivos (pendientes o corriendo) por id y por clave.
+        self._jobs: Dict[int, Job] = {}
+        self._keys: Dict[Hashable, Job] = {}
+        self._finished: Deque[Job] = deque(maxlen=history)
+        self._ids = count(1)
+        self._seq = count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: List["asyncio.Task[None]"] = []
+        self.completed = 0
+        self.failed = 0
+
+    def configure(self, workers: int, history: int) -> None:
+        """Cambia el tamaño del pool (al próximo `start`) y del historial."""
+        self.workers = workers
+        self._finished = deque(self._finished, maxlen=history)
+
+    @property
+    def started(self) -> bool:
+        return bool(self._tasks)
+
+    def submit(
+        self,
+        name: str,
+        fn: JobFn,
+        priority: int = NORMAL,
+        delay: float = 0.0,
+        key: Optional[Hashable] = None,
+    ) -> Job:
+        """
+        Encola un trabajo de una sola vez. `fn` puede ser una función o
+        devolver un awaitable. Sólo desde el hilo del event loop.
+        """
+        if key is not None:
+            pending = self._keys.get(key)
+            if pending is not None:
+                return pending
+        job = Job(next(self._ids), name, fn, priority, due=monotonic() + delay, key=key)
+        self._schedule(job)
+        return job
+
+    def every(
+        self,
+        name: str,
+        fn: JobFn,
+        interval: float,
+        priority: int = NORMAL,
+        delay: Optional[float] = None,
+    ) -> Job:
+        """
+        Trabajo periódico: corre cada `interval` segundos (contados desde
+        que termina la ejecución anterior). Un fallo no lo detiene.
+
+        Raises:
+            ValueError: Si el intervalo no es positivo
+        """
+        if interval <= 0:
+            raise ValueError("interval must be > 0")
+        first = interval if delay is None else delay
+        job = Job(next(self._ids), name, fn, priority, interval=interval, due=monotonic() + first)
+        self._schedule(job)
+        return job
+
+    def defer(
+        self,
+        name: str,
+        fn: JobFn,
+        key: Optional[Hashable] = None,
+        retry: Optional[float] = None,
+    ) -> Optional[Job]:
+        """
+        Trabajo diferido (p. ej. un barrido de huérfanos). Si el
+        planificador no está corriendo (scripts, benchmarks) se ejecuta en
+        el momento, así el resultado final es el mismo con o sin la app.
+        Con `retry` el trabajo no se puede cancelar y se reintenta tras un
+        fallo.
+        """
+        if not self.started:
+            _run_now(fn)
+            return None
+        job = self.submit(name, fn, DEFERRED, key=key)
+        job.retry = retry
+        return job
+
+    def cancel(self, job_id: int) -> bool:
+        """
+        Cancela un trabajo pendiente, o las próximas ejecuciones de uno
+        periódico. False si no existe, es uno de una vez ya en curso o
+        tiene que terminar (`retry`).
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.retry is not None or (job.state == "running" and job.interval is None):
+            return False
+        job.cancelled = True
+        self._forget_key(job)
+        if job.state == "pending":
+            job.state = "cancelled"
+            self._finish(job)
+        return True
+
+    def get(self, job_id: int) -> Optional[Job]:
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return job
+        return next((job for job in self._finished if job.id == job_id), None)
+
+    def _schedule(self, job: Job) -> None:
+        self._jobs[job.id] = job
+        if job.key is not None:
+            self._keys[job.key] = job
+        heapq.heappush(self._timers, (job.due, next(self._seq), job))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _forget_key(self, job: Job) -> None:
+        if job.key is not None and self._keys.get(job.key) is job:
+            del self._keys[job.key]
+
+    def _requeue(self, job: Job, delay: float) -> None:
+        job.state = "pending"
+        job.due = monotonic() + delay
+        heapq.heappush(self._timers, (job.due, next(self._seq), job))
+
+    def _finish(self, job: Job) -> None:
+        self._jobs.pop(job.id, None)
+        self._finished.append(job)
+
+    def _next_ready(self, now: float) -> Optional[Job]:
+        timers, ready = self._timers, self._ready
+        while timers and timers[0][0] <= now:
+            _due, seq, job = heapq.heappop(timers)
+            if not job.cancelled:
+                heapq.heappush(ready, (job.priority, seq, job))
+        while ready:
+            _priority, _seq, job = heapq.heappop(ready)
+            if not job.cancelled:
+                return job
+        return None
+
+    async def _take(self) -> Job:
+        wakeup = self._wakeup
+        assert wakeup is not None
+        while True:
+            # Se limpia antes de mirar los montículos: un submit posterior
+            # vuelve a activarlo y la espera de abajo no se lo pierde.
+            wakeup.clear()
+            now = monotonic()
+            job = self._next_ready(now)
+            if job is not None:
+                return job
+            timeout = self._timers[0][0] - now if self._timers else None
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run(self, job: Job) -> None:
+        job.state = "running"
+        # Lo que llegue con la misma clave mientras corre es trabajo nuevo.
+        self._forget_key(job)
+        started = perf_counter()
+        failed = False
+        try:
+            result = job.fn()
+            if inspect.isawaitable(result):
+                await result
+        except asyncio.CancelledError:
+            job.last_duration = perf_counter() - started
+            if job.retry is not None:
+                # Lo corta un `stop`: queda pendiente para el próximo `start`.
+                self._requeue(job, 0.0)
+            else:
+                job.state = "cancelled"
+                self._finish(job)
+            raise
+        except Exception as exc:
+            failed = True
+            job.failures += 1
+            job.last_error = f"{type(exc).__name__}: {exc}"
+            self.failed += 1
+        else:
+            self.completed += 1
+        job.runs += 1
+        job.last_duration = perf_counter() - started
+        if job.interval is not None and not job.cancelled:
+            self._requeue(job, job.interval)
+            return
+        if failed and job.retry is not None:
+            self._requeue(job, job.retry)
+            return
+        job.state = "cancelled" if job.cancelled else "failed" if failed else "done"
+        self._finish(job)
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._take()
+            await self._run(job)
+
+    def start(self) -> None:
+        """Arranca el pool de workers en el event loop actual (desde el lifespan)."""
+        if self._tasks:
+            return
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"job-worker-{i}") for i in range(max(1, self.workers))
+        ]
+
+    async def stop(self) -> None:
+        """
+        Detiene los workers. Los trabajos en curso se cancelan; los
+        pendientes quedan encolados para un próximo `start`.
+        """
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._wakeup = None
+
+    def pending(self) -> int:
+        return sum(1 for job in self._jobs.values() if job.state == "pending")
+
+    def running(self) -> int:
+        return sum(1 for job in self._jobs.values() if job.state == "running")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Trabajos vivos (por próxima ejecución) y los últimos terminados."""
+        now = monotonic()
+        live = sorted(self._jobs.values(), key=lambda job: (job.state != "running", job.due, job.priority))
+        return {
+            "started": self.started,
+            "workers": len(self._tasks) or self.workers,
+            "completed": self.completed,
+            "failed": self.failed,
+            "jobs": [job.describe(now) for job in live],
+            "finished": [job.describe(now) for job in reversed(self._finished)],
+        }
+
+
+def _run_now(fn: JobFn) -> None:
+    """
+    Corre un trabajo hasta el final sin event loop propio. Una corrutina
+    se avanza a mano: sólo puede ceder con `asyncio.sleep(0)`, que no
+    espera nada.
+    """
+    result = fn()
+    if not inspect.iscoroutine(result):
+        return
+    try:
+        while True:
+            if result.send(None) is not None:
+                result.close()
+                raise RuntimeError("a job run inline can only yield with asyncio.sleep(0)")
+    except StopIteration:
+        pass
+
+
+jobs = JobScheduler()
@@ -1,24 +1,190 @@
-from typing import List
-
-from fastapi import FastAPI, HTTPException, Request, Form, status
-from fastapi.responses import HTMLResponse, RedirectResponse
+import json
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Literal, NamedTuple, Optional, Tuple
+
+from fastapi import FastAPI, HTTPException, Request, Form, Query, status
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, RedirectResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, ValidationError
 
 from services.property_service import property_service
 from services.review_service import review_service
 from services.comment_service import comment_service
 from services.favorites_service import favorites_service
+from services.activity_service import activity_service
 from domain.property import Property
 from domain.review import Review
 from domain.comment import Comment
+from repository.activity import Activity, activity_log
+from repository.changelog import ChangeEntry, change_log
+from repository.comment_repository import ThreadEntry, comment_repository
+from repository.events import Change, events
+from repository.favorites_repository import favorites_repository
+from repository.history import edit_history
+from repository.query import Predicate, QuerySpec, parse_ids, parse_query, rating_predicates
+from repository.similarity import DuplicateReviewError, review_similarity
+from repository.review_repository import review_repository
+from repository.trending import DECAY_STEPS, view_stats
+from observability.metrics import registry
+from observability.profiler import StackSampler, profile_store
+from observability.tracing import trace_store
+from api.admission import AdmissionController
+from api.assets import AssetManifest, StaticAssets
+from api.jobs import jobs
+from api.memory import memory_report
+from api.metrics import register_admission, register_collectors, register_changelog, register_jobs, register_read_cache, register_stream
+from api.middleware import (
+    AdmissionMiddleware,
+    CompressionMiddleware,
+    MetricsMiddleware,
+    ProfilerMiddleware,
+    TracingMiddleware,
+)
+from api.projection import Serializer, Shape, compile_serializer
+from api.read_cache import Tag, read_cache
+from api.settings import settings
+from api.stream import change_stream, parse_topics
+from api.tracing import instrument_layers
+
+
+class OrphanSweep(NamedTuple):
+    name: str
+    sweep: Callable[[int], Any]
+
+
+# Entidad borrada -> barridos de lo que colgaba de ella.
+ORPHAN_SWEEPS: Dict[str, Tuple[OrphanSweep, ...]] = {
+    "property": (
+        OrphanSweep("sweep reviews of property", review_repository.delete_by_property),
+        OrphanSweep("unfavorite property", favorites_repository.remove),
+    ),
+    "review": (OrphanSweep("sweep comments of review", comment_repository.delete_by_review),),
+}
+
+
+def schedule_sweeps(change: Change) -> None:
+    """
+    Suscriptor de eventos: encola el barrido físico de los huérfanos de un
+    borrado. Los huérfanos siguen ocultos hasta que el barrido termina, así
+    que no se puede cancelar y se reintenta si falla.
+    """
+    if change.op != "delete" or change.entity_id is None:
+        return
+    entity_id = change.entity_id
+    for sweep in ORPHAN_SWEEPS.get(change.entity, ()):
+        jobs.defer(
+            f"{sweep.name} {entity_id}",
+            partial(sweep.sweep, entity_id),
+            key=(sweep.name, entity_id),
+            retry=settings.sweep_retry,
+        )
 
-app = FastAPI(title="RentView - Housing Reviews")
 
-# Static files (CSS) y templates (HTML)
-app.mount("/static", StaticFiles(directory="static"), name="static")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Arranca el planificador de trabajos con la app: los barridos de
+    huérfanos (ver `schedule_sweeps`) y los trabajos periódicos.
+    """
+    periodic = []
+    if settings.changelog_compact_interval > 0:
+        periodic.append(jobs.every("changelog compaction", change_log.compact, settings.changelog_compact_interval))
+    if settings.trending_half_life > 0:
+        periodic.append(jobs.every("trending decay", view_stats.maintain, settings.trending_half_life / DECAY_STEPS))
+    jobs.start()
+    try:
+        yield
+    finally:
+        await jobs.stop()
+        for job in periodic:
+            jobs.cancel(job.id)
+
+
+app = FastAPI(title="RentView - Housing Reviews", lifespan=lifespan)
+jobs.configure(settings.job_workers, settings.job_history)
+edit_history.configure(settings.history_per_entity, settings.history_max_entries, settings.history_max_bytes)
+activity_log.configure(
+    settings.activity_feed_size,
+    settings.activity_bucket_seconds,
+    settings.activity_retention_hours,
+    settings.activity_max_entries,
+)
+# El último middleware agregado es el más externo: la admisión queda
+# dentro de las métricas para que los 429/503 también se cuenten, y la
+# compresión queda dentro de todo para que su costo entre en la latencia.
+admission = AdmissionController(
+    rate=settings.rate_limit,
+    burst=settings.rate_burst,
+    max_in_flight=settings.max_in_flight,
+    max_queue=settings.max_queue,
+    queue_timeout=settings.queue_timeout,
+)
+if settings.gzip:
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.gzip_min_size, level=settings.gzip_level)
+if settings.admission:
+    app.add_middleware(AdmissionMiddleware, controller=admission)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(
+    ProfilerMiddleware,
+    sampler=StackSampler(settings.profile_interval),
+    store=profile_store,
+    sample_rate=settings.profile_sample_rate,
+    header=settings.profile_header,
+)
+if settings.tracing:
+    instrument_layers()
+    trace_store.configure(settings.trace_buffer, settings.trace_file)
+    app.add_middleware(
+        TracingMiddleware,
+        sample_rate=settings.trace_sample_rate,
+        header=settings.trace_header,
+    )
+# El registro de cambios se suscribe primero: los suscriptores que
+# siguen pueden emitir otras escrituras (barridos en el momento) y éstas
+# deben quedar después de la que las causó.
+change_log.configure(settings.changelog_max_entries)
+events.subscribe(change_log.record)
+read_cache.configure(settings.read_cache_ttl, settings.read_cache_entries)
+events.subscribe(read_cache.invalidate)
+view_stats.configure(settings.trending_width, settings.trending_depth, settings.trending_top_k, settings.trending_half_life)
+events.subscribe(view_stats.on_change)
+# Al borrar una propiedad o reseña, lo que cuelga de ella deja de verse
+# en el momento (los repositorios lo ocultan) y se barre en segundo plano
+# (o en el momento si el planificador no corre).
+events.subscribe(review_repository.on_change)
+events.subscribe(comment_repository.on_change)
+events.subscribe(schedule_sweeps)
+change_stream.configure(
+    settings.stream_queue_size,
+    settings.stream_overflow,
+    settings.stream_heartbeat,
+    settings.stream_max_subscribers,
+)
+events.subscribe(change_stream.publish)
+review_similarity.configure(
+    settings.duplicate_policy,
+    settings.duplicate_threshold,
+    settings.duplicate_num_perm,
+    settings.duplicate_bands,
+    settings.duplicate_max_bucket,
+)
+register_collectors()
+register_admission(admission)
+register_read_cache(read_cache)
+register_jobs(jobs)
+register_stream(change_stream)
+register_changelog(change_log)
+
+# Static files (CSS) y templates (HTML). Las plantillas usan
+# asset("css/styles.css") para obtener la URL con huella de contenido.
+assets = AssetManifest("static")
+assets.build()
+app.mount("/static", StaticAssets(assets, StaticFiles(directory="static")), name="static")
 templates = Jinja2Templates(directory="templates")
+templates.env.globals["asset"] = assets.url
 
 
 # =========================
@@ -51,12 +217,56 @@ class ReviewUpdate(BaseModel):
 
 class CommentCreate(BaseModel):
     body: str
+    parent_id: Optional[int] = None
 
 
 class CommentUpdate(BaseModel):
     body: str
 
 
+class BatchOperation(BaseModel):
+    op: Literal["get", "create", "update", "delete"]
+    entity: Literal["property", "review", "comment"]
+    id: Optional[int] = None
+    # Padre de una reseña o comentario nuevo.
+    property_id: Optional[int] = None
+    review_id: Optional[int] = None
+    data: Dict[str, Any] = Field(default_factory=dict)
+
+
+class BatchRequest(BaseModel):
+    operations: List[BatchOperation] = Field(..., max_length=100)
+
+
+# =========================
+# Helpers de consultas
+# =========================
+
+# Campos por los que se puede filtrar y ordenar, con su tipo.
+PROPERTY_FIELDS = {"id": int, "address": str, "body": str, "rating": int}
+REVIEW_FIELDS = {"id": int, "property_id": int, "title": str, "body": str, "rating": int}
+
+
+def build_query(
+    filter_expr: Optional[str],
+    sort: Optional[str],
+    limit: Optional[int],
+    fields: Dict[str, type],
+    rating: Optional[int] = None,
+    min_rating: Optional[int] = None,
+    max_rating: Optional[int] = None,
+    ids: Optional[str] = None,
+) -> QuerySpec:
+    try:
+        spec = parse_query(filter_expr, sort, limit, fields)
+        if ids is not None:
+            spec.predicates.append(Predicate("id", "in", parse_ids(ids)))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    spec.predicates.extend(rating_predicates(rating, min_rating, max_rating))
+    return spec
+
+
 # =========================
 # Helpers de serialización
 # =========================
@@ -70,6 +280,10 @@ def serialize_property(prop: Property) -> dict:
     }
 
 
+def timestamp(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat(timespec="seconds")
+
+
 def serialize_review(review: Review) -> dict:
     return {
         "id": review.id,
@@ -77,6 +291,8 @@ def serialize_review(review: Review) -> dict:
         "title": review.title,
         "body": review.body,
         "rating": review.rating,
+        "created_at": timestamp(review.created_at),
+        "duplicate_of": review.duplicate_of,
     }
 
 
@@ -84,10 +300,116 @@ def serialize_comment(comment: Comment) -> dict:
     return {
         "id": comment.id,
         "review_id": comment.review_id,
+        "parent_id": comment.parent_id,
         "body": comment.body,
+        "created_at": timestamp(comment.created_at),
     }
 
 
+# Formas para `?expand=` y `?fields=`: los mismos campos que los
+# serializadores de arriba, uno por uno, y las relaciones expandibles.
+COMMENT_SHAPE = Shape({
+    "id": lambda c: c.id,
+    "review_id": lambda c: c.review_id,
+    "parent_id": lambda c: c.parent_id,
+    "body": lambda c: c.body,
+    "created_at": lambda c: timestamp(c.created_at),
+})
+REVIEW_SHAPE = Shape(
+    {
+        "id": lambda r: r.id,
+        "property_id": lambda r: r.property_id,
+        "title": lambda r: r.title,
+        "body": lambda r: r.body,
+        "rating": lambda r: r.rating,
+        "created_at": lambda r: timestamp(r.created_at),
+        "duplicate_of": lambda r: r.duplicate_of,
+    },
+    {"comments": (Review.get_comments, COMMENT_SHAPE)},
+)
+PROPERTY_SHAPE = Shape(
+    {
+        "id": lambda p: p.id,
+        "address": lambda p: p.address,
+        "body": lambda p: p.body,
+        "rating": lambda p: p.rating,
+    },
+    {"reviews": (Property.get_reviews, REVIEW_SHAPE)},
+)
+
+
+def projection(shape: Shape, default: Serializer, expand: Optional[str], fields: Optional[str]) -> Serializer:
+    try:
+        return compile_serializer(shape, default, expand, fields)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+def serialize_activity(activity: Activity) -> dict:
+    serialize = serialize_review if activity.kind == "review" else serialize_comment
+    return {"kind": activity.kind, activity.kind: serialize(activity.entity)}
+
+
+def nest_thread(entries: Iterable[ThreadEntry]) -> List[dict]:
+    """
+    Anida un hilo en preorden en una sola pasada: la pila guarda las listas
+    de respuestas abiertas con la profundidad de su dueño.
+    """
+    top: List[dict] = []
+    open_lists: List[tuple] = [(-1, top)]
+    for entry in entries:
+        while open_lists[-1][0] >= entry.depth:
+            open_lists.pop()
+        node = serialize_comment(entry.comment)
+        node["reply_count"] = entry.replies
+        node["replies"] = []
+        open_lists[-1][1].append(node)
+        open_lists.append((entry.depth, node["replies"]))
+    return top
+
+
+def encode_list(items: Iterable[Any], serialize: Callable[[Any], dict]) -> str:
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    return "[" + ",".join(encode(serialize(item)) for item in items) + "]"
+
+
+def json_list(items: Iterable[Any], serialize: Callable[[Any], dict]) -> Response:
+    """
+    Serializa una vista directamente al cuerpo JSON de la respuesta.
+
+    Devolver una Response evita que FastAPI valide y copie la lista contra
+    `response_model` y la vuelva a recorrer con jsonable_encoder; cada
+    elemento se convierte a dict y a texto una sola vez.
+    """
+    return Response(content=encode_list(items, serialize), media_type="application/json")
+
+
+# Los favoritos muestran propiedades completas: cambian con cualquier
+# favorito y con cualquier propiedad.
+FAVORITES_TAGS: Tuple[Tag, ...] = (("favorite", None), ("property", None))
+
+
+async def coalesced(key: tuple, compute: Callable[[], str], tags: Iterable[Tag] = ()) -> str:
+    """
+    Calcula una lectura caliente (cuerpo ya renderizado) a través de
+    `read_cache`: peticiones idénticas simultáneas comparten el cálculo.
+    `tags` son las entidades de las que depende (ver api.read_cache).
+    """
+    if not settings.read_coalescing:
+        return compute()
+    return await read_cache.get(key, compute, tags)
+
+
+async def json_list_coalesced(
+    key: tuple,
+    items: Callable[[], Iterable[Any]],
+    serialize: Callable[[Any], dict],
+    tags: Iterable[Tag] = (),
+) -> Response:
+    body = await coalesced(key, lambda: encode_list(items(), serialize), tags)
+    return Response(content=body, media_type="application/json")
+
+
 # =========================
 # Rutas HTML sencillas
 # =========================
@@ -95,9 +417,10 @@ def serialize_comment(comment: Comment) -> dict:
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
     properties = property_service.list_properties()
+    activity = activity_service.latest(10)
     return templates.TemplateResponse(
         "index.html",
-        {"request": request, "properties": properties},
+        {"request": request, "properties": properties, "activity": activity},
     )
 
 
@@ -140,22 +463,31 @@ async def create_property_html(
 
 
 @app.get("/properties/{property_id}", response_class=HTMLResponse)
-async def property_detail(request: Request, property_id: int):
-    prop = property_service.get_property(property_id)
-    if prop is None:
-        raise HTTPException(status_code=404, detail="Property not found")
-    reviews = review_service.list_reviews_by_property(property_id)
-    favorites = favorites_service.list_favorites()
-    is_favorite = any(fav.id == prop.id for fav in favorites)
-    return templates.TemplateResponse(
-        "property_detail.html",
-        {
-            "request": request,
-            "property": prop,
-            "reviews": reviews,
-            "is_favorite": is_favorite,
-        },
-    )
+async def property_detail(request: Request, property_id: int, sort: Optional[str] = None):
+    def render() -> str:
+        prop = property_service.get_property(property_id)
+        if prop is None:
+            raise HTTPException(status_code=404, detail="Property not found")
+        try:
+            reviews = review_service.list_reviews_by_property(property_id, sort)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+        is_favorite = favorites_service.is_favorite(prop.id)
+        return templates.get_template("property_detail.html").render(
+            {
+                "request": request,
+                "property": prop,
+                "reviews": reviews,
+                "is_favorite": is_favorite,
+            }
+        )
+
+    # El cuerpo se comparte entre peticiones con la misma clave; lo único
+    # de `request` que puede cambiar lo renderizado (url_for) es la URL base.
+    key = ("property_detail", str(request.base_url), property_id, sort)
+    body = await coalesced(key, render, [("property", property_id)])
+    property_service.record_view(property_id)
+    return HTMLResponse(body)
 
 
 @app.get("/properties/{property_id}/edit", response_class=HTMLResponse)
@@ -208,6 +540,8 @@ async def create_review_html(
 ):
     try:
         review_service.create_review(property_id, title, body, rating)
+    except DuplicateReviewError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
     except ValueError:
         raise HTTPException(status_code=404, detail="Property not found")
     return RedirectResponse(
@@ -339,11 +673,12 @@ async def add_favorite_html(property_id: int):
 
 @app.get("/favorites", response_class=HTMLResponse)
 async def list_favorites_view(request: Request):
-    favorites = favorites_service.list_favorites()
-    return templates.TemplateResponse(
-        "favorites.html",
-        {"request": request, "favorites": favorites},
-    )
+    def render() -> str:
+        favorites = favorites_service.list_favorites()
+        return templates.get_template("favorites.html").render({"request": request, "favorites": favorites})
+
+    key = ("favorites_view", str(request.base_url))
+    return HTMLResponse(await coalesced(key, render, FAVORITES_TAGS))
 
 
 @app.post("/favorites/{property_id}/delete")
@@ -367,17 +702,61 @@ async def create_property(payload: PropertyCreate):
 
 
 @app.get("/api/properties", response_model=List[dict])
-async def list_properties():
-    props = property_service.list_properties()
-    return [serialize_property(p) for p in props]
+async def list_properties(
+    rating: Optional[int] = None,
+    min_rating: Optional[int] = None,
+    max_rating: Optional[int] = None,
+    filter_expr: Optional[str] = Query(None, alias="filter"),
+    sort: Optional[str] = None,
+    limit: Optional[int] = None,
+    ids: Optional[str] = None,
+    expand: Optional[str] = None,
+    fields: Optional[str] = None,
+    explain: bool = False,
+):
+    """
+    `ids=1,2,3` lee sólo esas propiedades (en ese orden) con una pasada
+    por la tabla. `fields=id,rating` limita los campos de cada propiedad y
+    `expand=reviews` embebe sus reseñas.
+    """
+    spec = build_query(
+        filter_expr, sort, limit, PROPERTY_FIELDS, rating, min_rating, max_rating, ids
+    )
+    serialize = projection(PROPERTY_SHAPE, serialize_property, expand, fields)
+    if explain:
+        return JSONResponse(property_service.explain_properties(spec))
+    props = property_service.query_properties(spec)
+    return json_list(props, serialize)
+
+
+@app.get("/api/properties/trending", response_model=List[dict])
+async def trending_properties(limit: int = Query(10, ge=1, le=100)):
+    """
+    Propiedades más vistas (detalle HTML y JSON). `views` es una
+    estimación que nunca queda por debajo del valor real y `min_views` una
+    cota inferior; con decaimiento, ambas pesan más el tráfico reciente.
+    """
+    return JSONResponse(
+        [
+            {**serialize_property(prop), "views": round(views, 2), "min_views": round(min_views, 2)}
+            for prop, views, min_views in property_service.trending(limit)
+        ]
+    )
 
 
 @app.get("/api/properties/{property_id}", response_model=dict)
-async def get_property(property_id: int):
+async def get_property(property_id: int, expand: Optional[str] = None, fields: Optional[str] = None):
+    """
+    `expand=reviews.comments` embebe las reseñas y sus comentarios en la
+    misma respuesta (cada lista se recorre una vez); `fields` limita los
+    campos, p. ej. `fields=id,reviews.rating,reviews.comments.body`.
+    """
+    serialize = projection(PROPERTY_SHAPE, serialize_property, expand, fields)
     prop = property_service.get_property(property_id)
     if prop is None:
         raise HTTPException(status_code=404, detail="Property not found")
-    return serialize_property(prop)
+    property_service.record_view(property_id)
+    return JSONResponse(serialize(prop))
 
 
 @app.put("/api/properties/{property_id}", response_model=dict)
@@ -408,23 +787,94 @@ async def create_review(property_id: int, payload: ReviewCreate):
         review = review_service.create_review(
             property_id, payload.title, payload.body, payload.rating
         )
+    except DuplicateReviewError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
     except ValueError:
         raise HTTPException(status_code=404, detail="Property not found")
     return serialize_review(review)
 
 
 @app.get("/api/properties/{property_id}/reviews", response_model=List[dict])
-async def list_reviews(property_id: int):
-    reviews = review_service.list_reviews_by_property(property_id)
-    return [serialize_review(r) for r in reviews]
+async def list_reviews(
+    property_id: int,
+    rating: Optional[int] = None,
+    min_rating: Optional[int] = None,
+    max_rating: Optional[int] = None,
+    sort: Optional[str] = None,
+    expand: Optional[str] = None,
+    fields: Optional[str] = None,
+):
+    serialize = projection(REVIEW_SHAPE, serialize_review, expand, fields)
+
+    def reviews() -> Iterable[Review]:
+        try:
+            return review_service.list_reviews_by_property(
+                property_id, sort, rating, min_rating, max_rating
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+
+    key = ("property_reviews", property_id, rating, min_rating, max_rating, sort, expand, fields)
+    tags: List[Tag] = [("property", property_id)]
+    if expand:
+        # Los comentarios embebidos dependen de reseñas que no se conocen
+        # hasta calcular la lista.
+        tags.append(("comment", None))
+    return await json_list_coalesced(key, reviews, serialize, tags)
+
+
+@app.get("/api/reviews", response_model=List[dict])
+async def search_reviews(
+    property_id: Optional[int] = None,
+    rating: Optional[int] = None,
+    min_rating: Optional[int] = None,
+    max_rating: Optional[int] = None,
+    filter_expr: Optional[str] = Query(None, alias="filter"),
+    sort: Optional[str] = None,
+    limit: Optional[int] = None,
+    ids: Optional[str] = None,
+    expand: Optional[str] = None,
+    fields: Optional[str] = None,
+    explain: bool = False,
+):
+    spec = build_query(
+        filter_expr, sort, limit, REVIEW_FIELDS, rating, min_rating, max_rating, ids
+    )
+    if property_id is not None:
+        spec.predicates.append(Predicate("property_id", "=", property_id))
+    serialize = projection(REVIEW_SHAPE, serialize_review, expand, fields)
+    if explain:
+        return JSONResponse(review_service.explain_reviews(spec))
+    reviews = review_service.query_reviews(spec)
+    return json_list(reviews, serialize)
 
 
 @app.get("/api/reviews/{review_id}", response_model=dict)
-async def get_review(review_id: int):
+async def get_review(review_id: int, expand: Optional[str] = None, fields: Optional[str] = None):
+    """`expand=comments` embebe los comentarios; `fields` limita los campos."""
+    serialize = projection(REVIEW_SHAPE, serialize_review, expand, fields)
     review = review_service.get_review(review_id)
     if review is None:
         raise HTTPException(status_code=404, detail="Review not found")
-    return serialize_review(review)
+    return JSONResponse(serialize(review))
+
+
+@app.get("/api/reviews/{review_id}/similar", response_model=List[dict])
+async def similar_reviews(
+    review_id: int,
+    limit: int = Query(10, ge=1, le=100),
+    threshold: float = Query(0.0, ge=0.0, le=1.0),
+):
+    """
+    Reseñas parecidas según el índice de duplicados, con `similarity`
+    (Jaccard estimada de los pares de palabras) de mayor a menor.
+    """
+    similar = review_service.similar_reviews(review_id, limit, threshold)
+    if similar is None:
+        raise HTTPException(status_code=404, detail="Review not found")
+    return JSONResponse(
+        [{**serialize_review(review), "similarity": round(score, 3)} for review, score in similar]
+    )
 
 
 @app.put("/api/reviews/{review_id}", response_model=dict)
@@ -452,16 +902,36 @@ async def delete_review(review_id: int):
 @app.post("/api/reviews/{review_id}/comments", response_model=dict)
 async def create_comment(review_id: int, payload: CommentCreate):
     try:
-        comment = comment_service.create_comment(review_id, payload.body)
-    except ValueError:
-        raise HTTPException(status_code=404, detail="Review not found")
+        comment = comment_service.create_comment(review_id, payload.body, payload.parent_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
     return serialize_comment(comment)
 
 
 @app.get("/api/reviews/{review_id}/comments", response_model=List[dict])
-async def list_comments(review_id: int):
-    comments = comment_service.list_comments_by_review(review_id)
-    return [serialize_comment(c) for c in comments]
+async def list_comments(
+    review_id: int,
+    depth: Optional[int] = Query(None, ge=0, le=50),
+    parent_id: Optional[int] = None,
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    fields: Optional[str] = None,
+):
+    """
+    Sin `depth`: todos los comentarios de la reseña en orden de creación
+    (lista plana, `fields` limita sus campos). Con `depth`: el hilo
+    anidado hasta esa cantidad de niveles de respuestas, o el subárbol
+    bajo `parent_id`; `offset` y `limit` paginan los comentarios de
+    primer nivel.
+    """
+    if depth is None and parent_id is None:
+        serialize = projection(COMMENT_SHAPE, serialize_comment, None, fields)
+        comments = comment_service.list_comments_by_review(review_id)
+        return json_list(comments, serialize)
+    entries = comment_service.comment_thread(review_id, depth, parent_id, offset, limit)
+    if entries is None:
+        raise HTTPException(status_code=404, detail="Comment not found" if parent_id else "Review not found")
+    return JSONResponse(nest_thread(entries))
 
 
 @app.put("/api/comments/{comment_id}", response_model=dict)
@@ -495,8 +965,7 @@ async def add_favorite(property_id: int):
 
 @app.get("/api/favorites", response_model=List[dict])
 async def list_favorites():
-    favorites = favorites_service.list_favorites()
-    return [serialize_property(p) for p in favorites]
+    return await json_list_coalesced(("favorites",), favorites_service.list_favorites, serialize_property, FAVORITES_TAGS)
 
 
 @app.delete("/api/favorites/{property_id}", response_model=dict)
@@ -505,3 +974,360 @@ async def remove_favorite(property_id: int):
     if not removed:
         raise HTTPException(status_code=404, detail="Favorite not found")
     return {"message": "Removed from favorites"}
+
+
+# =========================
+# API JSON - ACTIVIDAD RECIENTE
+# =========================
+
+@app.get("/api/activity", response_model=List[dict])
+async def list_activity(
+    limit: int = Query(20, ge=1, le=1000),
+    hours: Optional[float] = None,
+    kind: Optional[str] = None,
+):
+    """
+    Sin `hours`: las últimas reseñas y comentarios creados (hasta la
+    capacidad del feed). Con `hours`: lo creado en las últimas N horas,
+    sólo de `kind` (review | comment) si se indica.
+    """
+    if hours is None and kind is None:
+        return json_list(activity_service.latest(limit), serialize_activity)
+    try:
+        items = activity_service.window(hours if hours is not None else activity_log.retention_hours, kind, limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return json_list(items, serialize_activity)
+
+
+# =========================
+# API JSON - HISTORIAL DE EDICIONES
+# =========================
+
+# Segmento de la URL -> (deshacer, historial, serializador, nombre en errores)
+EDITABLE_ENTITIES = {
+    "properties": (property_service.undo_property, property_service.property_history, serialize_property, "Property"),
+    "reviews": (review_service.undo_review, review_service.review_history, serialize_review, "Review"),
+    "comments": (comment_service.undo_comment, comment_service.comment_history, serialize_comment, "Comment"),
+}
+
+
+def editable_entity(entity: str) -> tuple:
+    handlers = EDITABLE_ENTITIES.get(entity)
+    if handlers is None:
+        raise HTTPException(status_code=404, detail="Unknown entity")
+    return handlers
+
+
+@app.post("/api/{entity}/{entity_id}/undo", response_model=dict)
+async def undo_edit(entity: str, entity_id: int):
+    undo, _history, serialize, name = editable_entity(entity)
+    try:
+        restored = undo(entity_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    if restored is None:
+        raise HTTPException(status_code=404, detail=f"{name} not found")
+    return serialize(restored)
+
+
+@app.get("/api/{entity}/{entity_id}/history", response_model=dict)
+async def edit_history_page(
+    entity: str,
+    entity_id: int,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+):
+    _undo, history, _serialize, name = editable_entity(entity)
+    changes = history(entity_id, offset, limit)
+    if changes is None:
+        raise HTTPException(status_code=404, detail=f"{name} not found")
+    return {"offset": offset, "limit": limit, "items": changes}
+
+
+# =========================
+# API JSON - LOTES
+# =========================
+
+class BatchEntity(NamedTuple):
+    name: str
+    get: Callable[[int], Any]
+    create: Callable[[Optional[int], Any], Any]
+    update: Callable[[int, Any], Any]
+    delete: Callable[[int], bool]
+    serialize: Callable[[Any], dict]
+    create_schema: type
+    update_schema: type
+    # Campo de la operación con el id del padre al crear (None: sin padre).
+    parent: Optional[str] = None
+
+
+BATCH_ENTITIES = {
+    "property": BatchEntity(
+        "Property",
+        property_service.get_property,
+        lambda _parent, data: property_service.create_property(data.address, data.body, data.rating),
+        lambda entity_id, data: property_service.update_property(entity_id, data.address, data.body, data.rating),
+        property_service.delete_property,
+        serialize_property,
+        PropertyCreate,
+        PropertyUpdate,
+    ),
+    "review": BatchEntity(
+        "Review",
+        review_service.get_review,
+        lambda parent, data: review_service.create_review(parent, data.title, data.body, data.rating),
+        lambda entity_id, data: review_service.update_review(entity_id, data.title, data.body, data.rating),
+        review_service.delete_review,
+        serialize_review,
+        ReviewCreate,
+        ReviewUpdate,
+        "property_id",
+    ),
+    "comment": BatchEntity(
+        "Comment",
+        comment_service.get_comment,
+        lambda parent, data: comment_service.create_comment(parent, data.body, data.parent_id),
+        lambda entity_id, data: comment_service.update_comment(entity_id, data.body),
+        comment_service.delete_comment,
+        serialize_comment,
+        CommentCreate,
+        CommentUpdate,
+        "review_id",
+    ),
+}
+
+
+def batch_result(status_code: int, body: Any = None, detail: Any = None) -> dict:
+    if detail is not None:
+        return {"status": status_code, "detail": detail}
+    return {"status": status_code, "body": body}
+
+
+def run_batch_operation(operation: BatchOperation, lookups: Dict[Tuple[str, int], Any]) -> dict:
+    """
+    Ejecuta una operación del lote con las mismas reglas (y códigos) que
+    su endpoint. `lookups` guarda las lecturas del lote: leer dos veces la
+    misma entidad la busca una sola vez, y cualquier escritura lo vacía.
+    """
+    entity = BATCH_ENTITIES[operation.entity]
+    if operation.op in ("create", "update"):
+        schema = entity.create_schema if operation.op == "create" else entity.update_schema
+        try:
+            data = schema.model_validate(operation.data)
+        except ValidationError as exc:
+            return batch_result(422, detail=exc.errors(include_url=False, include_context=False))
+
+    if operation.op == "create":
+        parent = getattr(operation, entity.parent) if entity.parent else None
+        if entity.parent and parent is None:
+            return batch_result(400, detail=f"{entity.parent} is required")
+        lookups.clear()
+        try:
+            created = entity.create(parent, data)
+        except DuplicateReviewError as exc:
+            return batch_result(409, detail=str(exc))
+        except ValueError as exc:
+            return batch_result(404, detail=str(exc))
+        return batch_result(200, entity.serialize(created))
+
+    if operation.id is None:
+        return batch_result(400, detail="id is required")
+    if operation.op == "get":
+        key = (operation.entity, operation.id)
+        if key not in lookups:
+            lookups[key] = entity.get(operation.id)
+        found = lookups[key]
+        if found is None:
+            return batch_result(404, detail=f"{entity.name} not found")
+        if operation.entity == "property":
+            property_service.record_view(operation.id)
+        return batch_result(200, entity.serialize(found))
+
+    lookups.clear()
+    if operation.op == "update":
+        updated = entity.update(operation.id, data)
+        if updated is None:
+            return batch_result(404, detail=f"{entity.name} not found")
+        return batch_result(200, entity.serialize(updated))
+    if not entity.delete(operation.id):
+        return batch_result(404, detail=f"{entity.name} not found")
+    return batch_result(200, {"message": f"{entity.name} deleted"})
+
+
+@app.post("/api/batch", response_model=dict)
+async def batch(payload: BatchRequest):
+    """
+    Varias operaciones (get/create/update/delete sobre propiedades,
+    reseñas y comentarios) en una sola petición, en orden. Cada una tiene
+    su propio resultado `{status, body | detail}`; un fallo no detiene
+    las siguientes.
+    """
+    lookups: Dict[Tuple[str, int], Any] = {}
+    return JSONResponse({"results": [run_batch_operation(operation, lookups) for operation in payload.operations]})
+
+
+# =========================
+# API JSON - FLUJO DE CAMBIOS (SSE)
+# =========================
+
+@app.get("/api/stream")
+async def stream_changes(
+    topics: str = Query(..., description="Temas separados por coma: property:42, review:7, reviews, ..."),
+):
+    """
+    Server-Sent Events con cada cambio de los temas pedidos, en lugar de
+    consultar las listas periódicamente. Si el cliente no da abasto
+    recibe un evento `overflow` con los mensajes que perdió.
+    """
+    try:
+        parsed = parse_topics(topics)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if change_stream.full():
+        raise HTTPException(status_code=503, detail="Too many stream subscribers", headers={"Retry-After": "5"})
+    return StreamingResponse(
+        change_stream.messages(parsed),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# =========================
+# API JSON - CAMBIOS (SINCRONIZACIÓN INCREMENTAL)
+# =========================
+
+def serialize_change(entry: ChangeEntry) -> dict:
+    """Una entrada del registro, con el estado actual de la entidad (None si ya no existe)."""
+    data = None
+    entity = BATCH_ENTITIES.get(entry.entity)
+    if entity is not None and entry.entity_id is not None and entry.op != "delete":
+        found = entity.get(entry.entity_id)
+        if found is not None:
+            data = entity.serialize(found)
+    return {
+        "seq": entry.seq,
+        "at": timestamp(entry.at),
+        "entity": entry.entity,
+        "op": entry.op,
+        "id": entry.entity_id,
+        "parent_id": entry.parent_id,
+        "data": data,
+    }
+
+
+@app.get("/api/changes")
+async def list_changes(
+    since: int = Query(0, ge=0, description="Última secuencia ya aplicada (0 = desde el principio)"),
+    limit: int = Query(100, ge=1, le=1000),
+):
+    """
+    Escrituras posteriores a `since`, en orden de secuencia; se sigue con
+    `since=next` mientras `has_more`. Las entradas de una misma entidad se
+    compactan en la última, y `id` null (carga masiva) pide recargar esa
+    colección. Con `resync_required` el cliente quedó fuera de la ventana
+    retenida: debe descargar todo y continuar desde `latest`.
+    """
+    page = change_log.since(since, limit)
+    return JSONResponse(
+        {
+            "changes": [serialize_change(entry) for entry in page.entries],
+            "next": page.next_seq,
+            "latest": page.latest,
+            "has_more": page.has_more,
+            "resync_required": page.resync_required,
+        }
+    )
+
+
+# =========================
+# Observabilidad
+# =========================
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Métricas en formato de texto de Prometheus."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/debug/profile", include_in_schema=False)
+async def debug_profile(route: Optional[str] = None):
+    """
+    Sin `route`: resumen de las rutas perfiladas. Con `route` (plantilla,
+    p. ej. /api/properties/{property_id}): pilas en formato collapsed,
+    listas para flamegraph.pl o speedscope.
+    """
+    if route is None:
+        return JSONResponse(profile_store.summary())
+    if profile_store.get(route) is None:
+        raise HTTPException(status_code=404, detail="Route not profiled")
+    return PlainTextResponse(profile_store.collapsed(route))
+
+
+@app.delete("/debug/profile", include_in_schema=False)
+async def clear_profile():
+    profile_store.clear()
+    return {"message": "Profiles cleared"}
+
+
+@app.get("/debug/coalescing", include_in_schema=False)
+async def debug_coalescing():
+    """Peticiones, cálculos, esperas compartidas, aciertos y tasa de deduplicación."""
+    return JSONResponse(read_cache.stats())
+
+
+@app.delete("/debug/coalescing", include_in_schema=False)
+async def clear_coalescing():
+    read_cache.clear_stats()
+    return {"message": "Coalescing stats cleared"}
+
+
+@app.get("/debug/jobs", include_in_schema=False)
+async def debug_jobs():
+    """Trabajos en segundo plano: pendientes, en curso y últimos terminados."""
+    return JSONResponse(jobs.snapshot())
+
+
+@app.delete("/debug/jobs/{job_id}", include_in_schema=False)
+async def cancel_job(job_id: int):
+    if not jobs.cancel(job_id):
+        raise HTTPException(status_code=404, detail="Job not found, already running or not cancellable")
+    return {"message": "Job cancelled"}
+
+
+@app.get("/debug/changes", include_in_schema=False)
+async def debug_changes():
+    """Registro de cambios: entradas, ventana retenida, compactaciones y descartes."""
+    return JSONResponse(change_log.stats())
+
+
+@app.get("/debug/stream", include_in_schema=False)
+async def debug_stream():
+    """Clientes del flujo SSE: temas, mensajes encolados, entregados y perdidos."""
+    return JSONResponse(change_stream.stats())
+
+
+@app.get("/debug/traces", include_in_schema=False)
+async def debug_traces(limit: int = Query(20, ge=1, le=1000)):
+    """Resumen de las trazas más recientes, con el tiempo propio por capa."""
+    return JSONResponse([trace.summary() for trace in trace_store.recent(limit)])
+
+
+@app.get("/debug/traces/{trace_id}", include_in_schema=False)
+async def debug_trace(trace_id: str):
+    trace = trace_store.get(trace_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail="Trace not found")
+    return JSONResponse(trace.as_dict())
+
+
+@app.get("/debug/memory", include_in_schema=False)
+async def debug_memory(
+    sample: int = Query(200, ge=1, le=10_000),
+    top: int = Query(10, ge=0, le=100),
+):
+    """
+    Entidades, nodos y bytes aproximados por repositorio. El tamaño de las
+    entidades se estima con una muestra de `sample` por repositorio.
+    """
+    return JSONResponse(memory_report(sample, top))
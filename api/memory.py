@@ -0,0 +1,159 @@
+"""
+Reporte de memoria de /debug/memory: entidades, nodos y bytes aproximados
+por repositorio, las propiedades más pesadas y las entidades huérfanas.
+"""
+
+import heapq
+from random import Random
+from time import perf_counter
+from typing import Any, Dict, List
+
+from datastructures.DoubleLinkedList import DoubleLinkedList
+from datastructures.LinkedQueue import LinkedQueue
+from observability.memory import average_own_size, own_size
+from repository.comment_repository import comment_repository
+from repository.favorites_repository import favorites_repository
+from repository.property_repository import property_repository
+from repository.review_repository import review_repository
+
+# Las propiedades candidatas a "más pesadas" se preseleccionan por número
+# de reseñas; sólo a estas se les recorre el subárbol.
+_CANDIDATES_PER_RESULT = 5
+
+
+def _structure(count: int, nodes: int, container_size: int, node_size: int) -> Dict[str, int]:
+    return {"count": count, "nodes": nodes, "bytes": count * container_size + nodes * node_size}
+
+
+def memory_report(sample: int = 200, top: int = 10, seed: int = 0) -> Dict[str, Any]:
+    """
+    Args:
+        sample: Entidades muestreadas por repositorio para estimar su tamaño
+        top: Número de propiedades más pesadas a reportar
+        seed: Semilla del muestreo (reportes comparables entre sí)
+    """
+    started = perf_counter()
+    rng = Random(seed)
+
+    dll_size = own_size(DoubleLinkedList())
+    dll_node = own_size(DoubleLinkedList.Node(None))
+    queue_size = own_size(LinkedQueue())
+    queue_node = own_size(LinkedQueue.Node(None))
+
+    prop_avg = average_own_size(property_repository.sample(sample, rng))
+    review_avg = average_own_size(review_repository.sample(sample, rng))
+    comment_avg = average_own_size(comment_repository.sample(sample, rng))
+
+    properties = property_repository.size()
+    reviews = review_repository.size()
+    comments = comment_repository.size()
+
+    # Un recorrido O(propiedades) para contar nodos de listas y vistas.
+    review_nodes = 0
+    sorted_views = 0
+    sorted_nodes = 0
+    for prop in property_repository.list_all():
+        review_nodes += prop.reviews.size()
+        view_sizes = prop.sorted_view_sizes()
+        sorted_views += len(view_sizes)
+        sorted_nodes += sum(view_sizes)
+
+    review_lists = _structure(properties, review_nodes, dll_size, dll_node)
+    sorted_lists = _structure(sorted_views, sorted_nodes, dll_size, dll_node)
+    # Cada comentario vivo está en exactamente una cola.
+    comment_queues = _structure(reviews, comments, queue_size, queue_node)
+    favorites = favorites_repository.size()
+
+    repositories = {
+        "property": {
+            "entities": properties,
+            "entity_bytes": round(prop_avg * properties),
+            "table_bytes": property_repository.footprint(),
+            "structures": {"review_lists": review_lists, "sorted_review_views": sorted_lists},
+        },
+        "review": {
+            "entities": reviews,
+            "entity_bytes": round(review_avg * reviews),
+            "table_bytes": review_repository.footprint(),
+            "structures": {"comment_queues": comment_queues},
+        },
+        "comment": {
+            "entities": comments,
+            "entity_bytes": round(comment_avg * comments),
+            "table_bytes": comment_repository.footprint(),
+            "structures": {},
+        },
+        "favorites": {
+            "entities": favorites,
+            "entity_bytes": 0,
+            "table_bytes": 0,
+            "structures": {"favorites_list": _structure(1, favorites, dll_size, dll_node)},
+        },
+    }
+    for data in repositories.values():
+        data["total_bytes"] = (
+            data["entity_bytes"]
+            + data["table_bytes"]
+            + sum(s["bytes"] for s in data["structures"].values())
+        )
+
+    return {
+        "sample": sample,
+        "repositories": repositories,
+        "total_bytes": sum(data["total_bytes"] for data in repositories.values()),
+        "largest_properties": _largest_properties(
+            top, prop_avg, review_avg, comment_avg, dll_node, queue_size, queue_node
+        ),
+        "orphans": _orphans(),
+        "elapsed_ms": round((perf_counter() - started) * 1000, 2),
+    }
+
+
+def _largest_properties(
+    top: int,
+    prop_avg: float,
+    review_avg: float,
+    comment_avg: float,
+    dll_node: int,
+    queue_size: int,
+    queue_node: int,
+) -> List[Dict[str, Any]]:
+    """Propiedades con mayor subárbol (reseñas + comentarios) estimado."""
+    candidates = heapq.nlargest(
+        top * _CANDIDATES_PER_RESULT,
+        property_repository.list_all(),
+        key=lambda prop: prop.reviews.size(),
+    )
+    result = []
+    for prop in candidates:
+        reviews = prop.reviews.size()
+        comments = sum(review.comments.size() for review in prop.reviews)
+        views = sum(prop.sorted_view_sizes())
+        size = (
+            prop_avg
+            + reviews * (review_avg + dll_node + queue_size)
+            + views * dll_node
+            + comments * (comment_avg + queue_node)
+        )
+        result.append({"id": prop.id, "reviews": reviews, "comments": comments, "bytes": round(size)})
+    result.sort(key=lambda item: item["bytes"], reverse=True)
+    return result[:top]
+
+
+def _orphans() -> Dict[str, int]:
+    """
+    Entidades cuyo padre ya no existe. Se resuelve con los índices hash
+    (una consulta por padre distinto), sin recorrer reseñas ni comentarios.
+    """
+    reviews = 0
+    for property_id, count in review_repository.indexes.get("property_id").counts():
+        if not property_repository.exists(property_id):
+            reviews += count
+
+    comments = 0
+    for review_id, count in comment_repository.indexes.get("review_id").counts():
+        if not review_repository.exists(review_id):
+            comments += count
+
+    favorites = sum(1 for pid in favorites_repository.list_all() if not property_repository.exists(pid))
+    return {"reviews": reviews, "comments": comments, "favorites": favorites}
@@ -0,0 +1,187 @@
+"""
+Métricas calculadas al exponer /metrics: tamaños de los repositorios y de
+sus índices, y los contadores de recorrido de las estructuras de datos.
+"""
+
+from typing import Iterable, Tuple
+
+from api.admission import AdmissionController
+from api.read_cache import ReadCoalescer
+from api.stream import ChangeStream
+from datastructures.DoubleLinkedList import DoubleLinkedList
+from datastructures.LinkedQueue import LinkedQueue
+from datastructures.SymbolTable import ST
+from observability.metrics import Labels, Registry, registry
+from repository.changelog import ChangeLog
+from repository.comment_repository import comment_repository
+from repository.favorites_repository import favorites_repository
+from repository.history import edit_history
+from api.jobs import JobScheduler
+from repository.property_repository import property_repository
+from repository.review_repository import review_repository
+
+_REPOSITORIES = (
+    ("property", property_repository),
+    ("review", review_repository),
+    ("comment", comment_repository),
+)
+
+_STRUCTURES = (
+    ("DoubleLinkedList", DoubleLinkedList),
+    ("LinkedQueue", LinkedQueue),
+    ("ST", ST),
+)
+
+
+def _entities() -> Iterable[Tuple[Labels, float]]:
+    for name, repository in _REPOSITORIES:
+        yield (name,), repository.size()
+    yield ("favorites",), favorites_repository.size()
+
+
+def _index_entries() -> Iterable[Tuple[Labels, float]]:
+    for name, repository in _REPOSITORIES:
+        for field in repository.indexes.fields():
+            yield (name, field), repository.indexes.get(field).size()
+
+
+def _scan_calls() -> Iterable[Tuple[Labels, float]]:
+    for name, structure in _STRUCTURES:
+        for op, (calls, _nodes) in structure.scans.snapshot().items():
+            yield (name, op), calls
+
+
+def _scan_nodes() -> Iterable[Tuple[Labels, float]]:
+    for name, structure in _STRUCTURES:
+        for op, (_calls, nodes) in structure.scans.snapshot().items():
+            yield (name, op), nodes
+
+
+def _history() -> Iterable[Tuple[Labels, float]]:
+    stats = edit_history.stats()
+    return [((name,), value) for name, value in stats.items()]
+
+
+def register_collectors(target: Registry = registry) -> None:
+    target.gauge(
+        "rentview_repository_entities",
+        "Entidades almacenadas en cada repositorio",
+        ("repository",),
+        _entities,
+    )
+    target.gauge(
+        "rentview_repository_index_entries",
+        "Entradas de cada índice secundario",
+        ("repository", "field"),
+        _index_entries,
+    )
+    target.gauge(
+        "rentview_datastructure_operations_total",
+        "Llamadas a operaciones con recorrido lineal, por estructura",
+        ("structure", "operation"),
+        _scan_calls,
+        kind="counter",
+    )
+    target.gauge(
+        "rentview_datastructure_nodes_visited_total",
+        "Nodos recorridos por esas operaciones (media = nodos / llamadas)",
+        ("structure", "operation"),
+        _scan_nodes,
+        kind="counter",
+    )
+    target.gauge(
+        "rentview_edit_history",
+        "Historial de ediciones: entidades, entradas, bytes aproximados y entradas descartadas",
+        ("stat",),
+        _history,
+    )
+
+
+def register_admission(controller: AdmissionController, target: Registry = registry) -> None:
+    target.gauge(
+        "rentview_admission_in_flight",
+        "Peticiones admitidas en curso y en espera de turno",
+        ("state",),
+        lambda: [(("in_flight",), controller.in_flight), (("waiting",), controller.waiting)],
+    )
+
+
+def register_read_cache(cache: ReadCoalescer, target: Registry = registry) -> None:
+    target.gauge(
+        "rentview_read_coalescing_total",
+        "Lecturas coalescidas: peticiones, cálculos, esperas compartidas y aciertos de caché",
+        ("outcome",),
+        lambda: [
+            (("requests",), cache.requests),
+            (("computed",), cache.computed),
+            (("coalesced",), cache.coalesced),
+            (("cache_hit",), cache.hits),
+        ],
+        kind="counter",
+    )
+    target.gauge(
+        "rentview_read_coalescing_dedup_ratio",
+        "Fracción de lecturas servidas sin recalcular",
+        (),
+        lambda: [((), cache.dedup_ratio())],
+    )
+
+
+def register_jobs(scheduler: JobScheduler, target: Registry = registry) -> None:
+    target.gauge(
+        "rentview_jobs",
+        "Trabajos en segundo plano pendientes y en curso",
+        ("state",),
+        lambda: [(("pending",), scheduler.pending()), (("running",), scheduler.running())],
+    )
+    target.gauge(
+        "rentview_jobs_runs_total",
+        "Ejecuciones de trabajos en segundo plano, por resultado",
+        ("outcome",),
+        lambda: [(("completed",), scheduler.completed), (("failed",), scheduler.failed)],
+        kind="counter",
+    )
+
+
+def register_stream(stream: ChangeStream, target: Registry = registry) -> None:
+    target.gauge(
+        "rentview_stream_subscribers",
+        "Clientes conectados al flujo de cambios SSE",
+        (),
+        lambda: [((), stream.subscribers())],
+    )
+    target.gauge(
+        "rentview_stream_queued_messages",
+        "Mensajes encolados para clientes del flujo SSE, sin enviar",
+        (),
+        lambda: [((), stream.queued())],
+    )
+    target.gauge(
+        "rentview_stream_messages_total",
+        "Mensajes del flujo SSE, publicados y perdidos por desborde",
+        ("outcome",),
+        lambda: [(("published",), stream.published), (("dropped",), stream.dropped)],
+        kind="counter",
+    )
+
+
+def register_changelog(log: ChangeLog, target: Registry = registry) -> None:
+    target.gauge(
+        "rentview_changelog_entries",
+        "Entradas retenidas en el registro de cambios",
+        (),
+        lambda: [((), log.size())],
+    )
+    target.gauge(
+        "rentview_changelog_sequence",
+        "Secuencias del registro de cambios: la última y la más vieja sincronizable",
+        ("bound",),
+        lambda: [(("latest",), log.latest), (("floor",), log.floor)],
+    )
+    target.gauge(
+        "rentview_changelog_discarded_total",
+        "Entradas descartadas del registro de cambios, por motivo",
+        ("reason",),
+        lambda: [(("compacted",), log.compacted), (("evicted",), log.evicted)],
+        kind="counter",
+    )
@@ -0,0 +1,335 @@
+"""
+Middlewares ASGI de la aplicación.
+
+Son middlewares ASGI "puros" (no BaseHTTPMiddleware): no envuelven la
+petición en objetos Request/Response ni crean tareas extra, así que su
+coste por petición se reduce a unas pocas llamadas.
+"""
+
+import json
+import math
+import sys
+import zlib
+from random import random
+from time import perf_counter
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from api.admission import AdmissionController
+from observability.metrics import registry
+from observability.profiler import ProfileStore, StackSampler
+from observability.tracing import end_trace, start_trace
+
+Scope = Dict[str, Any]
+Message = Dict[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+http_requests = registry.counter(
+    "rentview_http_requests_total",
+    "Peticiones HTTP atendidas, por método, plantilla de ruta y estado",
+    ("method", "route", "status"),
+)
+http_errors = registry.counter(
+    "rentview_http_request_errors_total",
+    "Peticiones HTTP que terminaron en 5xx o con una excepción",
+    ("method", "route"),
+)
+http_latency = registry.histogram(
+    "rentview_http_request_duration_seconds",
+    "Latencia de las peticiones HTTP, por método y plantilla de ruta",
+    ("method", "route"),
+)
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Plantilla de la ruta que atendió la petición (p. ej.
+    "/api/properties/{property_id}"), para no crear una serie por cada id.
+
+    FastAPI deja la ruta elegida en scope["route"] al enrutar; los montajes
+    (archivos estáticos) sólo dejan su prefijo en root_path.
+    """
+    route = scope.get("route")
+    if route is not None:
+        return getattr(route, "path", "<unknown>")
+    root_path = scope.get("root_path")
+    if root_path:
+        return f"{root_path}/{{path}}"
+    return "<unmatched>"
+
+
+class MetricsMiddleware:
+    """Cuenta peticiones y errores y mide la latencia por plantilla de ruta."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = perf_counter() - start
+            method = scope["method"]
+            route = route_template(scope)
+            http_requests.inc((method, route, str(status_code)))
+            if status_code >= 500:
+                http_errors.inc((method, route))
+            http_latency.observe(elapsed, (method, route))
+
+
+def _header_flag(scope: Scope, header: bytes) -> Optional[bool]:
+    """Valor booleano de una cabecera de la petición, o None si no viene."""
+    for name, value in scope["headers"]:
+        if name == header:
+            return value.strip().lower() in (b"1", b"true", b"yes")
+    return None
+
+
+class ProfilerMiddleware:
+    """
+    Perfila peticiones a pedido: con la cabecera `X-Profile: 1` (si está
+    habilitada) o al azar con probabilidad `sample_rate`. Las pilas se
+    agregan en `store` bajo la plantilla de la ruta.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        sampler: StackSampler,
+        store: ProfileStore,
+        sample_rate: float = 0.0,
+        header: bool = True,
+    ) -> None:
+        self.app = app
+        self.sampler = sampler
+        self.store = store
+        self.sample_rate = sample_rate
+        self.header = header
+
+    def _wants_profile(self, scope: Scope) -> bool:
+        if self.header:
+            flag = _header_flag(scope, b"x-profile")
+            if flag is not None:
+                return flag
+        return self.sample_rate > 0 and random() < self.sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        root = sys._getframe()
+        session = self.sampler.begin(root)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.sampler.end(root)
+            self.store.record(route_template(scope), session)
+
+
+class TracingMiddleware:
+    """
+    Abre la traza raíz (capa "api") de las peticiones elegidas: cabecera
+    `X-Trace: 1` (si está habilitada) o al azar con probabilidad
+    `sample_rate`. La respuesta lleva el id en la cabecera X-Trace-Id.
+    """
+
+    def __init__(self, app: ASGIApp, sample_rate: float = 0.0, header: bool = True) -> None:
+        self.app = app
+        self.sample_rate = sample_rate
+        self.header = header
+
+    def _wants_trace(self, scope: Scope) -> bool:
+        if self.header:
+            flag = _header_flag(scope, b"x-trace")
+            if flag is not None:
+                return flag
+        return self.sample_rate > 0 and random() < self.sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._wants_trace(scope):
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        trace = start_trace(f"{method} {scope['path']}")
+        trace.root.attributes["path"] = scope["path"]
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                trace.root.attributes["status"] = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"x-trace-id", trace.trace_id.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            end_trace(trace, f"{method} {route_template(scope)}")
+
+
+async def _reject(send: Send, status: int, retry_after: float, detail: str) -> None:
+    body = json.dumps({"detail": detail}).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+class AdmissionMiddleware:
+    """
+    Aplica el control de admisión antes de enrutar: 429 si el cliente
+    agotó su cubeta, 503 si la cola de espera está llena o el turno no
+    llegó a tiempo. Ambas respuestas llevan Retry-After.
+
+    Las rutas de `streaming` (conexiones de larga vida, como el flujo SSE)
+    pasan por el límite de tasa pero no ocupan un lugar de los de
+    peticiones en curso: si no, unas pocas pestañas abiertas agotarían
+    el tope.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        controller: AdmissionController,
+        exempt: Tuple[str, ...] = ("/metrics", "/debug/"),
+        streaming: Tuple[str, ...] = ("/api/stream",),
+    ) -> None:
+        self.app = app
+        self.controller = controller
+        self.exempt = exempt
+        self.streaming = streaming
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.exempt):
+            await self.app(scope, receive, send)
+            return
+
+        controller = self.controller
+        client = scope.get("client")
+        wait = controller.check_rate(client[0] if client else "unknown")
+        if wait:
+            await _reject(send, 429, wait, "Rate limit exceeded")
+            return
+        if scope["path"].startswith(self.streaming):
+            await self.app(scope, receive, send)
+            return
+        if await controller.acquire() is not None:
+            await _reject(send, 503, controller.retry_after(), "Server busy")
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.release()
+
+
+_COMPRESSIBLE = (b"text/", b"application/json", b"application/javascript", b"image/svg+xml")
+
+
+def _accepts_gzip(scope: Scope) -> bool:
+    for name, value in scope["headers"]:
+        if name == b"accept-encoding":
+            return b"gzip" in value.lower()
+    return False
+
+
+class CompressionMiddleware:
+    """
+    Comprime con gzip las respuestas de texto (HTML, JSON) de al menos
+    `minimum_size` bytes cuando el cliente lo acepta.
+
+    Las respuestas de un solo mensaje se comprimen enteras; las que llegan
+    por partes se comprimen al vuelo, vaciando el compresor en cada parte
+    (Z_SYNC_FLUSH) para que el cliente reciba cada una sin esperar al
+    final. Las que ya traen Content-Encoding (estáticos precomprimidos) y
+    los flujos de eventos pasan sin tocar.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, level: int = 1) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not _accepts_gzip(scope):
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        compressor: Any = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, compressor, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                headers = dict(message.get("headers", ()))
+                content_type = headers.get(b"content-type", b"")
+                passthrough = (
+                    b"content-encoding" in headers
+                    or not content_type.startswith(_COMPRESSIBLE)
+                    or content_type.startswith(b"text/event-stream")
+                )
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                if start is not None:
+                    await send(start)
+                    start = None
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start is not None:
+                # Primer trozo del cuerpo: decide si vale la pena comprimir.
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start)
+                    start = None
+                    await send(message)
+                    return
+                compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+                headers = [
+                    (name, value)
+                    for name, value in start.get("headers", ())
+                    if name != b"content-length"
+                ]
+                headers.append((b"content-encoding", b"gzip"))
+                headers.append((b"vary", b"Accept-Encoding"))
+                if not more_body:
+                    body = compressor.compress(body) + compressor.flush()
+                    headers.append((b"content-length", str(len(body)).encode()))
+                    await send({**start, "headers": headers})
+                    start = None
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                await send({**start, "headers": headers})
+                start = None
+            flush = zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH
+            chunk = compressor.compress(body) + compressor.flush(flush)
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
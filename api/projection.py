@@ -0,0 +1,87 @@
+"""
+Relaciones embebidas (`?expand=reviews.comments`) y campos parciales
+(`?fields=id,rating,reviews.title`) en las respuestas JSON.
+
+Cada tipo de entidad declara cómo se serializa cada campo y qué
+relaciones se pueden expandir. Con los parámetros de la petición se arma
+una sola vez un serializador que calcula sólo los campos pedidos y
+recorre cada relación expandida una vez por entidad, en lugar de que el
+cliente haga una llamada por reseña.
+
+En `fields`, los nombres sin punto son del nivel superior y los con punto
+de una relación expandida ("reviews.title"). Un nivel sin campos propios
+en `fields` se serializa completo; las relaciones expandidas siempre se
+incluyen.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+Serializer = Callable[[Any], dict]
+Tree = Dict[str, "Tree"]
+
+
+class Shape(NamedTuple):
+    # Campo -> valor JSON a partir de la entidad, en el orden de salida.
+    fields: Dict[str, Callable[[Any], Any]]
+    # Relación -> (entidades relacionadas, forma de esas entidades).
+    relations: Dict[str, Tuple[Callable[[Any], Iterable[Any]], "Shape"]] = {}
+
+
+def parse_paths(raw: Optional[str]) -> Tree:
+    """ "a,b.c,b.d" -> {"a": {}, "b": {"c": {}, "d": {}}} """
+    tree: Tree = {}
+    if not raw:
+        return tree
+    for path in raw.split(","):
+        if not path.strip():
+            continue
+        node = tree
+        for name in path.strip().split("."):
+            if not name:
+                raise ValueError(f"Invalid path: {path.strip()!r}")
+            node = node.setdefault(name, {})
+    return tree
+
+
+def _compile(shape: Shape, expand: Tree, fields: Tree, prefix: str) -> Serializer:
+    for name in expand:
+        if name not in shape.relations:
+            raise ValueError(f"Cannot expand: {prefix}{name}")
+    plain: List[str] = []
+    for name, nested in fields.items():
+        if name in shape.fields and not nested:
+            plain.append(name)
+        elif name not in shape.relations:
+            raise ValueError(f"Unknown field: {prefix}{name}")
+        elif name not in expand:
+            raise ValueError(f"Field {prefix}{name} requires expand={prefix}{name}")
+
+    getters = [(name, shape.fields[name]) for name in plain] if plain else list(shape.fields.items())
+    children = [
+        (name, shape.relations[name][0], _compile(shape.relations[name][1], nested, fields.get(name, {}), f"{prefix}{name}."))
+        for name, nested in expand.items()
+    ]
+
+    if not children:
+        return lambda entity: {name: get(entity) for name, get in getters}
+
+    def serialize(entity: Any) -> dict:
+        out = {name: get(entity) for name, get in getters}
+        for name, related, child in children:
+            out[name] = [child(item) for item in related(entity)]
+        return out
+
+    return serialize
+
+
+def compile_serializer(shape: Shape, default: Serializer, expand: Optional[str], fields: Optional[str]) -> Serializer:
+    """
+    Serializador para `expand` y `fields`; sin ninguno de los dos, `default`.
+
+    Raises:
+        ValueError: Si se pide un campo o relación que no existe, o campos
+            de una relación sin expandirla
+    """
+    if not expand and not fields:
+        return default
+    return _compile(shape, parse_paths(expand), parse_paths(fields), "")
@@ -0,0 +1,193 @@
+"""
+Coalescencia de lecturas (single-flight) y caché de vida muy corta.
+
+Las lecturas calientes (detalle de una propiedad, sus reseñas, favoritos)
+se identifican por una clave con la ruta y sus parámetros. Si llega una
+petición con la misma clave mientras otra la está calculando, espera el
+mismo resultado en lugar de repetir el trabajo. Con `ttl > 0` el
+resultado además se guarda unos instantes.
+
+Cada lectura declara de qué entidades depende con etiquetas
+`(entidad, id)`; `(entidad, None)` significa "cualquiera de ese tipo".
+Una escritura (ver repository.events) descarta sólo las lecturas cuyas
+etiquetas coinciden con la entidad cambiada, con su padre (la propiedad
+de una reseña o de un favorito, la reseña de un comentario) o con el
+tipo completo, y desliga los cálculos en curso de esas mismas lecturas:
+las peticiones nuevas ya no se suman a ellos, así que nunca se sirve un
+resultado anterior a una escritura ya confirmada. Una lectura sin
+etiquetas depende de todo, y una carga masiva (sin id) vacía la caché.
+
+Todo corre en el hilo del event loop, así que no hace falta ningún lock.
+Las rutas son síncronas por dentro: el primer cálculo cede el turno una
+vez antes de empezar, y las peticiones idénticas que ya esperaban en el
+loop se suman a él. No se renderiza en el threadpool: con el GIL no
+se gana throughput y habría que copiar los datos antes de soltarlos
+del loop para que una escritura no los cambie a medio renderizar.
+"""
+
+import asyncio
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterable, Optional, Set, Tuple
+
+from repository.events import Change
+
+Tag = Tuple[str, Optional[int]]
+
+# Etiqueta implícita de las lecturas que no declaran dependencias.
+_ANY: Tag = ("*", None)
+# Tipo del padre de cada entidad (ver Change.parent_id).
+_PARENT_ENTITY = {"review": "property", "comment": "review", "favorite": "property"}
+
+
+def change_tags(change: Change) -> Set[Tag]:
+    """Etiquetas que invalida una escritura."""
+    tags = {_ANY, (change.entity, None), (change.entity, change.entity_id)}
+    parent = _PARENT_ENTITY.get(change.entity)
+    if parent is not None and change.parent_id is not None:
+        tags.add((parent, change.parent_id))
+    return tags
+
+
+class ReadCoalescer:
+    def __init__(self, ttl: float = 1.0, max_entries: int = 1024) -> None:
+        """
+        Args:
+            ttl: Segundos que se reutiliza un resultado (0 = sólo coalescencia)
+            max_entries: Tope de resultados guardados (se descartan los más viejos)
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[Hashable, Tuple[float, Any, FrozenSet[Tag]]]" = OrderedDict()
+        self._inflight: Dict[Hashable, Tuple["asyncio.Future[Any]", FrozenSet[Tag]]] = {}
+        # etiqueta -> claves guardadas que dependen de ella
+        self._by_tag: Dict[Tag, Set[Hashable]] = {}
+        self.requests = 0
+        self.computed = 0
+        self.coalesced = 0
+        self.hits = 0
+        self.invalidations = 0
+        self.invalidated = 0
+
+    def configure(self, ttl: float, max_entries: int) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clear()
+
+    def clear(self) -> None:
+        """Descarta todo lo guardado y desliga los cálculos en curso."""
+        self.invalidated += len(self._cache)
+        self._cache.clear()
+        self._by_tag.clear()
+        self._inflight.clear()
+
+    def invalidate(self, change: Optional[Change] = None) -> None:
+        """
+        Suscriptor de eventos: descarta las lecturas que dependen de la
+        entidad cambiada. Sin `change`, o si es una carga masiva, todas.
+        """
+        self.invalidations += 1
+        if change is None or (change.entity_id is None and change.parent_id is None):
+            self.clear()
+            return
+        tags = change_tags(change)
+        for tag in tags:
+            for key in list(self._by_tag.get(tag, ())):
+                self._drop(key)
+                self.invalidated += 1
+        stale = [key for key, (_future, key_tags) in self._inflight.items() if not tags.isdisjoint(key_tags)]
+        for key in stale:
+            del self._inflight[key]
+
+    async def get(self, key: Hashable, compute: Callable[[], Any], tags: Iterable[Tag] = ()) -> Any:
+        """
+        Devuelve el resultado de `compute` para `key`, reutilizando uno
+        guardado o uno en curso si lo hay. Los errores no se guardan, pero
+        sí se propagan a todas las peticiones que esperaban el mismo cálculo.
+
+        Args:
+            tags: Entidades de las que depende el resultado (sin etiquetas,
+                cualquier escritura lo invalida)
+        """
+        self.requests += 1
+        entry = self._cache.get(key)
+        if entry is not None:
+            if entry[0] > monotonic():
+                self.hits += 1
+                return entry[1]
+            self._drop(key)
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            # shield: si esta petición se cancela, el cálculo sigue para las demás.
+            return await asyncio.shield(pending[0])
+
+        future: "asyncio.Future[Any]" = asyncio.get_running_loop().create_future()
+        key_tags = frozenset(tags) or frozenset((_ANY,))
+        self._inflight[key] = (future, key_tags)
+        self.computed += 1
+        try:
+            await asyncio.sleep(0)
+            value = compute()
+            # Si una escritura lo desligó mientras esperaba, no se guarda.
+            current = key in self._inflight and self._inflight[key][0] is future
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Marca la excepción como recuperada aunque nadie más espere.
+            future.exception()
+            raise
+        finally:
+            if key in self._inflight and self._inflight[key][0] is future:
+                del self._inflight[key]
+
+        future.set_result(value)
+        if self.ttl > 0 and current:
+            self._store(key, value, key_tags)
+        return value
+
+    def _store(self, key: Hashable, value: Any, tags: FrozenSet[Tag]) -> None:
+        self._drop(key)
+        self._cache[key] = (monotonic() + self.ttl, value, tags)
+        for tag in tags:
+            self._by_tag.setdefault(tag, set()).add(key)
+        while len(self._cache) > self.max_entries:
+            self._drop(next(iter(self._cache)))
+
+    def _drop(self, key: Hashable) -> None:
+        entry = self._cache.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_tag[tag]
+
+    def dedup_ratio(self) -> float:
+        """Fracción de peticiones servidas sin calcular (caché o cálculo compartido)."""
+        return (self.hits + self.coalesced) / self.requests if self.requests else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ttl": self.ttl,
+            "requests": self.requests,
+            "computed": self.computed,
+            "coalesced": self.coalesced,
+            "cache_hits": self.hits,
+            "dedup_ratio": round(self.dedup_ratio(), 4),
+            "invalidations": self.invalidations,
+            "invalidated_entries": self.invalidated,
+            "cached": len(self._cache),
+            "in_flight": len(self._inflight),
+        }
+
+    def clear_stats(self) -> None:
+        self.requests = self.computed = self.coalesced = self.hits = self.invalidations = self.invalidated = 0
+
+
+read_cache = ReadCoalescer()
@@ -0,0 +1,161 @@
+"""
+Configuración de la aplicación leída de variables de entorno.
+
+Todas las opciones tienen un valor por defecto seguro, así que la API
+arranca igual que siempre sin definir ninguna variable.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = os.environ.get(name)
+    return float(raw) if raw else default
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.environ.get(name)
+    return int(raw) if raw else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    raw = os.environ.get(name)
+    if not raw:
+        return default
+    return raw.strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass(frozen=True)
+class Settings:
+    # Perfilador: fracción de peticiones perfiladas al azar (0 = ninguna),
+    # si se acepta la cabecera X-Profile y segundos entre muestras.
+    profile_sample_rate: float = 0.0
+    profile_header: bool = True
+    profile_interval: float = 0.002
+    # Trazas: `tracing=False` ni siquiera instrumenta las capas (costo
+    # cero); con True se traza la fracción `trace_sample_rate` y las
+    # peticiones con cabecera X-Trace, y se guardan las últimas
+    # `trace_buffer` trazas (más el archivo JSONL, si se indica).
+    tracing: bool = True
+    trace_sample_rate: float = 0.0
+    trace_header: bool = True
+    trace_buffer: int = 200
+    trace_file: Optional[str] = None
+    # Historial de ediciones: tope por entidad y topes globales.
+    history_per_entity: int = 50
+    history_max_entries: int = 100_000
+    history_max_bytes: int = 32 * 1024 * 1024
+    # Control de admisión: peticiones/s y ráfaga por cliente (0 = sin
+    # límite), peticiones en curso, cola de espera y su plazo en segundos.
+    admission: bool = True
+    rate_limit: float = 0.0
+    rate_burst: int = 20
+    max_in_flight: int = 64
+    max_queue: int = 128
+    queue_timeout: float = 1.0
+    # Lecturas calientes: coalescencia de peticiones idénticas en curso y
+    # caché de `read_cache_ttl` segundos (0 = sólo coalescencia).
+    read_coalescing: bool = True
+    read_cache_ttl: float = 1.0
+    read_cache_entries: int = 1024
+    # Actividad reciente: altas que guarda el feed, ancho de las cubetas de
+    # tiempo, horas que se conservan y tope de entidades por tipo.
+    activity_feed_size: int = 500
+    activity_bucket_seconds: float = 300.0
+    activity_retention_hours: float = 168.0
+    activity_max_entries: int = 200_000
+    # Propiedades más vistas: dimensiones del Count-Min Sketch, tamaño del
+    # top (Space-Saving) y vida media de los conteos en segundos (0 = sin
+    # decaimiento).
+    trending_width: int = 2048
+    trending_depth: int = 4
+    trending_top_k: int = 100
+    trending_half_life: float = 3600.0
+    # Reseñas casi duplicadas (MinHash + LSH sobre título y texto): "off",
+    # "flag" (se marca `duplicate_of`) o "reject" (409), la similitud a
+    # partir de la cual se consideran duplicadas y las dimensiones del
+    # índice (permutaciones, bandas y tope de claves por cubeta).
+    duplicate_policy: str = "flag"
+    duplicate_threshold: float = 0.8
+    duplicate_num_perm: int = 32
+    duplicate_bands: int = 8
+    duplicate_max_bucket: int = 64
+    # Planificador de trabajos en segundo plano: workers (tareas en el
+    # event loop), trabajos terminados que se conservan para /debug/jobs
+    # y segundos antes de reintentar un barrido de huérfanos que falló.
+    job_workers: int = 2
+    job_history: int = 100
+    sweep_retry: float = 5.0
+    # Registro de cambios (/api/changes): entradas retenidas tras compactar
+    # y segundos entre compactaciones periódicas (0 = sólo al llenarse).
+    changelog_max_entries: int = 50_000
+    changelog_compact_interval: float = 60.0
+    # Flujo de cambios SSE (/api/stream): mensajes por suscriptor, qué
+    # hacer con la cola llena ("drop_oldest", "drop_newest" o
+    # "disconnect"), segundos entre comentarios de keepalive y tope de
+    # conexiones simultáneas.
+    stream_queue_size: int = 256
+    stream_overflow: str = "drop_oldest"
+    stream_heartbeat: float = 15.0
+    stream_max_subscribers: int = 1000
+    # Compresión gzip de respuestas HTML/JSON desde `gzip_min_size` bytes.
+    # El nivel 1 ya reduce ~6x el JSON y cuesta la mitad que el 5: la
+    # compresión corre en el event loop.
+    gzip: bool = True
+    gzip_min_size: int = 1024
+    gzip_level: int = 1
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        return cls(
+            profile_sample_rate=_env_float("RENTVIEW_PROFILE_RATE", cls.profile_sample_rate),
+            profile_header=_env_bool("RENTVIEW_PROFILE_HEADER", cls.profile_header),
+            profile_interval=_env_float("RENTVIEW_PROFILE_INTERVAL", cls.profile_interval),
+            tracing=_env_bool("RENTVIEW_TRACING", cls.tracing),
+            trace_sample_rate=_env_float("RENTVIEW_TRACE_RATE", cls.trace_sample_rate),
+            trace_header=_env_bool("RENTVIEW_TRACE_HEADER", cls.trace_header),
+            trace_buffer=_env_int("RENTVIEW_TRACE_BUFFER", cls.trace_buffer),
+            trace_file=os.environ.get("RENTVIEW_TRACE_FILE") or None,
+            history_per_entity=_env_int("RENTVIEW_HISTORY_PER_ENTITY", cls.history_per_entity),
+            history_max_entries=_env_int("RENTVIEW_HISTORY_MAX_ENTRIES", cls.history_max_entries),
+            history_max_bytes=_env_int("RENTVIEW_HISTORY_MAX_BYTES", cls.history_max_bytes),
+            admission=_env_bool("RENTVIEW_ADMISSION", cls.admission),
+            rate_limit=_env_float("RENTVIEW_RATE_LIMIT", cls.rate_limit),
+            rate_burst=_env_int("RENTVIEW_RATE_BURST", cls.rate_burst),
+            max_in_flight=_env_int("RENTVIEW_MAX_IN_FLIGHT", cls.max_in_flight),
+            max_queue=_env_int("RENTVIEW_MAX_QUEUE", cls.max_queue),
+            queue_timeout=_env_float("RENTVIEW_QUEUE_TIMEOUT", cls.queue_timeout),
+            read_coalescing=_env_bool("RENTVIEW_READ_COALESCING", cls.read_coalescing),
+            read_cache_ttl=_env_float("RENTVIEW_READ_CACHE_TTL", cls.read_cache_ttl),
+            read_cache_entries=_env_int("RENTVIEW_READ_CACHE_ENTRIES", cls.read_cache_entries),
+            activity_feed_size=_env_int("RENTVIEW_ACTIVITY_FEED_SIZE", cls.activity_feed_size),
+            activity_bucket_seconds=_env_float("RENTVIEW_ACTIVITY_BUCKET_SECONDS", cls.activity_bucket_seconds),
+            activity_retention_hours=_env_float("RENTVIEW_ACTIVITY_RETENTION_HOURS", cls.activity_retention_hours),
+            activity_max_entries=_env_int("RENTVIEW_ACTIVITY_MAX_ENTRIES", cls.activity_max_entries),
+            trending_width=_env_int("RENTVIEW_TRENDING_WIDTH", cls.trending_width),
+            trending_depth=_env_int("RENTVIEW_TRENDING_DEPTH", cls.trending_depth),
+            trending_top_k=_env_int("RENTVIEW_TRENDING_TOP_K", cls.trending_top_k),
+            trending_half_life=_env_float("RENTVIEW_TRENDING_HALF_LIFE", cls.trending_half_life),
+            duplicate_policy=os.environ.get("RENTVIEW_DUPLICATE_POLICY") or cls.duplicate_policy,
+            duplicate_threshold=_env_float("RENTVIEW_DUPLICATE_THRESHOLD", cls.duplicate_threshold),
+            duplicate_num_perm=_env_int("RENTVIEW_DUPLICATE_NUM_PERM", cls.duplicate_num_perm),
+            duplicate_bands=_env_int("RENTVIEW_DUPLICATE_BANDS", cls.duplicate_bands),
+            duplicate_max_bucket=_env_int("RENTVIEW_DUPLICATE_MAX_BUCKET", cls.duplicate_max_bucket),
+            job_workers=_env_int("RENTVIEW_JOB_WORKERS", cls.job_workers),
+            job_history=_env_int("RENTVIEW_JOB_HISTORY", cls.job_history),
+            sweep_retry=_env_float("RENTVIEW_SWEEP_RETRY", cls.sweep_retry),
+            changelog_max_entries=_env_int("RENTVIEW_CHANGELOG_MAX_ENTRIES", cls.changelog_max_entries),
+            changelog_compact_interval=_env_float("RENTVIEW_CHANGELOG_COMPACT_INTERVAL", cls.changelog_compact_interval),
+            stream_queue_size=_env_int("RENTVIEW_STREAM_QUEUE_SIZE", cls.stream_queue_size),
+            stream_overflow=os.environ.get("RENTVIEW_STREAM_OVERFLOW") or cls.stream_overflow,
+            stream_heartbeat=_env_float("RENTVIEW_STREAM_HEARTBEAT", cls.stream_heartbeat),
+            stream_max_subscribers=_env_int("RENTVIEW_STREAM_MAX_SUBSCRIBERS", cls.stream_max_subscribers),
+            gzip=_env_bool("RENTVIEW_GZIP", cls.gzip),
+            gzip_min_size=_env_int("RENTVIEW_GZIP_MIN_SIZE", cls.gzip_min_size),
+            gzip_level=_env_int("RENTVIEW_GZIP_LEVEL", cls.gzip_level),
+        )
+
+
+settings = Settings.from_env()
@@ -0,0 +1,313 @@
+"""
+Flujo de cambios por Server-Sent Events (`GET /api/stream?topics=...`).
+
+Los repositorios publican cada escritura en repository.events; el
+ChangeStream arma el mensaje SSE una sola vez por cambio y lo reparte a
+los suscriptores cuyos temas coinciden, así los clientes se enteran de
+una reseña nueva sin consultar la lista cada pocos segundos.
+
+Temas:
+- "properties", "reviews", "comments", "favorites": todo cambio de ese tipo.
+- "property:42": la propiedad, sus reseñas y sus favoritos.
+- "review:7": la reseña y sus comentarios.
+- "comment:3": el comentario.
+
+Cada suscriptor tiene su propia cola acotada. Publicar nunca espera ni
+hace crecer una cola más allá de su tope: un cliente lento sólo pierde
+mensajes según la política de desborde y no frena las escrituras ni a
+los demás clientes.
+
+- "drop_oldest": se descarta el mensaje más viejo de la cola.
+- "drop_newest": se descarta el mensaje nuevo.
+- "disconnect": se cierra el flujo (EventSource reconecta solo).
+
+En los tres casos el cliente recibe un evento `overflow` con cuántos
+mensajes perdió, para que vuelva a pedir lo que muestra.
+
+Todo corre en el hilo del event loop, así que no hace falta ningún lock.
+"""
+
+import asyncio
+import json
+from collections import deque
+from time import time
+from typing import AsyncIterator, Deque, Dict, List, Optional, Set, Tuple
+
+from repository.events import Change
+
+POLICIES = ("drop_oldest", "drop_newest", "disconnect")
+
+# Tema de la colección de cada tipo de entidad y tipo de su entidad padre.
+COLLECTIONS = {"property": "properties", "review": "reviews", "comment": "comments", "favorite": "favorites"}
+PARENTS = {"review": "property", "comment": "review", "favorite": "property"}
+ENTITY_TOPICS = ("property", "review", "comment")
+
+MAX_TOPICS = 32
+# Milisegundos que espera EventSource antes de reconectar.
+RETRY_MS = 3000
+
+
+def parse_topics(raw: Optional[str]) -> Tuple[str, ...]:
+    """
+    "property:42,reviews" -> ("property:42", "reviews"), sin repetidos.
+
+    Raises:
+        ValueError: Si no hay temas, son demasiados o alguno no existe
+    """
+    topics: List[str] = []
+    for topic in (raw or "").split(","):
+        topic = topic.strip()
+        if not topic or topic in topics:
+            continue
+        kind, sep, ident = topic.partition(":")
+        if sep:
+            if kind not in ENTITY_TOPICS or not ident.isdigit():
+                raise ValueError(f"Invalid topic: {topic!r}")
+            topic = f"{kind}:{int(ident)}"
+        elif topic not in COLLECTIONS.values():
+            raise ValueError(f"Unknown topic: {topic!r}")
+        topics.append(topic)
+    if not topics:
+        raise ValueError("At least one topic is required")
+    if len(topics) > MAX_TOPICS:
+        raise ValueError(f"At most {MAX_TOPICS} topics")
+    return tuple(topics)
+
+
+def change_topics(change: Change) -> Tuple[str, ...]:
+    """Temas a los que corresponde un cambio."""
+    topics = [COLLECTIONS.get(change.entity, change.entity)]
+    if change.entity_id is not None and change.entity in ENTITY_TOPICS:
+        topics.append(f"{change.entity}:{change.entity_id}")
+    parent = PARENTS.get(change.entity)
+    if parent is not None and change.parent_id is not None:
+        topics.append(f"{parent}:{change.parent_id}")
+    return tuple(topics)
+
+
+def encode_change(change: Change) -> bytes:
+    """
+    Mensaje SSE de un cambio (evento por omisión: llega a `onmessage`).
+    El id es la secuencia global: tras reconectar, el cliente puede pedir
+    lo que se perdió a /api/changes?since=<último id>.
+    """
+    data = json.dumps(
+        {"entity": change.entity, "op": change.op, "id": change.entity_id, "parent_id": change.parent_id},
+        separators=(",", ":"),
+    )
+    return f"id: {change.seq}\ndata: {data}\n\n".encode()
+
+
+class Subscription:
+    """Un cliente conectado: sus temas y su cola acotada de mensajes ya codificados."""
+
+    __slots__ = ("id", "topics", "size", "queue", "dropped", "lost", "delivered", "closed", "created_at", "_wakeup")
+
+    def __init__(self, subscription_id: int, topics: Tuple[str, ...], size: int) -> None:
+        self.id = subscription_id
+        self.topics = topics
+        self.size = size
+        self.queue: Deque[bytes] = deque()
+        # Perdidos desde el último aviso al cliente y en total.
+        self.dropped = 0
+        self.lost = 0
+        self.delivered = 0
+        self.closed = False
+        self.created_at = time()
+        self._wakeup = asyncio.Event()
+
+    def offer(self, message: bytes, policy: str) -> bool:
+        """
+        Encola sin esperar nunca. Con la cola llena aplica `policy`.
+
+        Returns:
+            False si el suscriptor quedó cerrado por desborde
+        """
+        queue = self.queue
+        if len(queue) >= self.size:
+            self.dropped += 1
+            self.lost += 1
+            if policy == "drop_oldest":
+                queue.popleft()
+            elif policy == "disconnect":
+                queue.clear()
+                self.close()
+                return False
+            else:
+                return True
+        queue.append(message)
+        self._wakeup.set()
+        return True
+
+    def close(self) -> None:
+        self.closed = True
+        self._wakeup.set()
+
+    async def wait(self, timeout: float) -> bool:
+        """Espera hasta que haya mensajes o se cierre; False si pasó `timeout`."""
+        if self.queue or self.closed:
+            return True
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def drain(self) -> bytes:
+        """Todo lo encolado (más el aviso de desborde, si hubo) en un solo bloque."""
+        chunks: List[bytes] = []
+        if self.dropped:
+            chunks.append(f"event: overflow\ndata: {json.dumps({'dropped': self.dropped})}\n\n".encode())
+            self.dropped = 0
+        self.delivered += len(self.queue)
+        chunks.extend(self.queue)
+        self.queue.clear()
+        return b"".join(chunks)
+
+    def describe(self) -> dict:
+        return {
+            "id": self.id,
+            "topics": list(self.topics),
+            "queued": len(self.queue),
+            "delivered": self.delivered,
+            "dropped": self.lost,
+            "connected_at": self.created_at,
+        }
+
+
+class ChangeStream:
+    def __init__(
+        self,
+        queue_size: int = 256,
+        policy: str = "drop_oldest",
+        heartbeat: float = 15.0,
+        max_subscribers: int = 1000,
+    ) -> None:
+        """
+        Args:
+            queue_size: Mensajes que se guardan por suscriptor
+            policy: Qué hacer con la cola llena (ver POLICIES)
+            heartbeat: Segundos sin mensajes tras los que se manda un
+                comentario, para que proxies y clientes no corten la conexión
+            max_subscribers: Conexiones simultáneas (las demás reciben 503)
+        """
+        self.queue_size = queue_size
+        self.policy = policy
+        self.heartbeat = heartbeat
+        self.max_subscribers = max_subscribers
+        # Tema -> suscriptores: publicar sólo mira los temas del cambio.
+        self._topics: Dict[str, Set[Subscription]] = {}
+        self._subscribers: Dict[int, Subscription] = {}
+        self._next_id = 0
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.disconnected = 0
+
+    def configure(self, queue_size: int, policy: str, heartbeat: float, max_subscribers: int) -> None:
+        """
+        Raises:
+            ValueError: Si la política no existe o el tamaño de cola no es positivo
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"policy must be one of {', '.join(POLICIES)}")
+        if queue_size < 1:
+            raise ValueError("queue_size must be >= 1")
+        self.queue_size = queue_size
+        self.policy = policy
+        self.heartbeat = heartbeat
+        self.max_subscribers = max_subscribers
+
+    def full(self) -> bool:
+        """True si ya se llegó al tope de conexiones."""
+        return len(self._subscribers) >= self.max_subscribers
+
+    def subscribe(self, topics: Tuple[str, ...]) -> Optional[Subscription]:
+        """Registra un suscriptor; None si ya se llegó al tope de conexiones."""
+        if self.full():
+            return None
+        self._next_id += 1
+        subscription = Subscription(self._next_id, topics, self.queue_size)
+        self._subscribers[subscription.id] = subscription
+        for topic in topics:
+            self._topics.setdefault(topic, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        if self._subscribers.pop(subscription.id, None) is None:
+            return
+        self.delivered += subscription.delivered
+        for topic in subscription.topics:
+            subscribers = self._topics.get(topic)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._topics[topic]
+
+    def publish(self, change: Change) -> None:
+        """Suscriptor de eventos: reparte el cambio sin esperar a ningún cliente."""
+        if not self._topics:
+            return
+        matched: Set[Subscription] = set()
+        for topic in change_topics(change):
+            subscribers = self._topics.get(topic)
+            if subscribers:
+                matched.update(subscribers)
+        if not matched:
+            return
+        message = encode_change(change)
+        self.published += 1
+        policy = self.policy
+        for subscription in matched:
+            lost = subscription.lost
+            if not subscription.offer(message, policy):
+                # Desconectado: deja de recibir y de ocupar memoria ya.
+                self.disconnected += 1
+                self.unsubscribe(subscription)
+            self.dropped += subscription.lost - lost
+
+    async def messages(self, topics: Tuple[str, ...]) -> AsyncIterator[bytes]:
+        """
+        Cuerpo de la respuesta SSE. Se suscribe recién al empezar a
+        recorrerse, así un cliente que se va antes del primer mensaje no
+        deja nada registrado; al cortarse la conexión (o cerrarse el
+        suscriptor por desborde) se da de baja. Si entre tanto se llegó al
+        tope de conexiones, sólo manda `retry` y el cliente reconecta.
+        """
+        subscription = self.subscribe(topics)
+        if subscription is None:
+            yield f"retry: {RETRY_MS}\n\n".encode()
+            return
+        try:
+            yield f"retry: {RETRY_MS}\n: topics {','.join(subscription.topics)}\n\n".encode()
+            while not subscription.closed:
+                if await subscription.wait(self.heartbeat):
+                    yield subscription.drain()
+                else:
+                    yield b": keepalive\n\n"
+            if subscription.dropped:
+                yield subscription.drain()
+        finally:
+            self.unsubscribe(subscription)
+
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    def queued(self) -> int:
+        return sum(len(s.queue) for s in self._subscribers.values())
+
+    def stats(self) -> dict:
+        return {
+            "policy": self.policy,
+            "queue_size": self.queue_size,
+            "subscribers": [s.describe() for s in self._subscribers.values()],
+            "topics": len(self._topics),
+            "published": self.published,
+            "delivered": self.delivered + sum(s.delivered for s in self._subscribers.values()),
+            "dropped": self.dropped,
+            "disconnected": self.disconnected,
+        }
+
+
+change_stream = ChangeStream()
@@ -0,0 +1,46 @@
+"""
+Qué se traza en cada capa. Se instrumenta desde aquí, al armar la app,
+para que las capas inferiores no dependan del módulo de trazas.
+"""
+
+from datastructures.DoubleLinkedList import DoubleLinkedList
+from datastructures.LinkedQueue import LinkedQueue
+from datastructures.SymbolTable import ST
+from domain.property import Property
+from domain.review import Review
+from observability.tracing import instrument
+from repository.comment_repository import CommentRepository
+from repository.favorites_repository import FavoritesRepository
+from repository.property_repository import PropertyRepository
+from repository.review_repository import ReviewRepository
+from services.activity_service import ActivityService
+from services.comment_service import CommentService
+from services.favorites_service import FavoritesService
+from services.property_service import PropertyService
+from services.review_service import ReviewService
+
+
+def instrument_layers() -> None:
+    # Servicios y repositorios: todos los métodos públicos.
+    instrument(PropertyService, "property_service", "service")
+    instrument(ReviewService, "review_service", "service")
+    instrument(CommentService, "comment_service", "service")
+    instrument(FavoritesService, "favorites_service", "service")
+    instrument(ActivityService, "activity_service", "service")
+    instrument(PropertyRepository, "property_repository", "repository")
+    instrument(ReviewRepository, "review_repository", "repository")
+    instrument(CommentRepository, "comment_repository", "repository")
+    instrument(FavoritesRepository, "favorites_repository", "repository")
+
+    # Dominio y estructuras: sólo las operaciones con trabajo real, para
+    # no llenar la traza de accesos triviales.
+    instrument(Property, "Property", "domain", ("add_review", "remove_review", "reorder_review", "get_sorted_reviews"))
+    instrument(Review, "Review", "domain", ("add_comment",))
+    instrument(ST, "ST", "datastructure", ("get", "put", "delete", "put_many"))
+    instrument(
+        DoubleLinkedList,
+        "DoubleLinkedList",
+        "datastructure",
+        ("remove", "contains", "index", "insert", "pop", "sort", "insert_sorted"),
+    )
+    instrument(LinkedQueue, "LinkedQueue", "datastructure", ("enqueue", "__contains__"))
@@ -0,0 +1,109 @@
+"""
+Benchmark de asignaciones de memoria por endpoint (tracemalloc).
+
+Carga un conjunto de datos con los servicios y, para cada endpoint, mide
+el pico de memoria asignada durante la petición y el número de bloques
+que quedan vivos en el pico. Sirve para comparar cuánto copian las capas
+repositorio -> servicio -> API.
+
+Uso:
+    python -m benchmarks.allocations --properties 2000 --reviews 50 --comments 20
+    python -m benchmarks.allocations --json allocations.json
+"""
+
+import argparse
+import asyncio
+import json
+import tracemalloc
+from typing import Any, Dict, List
+
+from benchmarks.asgi import request
+
+
+def seed(properties: int, reviews: int, comments: int) -> None:
+    from services.comment_service import comment_service
+    from services.favorites_service import favorites_service
+    from services.property_service import property_service
+    from services.review_service import review_service
+
+    for i in range(properties):
+        prop = property_service.create_property(f"Calle {i}", "Descripción", i % 5 + 1)
+        if i % 2 == 0:
+            favorites_service.add_favorite(prop.id)
+    # Las reseñas y comentarios se concentran en la primera propiedad y
+    # reseña, que son las que consultan los endpoints de detalle.
+    for i in range(reviews):
+        review_service.create_review(1, f"Reseña {i}", "Texto", i % 5 + 1)
+    for i in range(comments):
+        comment_service.create_comment(1, f"Comentario {i}")
+
+
+ENDPOINTS = [
+    "/api/properties",
+    "/api/properties/1/reviews",
+    "/api/properties/1/reviews?sort=rating",
+    "/api/reviews/1/comments",
+    "/api/favorites",
+    "/",
+    "/properties",
+    "/properties/1",
+    "/reviews/1",
+    "/favorites",
+]
+
+
+async def measure(app: Any, path: str, repeat: int) -> Dict[str, Any]:
+    # Una petición de calentamiento para que cachés y vistas ya existan.
+    await request(app, "GET", path)
+    peaks: List[int] = []
+    for _ in range(repeat):
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        response = await request(app, "GET", path)
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - before)
+    peaks.sort()
+    return {
+        "endpoint": path,
+        "status": response.status,
+        "peak_bytes_median": peaks[len(peaks) // 2],
+        "peak_bytes_min": peaks[0],
+        "response_bytes": len(response.body),
+    }
+
+
+async def run(repeat: int) -> List[Dict[str, Any]]:
+    from api.main import app
+
+    tracemalloc.start()
+    try:
+        return [await measure(app, path, repeat) for path in ENDPOINTS]
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--properties", type=int, default=2000)
+    parser.add_argument("--reviews", type=int, default=500)
+    parser.add_argument("--comments", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", dest="json_path", help="Guarda el resultado en este archivo")
+    args = parser.parse_args()
+
+    seed(args.properties, args.reviews, args.comments)
+    results = asyncio.run(run(args.repeat))
+
+    print(f"{'endpoint':45} {'status':>6} {'peak KiB':>10} {'resp KiB':>10}")
+    for row in results:
+        print(
+            f"{row['endpoint']:45} {row['status']:>6} "
+            f"{row['peak_bytes_median'] / 1024:>10.1f} {row['response_bytes'] / 1024:>10.1f}"
+        )
+    if args.json_path:
+        with open(args.json_path, "w") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
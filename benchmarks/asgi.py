@@ -0,0 +1,91 @@
+"""
+Cliente ASGI mínimo para ejecutar la app en el mismo proceso.
+
+No abre sockets ni depende de httpx: construye el `scope` HTTP, entrega el
+cuerpo en un solo mensaje y recolecta la respuesta.
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+class ASGIResponse:
+    def __init__(self, status: int, headers: List[Tuple[bytes, bytes]], body: bytes) -> None:
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def header(self, name: str) -> Optional[str]:
+        key = name.lower().encode()
+        for k, v in self.headers:
+            if k.lower() == key:
+                return v.decode()
+        return None
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+async def request(
+    app: Any,
+    method: str,
+    url: str,
+    json_body: Any = None,
+    form: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    client: Tuple[str, int] = ("127.0.0.1", 50000),
+) -> ASGIResponse:
+    """Envía una petición HTTP a `app` y devuelve la respuesta completa."""
+    parts = urlsplit(url)
+    raw_headers = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    body = b""
+    if json_body is not None:
+        body = json.dumps(json_body).encode()
+        raw_headers.append((b"content-type", b"application/json"))
+    elif form is not None:
+        from urllib.parse import urlencode
+
+        body = urlencode(form).encode()
+        raw_headers.append((b"content-type", b"application/x-www-form-urlencoded"))
+    raw_headers.append((b"content-length", str(len(body)).encode()))
+    raw_headers.append((b"host", b"testserver"))
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method.upper(),
+        "scheme": "http",
+        "path": parts.path,
+        "raw_path": parts.path.encode(),
+        "query_string": parts.query.encode(),
+        "root_path": "",
+        "headers": raw_headers,
+        "client": client,
+        "server": ("testserver", 80),
+    }
+
+    sent = False
+
+    async def receive() -> Dict[str, Any]:
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return {"type": "http.disconnect"}
+
+    status = 500
+    response_headers: List[Tuple[bytes, bytes]] = []
+    chunks: List[bytes] = []
+
+    async def send(message: Dict[str, Any]) -> None:
+        nonlocal status, response_headers
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            response_headers = list(message.get("headers", []))
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return ASGIResponse(status, response_headers, b"".join(chunks))
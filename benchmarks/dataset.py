@@ -0,0 +1,199 @@
+"""
+Generador determinista de datos sintéticos y carga rápida en los repositorios.
+
+A partir de una semilla genera N propiedades, un número sesgado (Zipf) de
+reseñas por propiedad, comentarios por reseña (también Zipf) y favoritos.
+La carga usa los `bulk_create` de los repositorios: sin validaciones de
+servicio y con los índices actualizados una sola vez por tabla.
+
+Uso:
+    python -m benchmarks.dataset --properties 100000 --reviews 1000000 --comments 500000
+    python -m benchmarks.dataset --properties 5000 --serve --port 8000
+"""
+
+import argparse
+import gc
+import time
+from dataclasses import dataclass
+from itertools import accumulate
+from random import Random
+from typing import Dict, List
+
+from repository.comment_repository import comment_repository
+from repository.favorites_repository import favorites_repository
+from repository.property_repository import property_repository
+from repository.review_repository import review_repository
+
+STREETS = ("Calle", "Avenida", "Carrera", "Diagonal", "Transversal", "Pasaje")
+CITIES = ("Bogotá", "Medellín", "Cali", "Barranquilla", "Cartagena", "Bucaramanga", "Pereira")
+TITLES = (
+    "Excelente ubicación", "Muy ruidoso", "Buen precio", "El dueño no responde",
+    "Volvería", "Fotos engañosas", "Perfecto para estudiantes", "Humedad en las paredes",
+    "Vecinos amables", "Lejos del transporte",
+)
+SENTENCES = (
+    "La cocina es pequeña pero funcional.", "El agua caliente falla a veces.",
+    "Hay buena luz natural en la mañana.", "El barrio es tranquilo de noche.",
+    "El arriendo subió sin previo aviso.", "Internet rápido y estable.",
+    "La administración resuelve rápido.", "Queda cerca de supermercados.",
+)
+COMMENTS = (
+    "Totalmente de acuerdo.", "A mí me pasó lo mismo.", "¿Cuánto pagabas?",
+    "Gracias por la reseña.", "No fue mi experiencia.", "¿Sigue disponible?",
+)
+# Distribución de ratings: más reseñas positivas que negativas.
+RATING_WEIGHTS = (5, 10, 20, 35, 30)
+
+
+@dataclass
+class DatasetSpec:
+    properties: int = 1000
+    reviews: int = 10_000
+    comments: int = 5_000
+    favorites: int = 100
+    # Exponente de Zipf: 0 reparte uniforme; >1 concentra en pocas entidades.
+    skew: float = 1.1
+    seed: int = 42
+
+
+def zipf_counts(total: int, buckets: int, skew: float, rng: Random) -> List[int]:
+    """
+    Reparte `total` elementos entre `buckets` con pesos 1/rank^skew.
+
+    El reparto es exacto (la suma es `total`) y determinista; el orden de
+    los rangos se baraja para que las entidades populares queden dispersas.
+    """
+    if buckets <= 0:
+        return []
+    weights = [1.0 / (rank ** skew) for rank in range(1, buckets + 1)]
+    scale = total / sum(weights)
+    counts = [int(w * scale) for w in weights]
+    remainder = total - sum(counts)
+    for i in range(remainder):
+        counts[i % buckets] += 1
+    rng.shuffle(counts)
+    return counts
+
+
+def load(spec: DatasetSpec) -> Dict[str, float]:
+    """
+    Genera y carga el conjunto de datos en los repositorios (se agrega a lo
+    que ya exista). Devuelve los tiempos por fase, en segundos.
+
+    El recolector cíclico se pausa durante la carga (millones de objetos
+    nuevos lo dispararían una y otra vez) y al final los objetos cargados se
+    congelan con gc.freeze() para que las recolecciones posteriores no los
+    vuelvan a recorrer.
+    """
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _load(spec)
+    finally:
+        gc.freeze()
+        if gc_was_enabled:
+            gc.enable()
+
+
+def _load(spec: DatasetSpec) -> Dict[str, float]:
+    rng = Random(spec.seed)
+    ratings = list(range(1, 6))
+    rating_cum = list(accumulate(RATING_WEIGHTS))
+    timings: Dict[str, float] = {}
+
+    start = time.perf_counter()
+    prop_ratings = rng.choices(ratings, cum_weights=rating_cum, k=spec.properties)
+    properties = property_repository.bulk_create(
+        (
+            f"{rng.choice(STREETS)} {rng.randint(1, 200)} # {rng.randint(1, 99)}-{i % 100}, {rng.choice(CITIES)}",
+            rng.choice(SENTENCES),
+            prop_ratings[i],
+        )
+        for i in range(spec.properties)
+    )
+    timings["properties"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    per_property = zipf_counts(spec.reviews, len(properties), spec.skew, rng)
+    review_ratings = rng.choices(ratings, cum_weights=rating_cum, k=spec.reviews)
+    titles = rng.choices(TITLES, k=spec.reviews)
+    bodies = rng.choices(SENTENCES, k=spec.reviews)
+
+    def review_rows():
+        i = 0
+        for prop, count in zip(properties, per_property):
+            for _ in range(count):
+                yield prop, titles[i], bodies[i], review_ratings[i]
+                i += 1
+
+    reviews = review_repository.bulk_create(review_rows())
+    timings["reviews"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    per_review = zipf_counts(spec.comments, len(reviews), spec.skew, rng)
+    comment_bodies = rng.choices(COMMENTS, k=spec.comments)
+
+    def comment_rows():
+        i = 0
+        for review, count in zip(reviews, per_review):
+            for _ in range(count):
+                yield review, comment_bodies[i]
+                i += 1
+
+    comment_repository.bulk_create(comment_rows())
+    timings["comments"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    favorites = rng.sample(properties, min(spec.favorites, len(properties)))
+    favorites_repository.bulk_add(prop.id for prop in favorites)
+    timings["favorites"] = time.perf_counter() - start
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.dataset",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--properties", type=int, default=DatasetSpec.properties)
+    parser.add_argument("--reviews", type=int, default=DatasetSpec.reviews)
+    parser.add_argument("--comments", type=int, default=DatasetSpec.comments)
+    parser.add_argument("--favorites", type=int, default=DatasetSpec.favorites)
+    parser.add_argument("--skew", type=float, default=DatasetSpec.skew, help="Exponente de Zipf")
+    parser.add_argument("--seed", type=int, default=DatasetSpec.seed)
+    parser.add_argument("--serve", action="store_true", help="Levanta la API con los datos cargados")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    spec = DatasetSpec(
+        properties=args.properties,
+        reviews=args.reviews,
+        comments=args.comments,
+        favorites=args.favorites,
+        skew=args.skew,
+        seed=args.seed,
+    )
+    timings = load(spec)
+    for phase, seconds in timings.items():
+        print(f"{phase:12} {seconds:8.2f} s")
+    print(f"{'total':12} {sum(timings.values()):8.2f} s")
+
+    busiest = max(property_repository.list_all(), key=lambda p: p.reviews.size(), default=None)
+    if busiest is not None:
+        print(
+            f"\n{property_repository.size()} propiedades, {review_repository.size()} reseñas; "
+            f"la propiedad {busiest.id} concentra {busiest.reviews.size()} reseñas"
+        )
+
+    if args.serve:
+        import uvicorn
+
+        from api.main import app
+
+        uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""
+Micro-benchmarks del paquete `datastructures`.
+
+Uso:
+    python -m benchmarks.datastructures --sizes 1000,10000 --save baseline.json
+    python -m benchmarks.datastructures --compare baseline.json --threshold 0.15
+"""
@@ -0,0 +1,85 @@
+import argparse
+import json
+import sys
+from typing import Any, Dict
+
+from benchmarks.datastructures import __doc__ as usage
+from benchmarks.datastructures.cases import CASES
+from benchmarks.datastructures.runner import compare, run_all
+
+
+def _print_result(result: Dict[str, Any]) -> None:
+    memory = ""
+    if "peak_bytes" in result:
+        memory = f" {result['structure_bytes'] / 1024 / 1024:>9.1f} MiB {result['peak_bytes'] / 1024:>10.1f} KiB"
+    print(
+        f"{result['structure']:17} {result['operation']:13} {result['size']:>9} "
+        f"{result['ops']:>8} {result['ops_per_sec']:>14,.0f} {result['ns_per_op']:>14,.1f}{memory}",
+        flush=True,
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.datastructures",
+        description=usage,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--sizes", default="1000,10000,100000,1000000",
+                        help="Tamaños separados por coma (default: 1k a 1M)")
+    parser.add_argument("--structures", help="Filtra por estructura, p. ej. DoubleLinkedList,ST")
+    parser.add_argument("--operations", help="Filtra por operación, p. ej. get,remove")
+    parser.add_argument("--max-ops", type=int, default=100_000,
+                        help="Máximo de operaciones medidas por caso")
+    parser.add_argument("--work-budget", type=int, default=5_000_000,
+                        help="Nodos recorridos por caso en operaciones O(n)")
+    parser.add_argument("--no-memory", action="store_true", help="No medir memoria (más rápido)")
+    parser.add_argument("--save", help="Guarda los resultados como JSON (línea base)")
+    parser.add_argument("--compare", help="JSON de línea base contra el que comparar")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Variación relativa tolerada antes de marcar regresión (default: 0.10)")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    cases = CASES
+    if args.structures:
+        wanted = set(args.structures.split(","))
+        cases = [case for case in cases if case.structure in wanted]
+    if args.operations:
+        wanted = set(args.operations.split(","))
+        cases = [case for case in cases if case.operation in wanted]
+
+    header = f"{'structure':17} {'operation':13} {'size':>9} {'ops':>8} {'ops/s':>14} {'ns/op':>14}"
+    if not args.no_memory:
+        header += f" {'structure':>13} {'op peak':>14}"
+    print(header)
+    report = run_all(cases, sizes, args.max_ops, args.work_budget, not args.no_memory, _print_result)
+    for skipped in report["skipped"]:
+        print(f"{skipped['structure']:17} {skipped['operation']:13} {skipped['size']:>9}  (omitido: supera max_size)")
+
+    if args.save:
+        with open(args.save, "w") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"\nResultados guardados en {args.save}")
+
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)
+        rows = compare(baseline, report, args.threshold)
+        regressions = [row for row in rows if row["regression"]]
+        print(f"\nComparación contra {args.compare} (umbral ±{args.threshold:.0%})")
+        for row in rows:
+            flag = "REGRESIÓN" if row["regression"] else ("mejora" if row["improvement"] else "")
+            print(
+                f"{row['structure']:17} {row['operation']:13} {row['size']:>9} "
+                f"{row['baseline_ns_per_op']:>12,.1f} -> {row['ns_per_op']:>12,.1f} ns/op "
+                f"x{row['ratio']:.2f} {flag}"
+            )
+        if regressions:
+            print(f"\n{len(regressions)} regresión(es) por encima del umbral")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""
+Casos de benchmark: una operación de una estructura.
+
+Cada caso construye la estructura con `setup(n)` y devuelve, con
+`prepare(struct, n, ops, rng)`, una función sin argumentos que ejecuta
+`ops` operaciones. Los argumentos (índices, claves) se calculan en
+`prepare`, fuera de la medición.
+"""
+
+from dataclasses import dataclass
+from random import Random
+from typing import Any, Callable, List, Optional
+
+from datastructures.DoubleLinkedList import DoubleLinkedList
+from datastructures.LinkedQueue import LinkedQueue
+from datastructures.Stack import Stack
+from datastructures.SymbolTable import ST
+
+
+@dataclass(frozen=True)
+class Case:
+    structure: str
+    operation: str
+    setup: Callable[[int], Any]
+    prepare: Callable[[Any, int, int, Random], Callable[[], None]]
+    # "1": coste constante por operación; "n": recorre la estructura.
+    complexity: str = "1"
+    # Las operaciones que vacían la estructura no pueden superar n.
+    consumes: bool = False
+    # Tamaño máximo razonable (p. ej. si construir la estructura es O(n²)).
+    max_size: Optional[int] = None
+
+
+def _dll(n: int) -> DoubleLinkedList:
+    items = DoubleLinkedList()
+    for i in range(n):
+        items.append(i)
+    return items
+
+
+def _queue(n: int) -> LinkedQueue:
+    queue = LinkedQueue()
+    for i in range(n):
+        queue.enqueue(i)
+    return queue
+
+
+def _stack(n: int) -> Stack:
+    stack = Stack()
+    for i in range(n):
+        stack.push(i)
+    return stack
+
+
+def _st(n: int) -> ST:
+    table = ST()
+    for i in range(n):
+        table.put(i, i)
+    return table
+
+
+def _repeat(fn: Callable[[], Any], ops: int) -> Callable[[], None]:
+    def run() -> None:
+        for _ in range(ops):
+            fn()
+
+    return run
+
+
+def _each(fn: Callable[[Any], Any], args: List[Any]) -> Callable[[], None]:
+    def run() -> None:
+        for arg in args:
+            fn(arg)
+
+    return run
+
+
+def _iterate(struct: Any, n: int, ops: int, rng: Random) -> Callable[[], None]:
+    # Una "operación" es visitar un elemento: ops == n.
+    def run() -> None:
+        for _ in struct:
+            pass
+
+    return run
+
+
+def _st_iterate(table: ST, n: int, ops: int, rng: Random) -> Callable[[], None]:
+    def run() -> None:
+        for _ in table.keys():
+            pass
+
+    return run
+
+
+def _dll_sort(items: DoubleLinkedList, n: int, ops: int, rng: Random) -> Callable[[], None]:
+    keys = [rng.random() for _ in range(n)]
+    items.clear()
+    for key in keys:
+        items.append(key)
+    return items.sort
+
+
+CASES: List[Case] = [
+    # --- DoubleLinkedList ---
+    Case("DoubleLinkedList", "append", _dll, lambda s, n, ops, rng: _repeat(lambda: s.append(0), ops)),
+    Case("DoubleLinkedList", "add_first", _dll, lambda s, n, ops, rng: _repeat(lambda: s.add_first(0), ops)),
+    Case(
+        "DoubleLinkedList", "insert", _dll,
+        lambda s, n, ops, rng: _each(lambda i: s.insert(i, 0), [rng.randrange(n + 1) for _ in range(ops)]),
+        complexity="n",
+    ),
+    Case(
+        "DoubleLinkedList", "get", _dll,
+        lambda s, n, ops, rng: _each(s.get, [rng.randrange(n) for _ in range(ops)]),
+        complexity="n",
+    ),
+    Case(
+        "DoubleLinkedList", "remove", _dll,
+        lambda s, n, ops, rng: _each(s.remove, rng.sample(range(n), ops)),
+        complexity="n", consumes=True,
+    ),
+    Case("DoubleLinkedList", "remove_first", _dll, lambda s, n, ops, rng: _repeat(s.remove_first, ops), consumes=True),
+    Case("DoubleLinkedList", "iterate", _dll, _iterate, consumes=True),
+    Case("DoubleLinkedList", "sort", _dll, _dll_sort, complexity="nlogn"),
+    # --- LinkedQueue ---
+    Case("LinkedQueue", "enqueue", _queue, lambda s, n, ops, rng: _repeat(lambda: s.enqueue(0), ops)),
+    Case("LinkedQueue", "dequeue", _queue, lambda s, n, ops, rng: _repeat(s.dequeue, ops), consumes=True),
+    Case("LinkedQueue", "peek", _queue, lambda s, n, ops, rng: _repeat(s.peek, ops)),
+    Case(
+        "LinkedQueue", "contains", _queue,
+        lambda s, n, ops, rng: _each(s.__contains__, [rng.randrange(n) for _ in range(ops)]),
+        complexity="n",
+    ),
+    Case("LinkedQueue", "iterate", _queue, _iterate, consumes=True),
+    # --- Stack ---
+    Case("Stack", "push", _stack, lambda s, n, ops, rng: _repeat(lambda: s.push(0), ops)),
+    Case("Stack", "pop", _stack, lambda s, n, ops, rng: _repeat(s.pop, ops), consumes=True),
+    Case("Stack", "peek", _stack, lambda s, n, ops, rng: _repeat(s.peek, ops)),
+    Case("Stack", "iterate", _stack, _iterate, consumes=True),
+    # --- ST ---
+    Case(
+        "ST", "put", _st,
+        lambda s, n, ops, rng: _each(lambda k: s.put(k, k), range(n, n + ops)),
+    ),
+    Case(
+        "ST", "put_update", _st,
+        lambda s, n, ops, rng: _each(lambda k: s.put(k, k), [rng.randrange(n) for _ in range(ops)]),
+    ),
+    Case(
+        "ST", "get", _st,
+        lambda s, n, ops, rng: _each(s.get, [rng.randrange(n) for _ in range(ops)]),
+    ),
+    Case(
+        "ST", "get_miss", _st,
+        lambda s, n, ops, rng: _each(s.get, [-1 - i for i in range(ops)]),
+    ),
+    Case(
+        "ST", "delete", _st,
+        lambda s, n, ops, rng: _each(s.delete, rng.sample(range(n), ops)),
+        consumes=True,
+    ),
+    Case("ST", "iterate", _st, _st_iterate, consumes=True),
+]
+
+
+def operation_count(case: Case, n: int, max_ops: int, work_budget: int) -> int:
+    """
+    Número de operaciones a medir para `case` con tamaño `n`.
+
+    Las operaciones O(1) se miden hasta `max_ops` veces; las O(n) se
+    limitan para que el total de nodos recorridos ronde `work_budget`.
+    """
+    if case.operation == "iterate":
+        return n
+    if case.complexity == "nlogn":
+        return 1
+    ops = max_ops if case.complexity == "1" else max(1, work_budget // max(n, 1))
+    if case.consumes:
+        ops = min(ops, n)
+    return max(1, min(ops, max_ops))
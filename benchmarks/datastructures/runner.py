@@ -0,0 +1,127 @@
+"""Ejecución de los casos, persistencia JSON y comparación contra una línea base."""
+
+import gc
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from random import Random
+from typing import Any, Dict, Iterable, List, Optional
+
+from benchmarks.datastructures.cases import Case, operation_count
+
+
+def run_case(
+    case: Case,
+    n: int,
+    max_ops: int,
+    work_budget: int,
+    measure_memory: bool = True,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    ops = operation_count(case, n, max_ops, work_budget)
+    struct = case.setup(n)
+    run = case.prepare(struct, n, ops, Random(seed))
+
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter_ns()
+        run()
+        elapsed_ns = time.perf_counter_ns() - start
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    result: Dict[str, Any] = {
+        "structure": case.structure,
+        "operation": case.operation,
+        "size": n,
+        "ops": ops,
+        "seconds": elapsed_ns / 1e9,
+        "ns_per_op": elapsed_ns / ops,
+        "ops_per_sec": ops / (elapsed_ns / 1e9) if elapsed_ns else float("inf"),
+    }
+
+    if measure_memory:
+        # Corrida aparte: tracemalloc distorsiona los tiempos.
+        tracemalloc.start()
+        struct = case.setup(n)
+        structure_bytes, _ = tracemalloc.get_traced_memory()
+        run = case.prepare(struct, n, ops, Random(seed))
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result["structure_bytes"] = structure_bytes
+        result["peak_bytes"] = peak - before
+
+    return result
+
+
+def run_all(
+    cases: Iterable[Case],
+    sizes: Iterable[int],
+    max_ops: int = 100_000,
+    work_budget: int = 5_000_000,
+    measure_memory: bool = True,
+    progress: Optional[Any] = None,
+) -> Dict[str, Any]:
+    results: List[Dict[str, Any]] = []
+    skipped: List[Dict[str, Any]] = []
+    for case in cases:
+        for n in sizes:
+            if case.max_size is not None and n > case.max_size:
+                skipped.append({"structure": case.structure, "operation": case.operation, "size": n})
+                continue
+            result = run_case(case, n, max_ops, work_budget, measure_memory)
+            results.append(result)
+            if progress is not None:
+                progress(result)
+    return {
+        "meta": {
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        },
+        "results": results,
+        "skipped": skipped,
+    }
+
+
+def compare(
+    baseline: Dict[str, Any], current: Dict[str, Any], threshold: float
+) -> List[Dict[str, Any]]:
+    """
+    Compara `ns_per_op` caso a caso.
+
+    Returns:
+        Una fila por caso presente en ambas corridas, con `ratio`
+        (actual / base) y `regression` si el ratio supera 1 + threshold.
+    """
+    base_index = {
+        (r["structure"], r["operation"], r["size"]): r for r in baseline.get("results", [])
+    }
+    rows: List[Dict[str, Any]] = []
+    for result in current["results"]:
+        key = (result["structure"], result["operation"], result["size"])
+        base = base_index.get(key)
+        if base is None:
+            continue
+        ratio = result["ns_per_op"] / base["ns_per_op"] if base["ns_per_op"] else float("inf")
+        rows.append(
+            {
+                "structure": key[0],
+                "operation": key[1],
+                "size": key[2],
+                "baseline_ns_per_op": base["ns_per_op"],
+                "ns_per_op": result["ns_per_op"],
+                "ratio": ratio,
+                "regression": ratio > 1 + threshold,
+                "improvement": ratio < 1 - threshold,
+            }
+        )
+    return rows
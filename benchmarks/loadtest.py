@@ -0,0 +1,283 @@
+"""
+Prueba de carga en el mismo proceso sobre `api.main:app` (ASGI, sin red).
+
+Genera una mezcla configurable de lecturas/escrituras y de rutas JSON/HTML,
+y reporta throughput y latencias p50/p95/p99 por plantilla de ruta. Con
+varios tamaños en --properties el conjunto de datos crece entre rondas,
+lo que muestra cómo se degradan las rutas al aumentar los datos.
+
+Uso:
+    python -m benchmarks.loadtest --properties 100,1000,5000 --requests 2000
+    python -m benchmarks.loadtest --read-ratio 0.8 --html-ratio 0.5 --json report.json
+    python -m benchmarks.loadtest --compare report.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from random import Random
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.asgi import request
+
+
+@dataclass(frozen=True)
+class Operation:
+    """Una petición de la mezcla: método, plantilla de ruta y cómo instanciarla."""
+
+    method: str
+    template: str
+    kind: str  # "read" | "write"
+    html: bool
+    build: Callable[["Dataset", Random], Tuple[str, Dict[str, Any]]]
+
+    @property
+    def route(self) -> str:
+        return f"{self.method} {self.template}"
+
+
+class Dataset:
+    """Rangos de ids existentes, para generar rutas válidas."""
+
+    def __init__(self) -> None:
+        self.properties = 0
+        self.reviews = 0
+
+    def property_id(self, rng: Random) -> int:
+        return rng.randint(1, max(self.properties, 1))
+
+    def review_id(self, rng: Random) -> int:
+        return rng.randint(1, max(self.reviews, 1))
+
+
+def _review_payload(rng: Random) -> Dict[str, Any]:
+    return {"title": "Reseña de carga", "body": "Texto " * rng.randint(1, 20), "rating": rng.randint(1, 5)}
+
+
+OPERATIONS: List[Operation] = [
+    # --- lecturas JSON ---
+    Operation("GET", "/api/properties", "read", False, lambda d, r: ("/api/properties", {})),
+    Operation("GET", "/api/properties?filter=rating>=4&sort=-rating&limit=20", "read", False,
+              lambda d, r: ("/api/properties?filter=rating>=4&sort=-rating&limit=20", {})),
+    Operation("GET", "/api/properties/{property_id}", "read", False,
+              lambda d, r: (f"/api/properties/{d.property_id(r)}", {})),
+    Operation("GET", "/api/properties/{property_id}/reviews", "read", False,
+              lambda d, r: (f"/api/properties/{d.property_id(r)}/reviews", {})),
+    Operation("GET", "/api/reviews/{review_id}/comments", "read", False,
+              lambda d, r: (f"/api/reviews/{d.review_id(r)}/comments", {})),
+    Operation("GET", "/api/favorites", "read", False, lambda d, r: ("/api/favorites", {})),
+    # --- lecturas HTML ---
+    Operation("GET", "/", "read", True, lambda d, r: ("/", {})),
+    Operation("GET", "/properties/{property_id}", "read", True,
+              lambda d, r: (f"/properties/{d.property_id(r)}", {})),
+    Operation("GET", "/reviews/{review_id}", "read", True,
+              lambda d, r: (f"/reviews/{d.review_id(r)}", {})),
+    Operation("GET", "/favorites", "read", True, lambda d, r: ("/favorites", {})),
+    # --- escrituras JSON ---
+    Operation("POST", "/api/properties/{property_id}/reviews", "write", False,
+              lambda d, r: (f"/api/properties/{d.property_id(r)}/reviews", {"json_body": _review_payload(r)})),
+    Operation("PUT", "/api/properties/{property_id}", "write", False,
+              lambda d, r: (f"/api/properties/{d.property_id(r)}",
+                            {"json_body": {"address": "Calle editada", "body": "Texto", "rating": r.randint(1, 5)}})),
+    Operation("POST", "/api/reviews/{review_id}/comments", "write", False,
+              lambda d, r: (f"/api/reviews/{d.review_id(r)}/comments", {"json_body": {"body": "Comentario"}})),
+    Operation("POST", "/api/favorites/{property_id}", "write", False,
+              lambda d, r: (f"/api/favorites/{d.property_id(r)}", {})),
+    # --- escrituras HTML (formularios) ---
+    Operation("POST", "/reviews/{review_id}/comments/new", "write", True,
+              lambda d, r: (f"/reviews/{d.review_id(r)}/comments/new", {"form": {"body": "Comentario"}})),
+]
+
+
+def choose(rng: Random, read_ratio: float, html_ratio: float) -> Operation:
+    kind = "read" if rng.random() < read_ratio else "write"
+    html = rng.random() < html_ratio
+    candidates = [op for op in OPERATIONS if op.kind == kind and op.html == html]
+    if not candidates:
+        candidates = [op for op in OPERATIONS if op.kind == kind]
+    return rng.choice(candidates)
+
+
+def grow(dataset: Dataset, properties: int, reviews_per_property: int, seed: int) -> None:
+    """
+    Agrega propiedades hasta llegar a `properties`, con reseñas y
+    comentarios repartidos de forma sesgada (Zipf) mediante la carga masiva.
+    """
+    from benchmarks.dataset import DatasetSpec, load
+
+    added = properties - dataset.properties
+    if added <= 0:
+        return
+    reviews = added * reviews_per_property
+    load(
+        DatasetSpec(
+            properties=added,
+            reviews=reviews,
+            comments=reviews // 2,
+            favorites=max(1, added // 10),
+            seed=seed + properties,
+        )
+    )
+    dataset.properties += added
+    dataset.reviews += reviews
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Percentil por rango más cercano sobre una lista ya ordenada."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    latencies = sorted(latencies)
+    count = len(latencies)
+    return {
+        "count": count,
+        "errors": errors,
+        "throughput_rps": count / elapsed if elapsed else 0.0,
+        "mean_ms": sum(latencies) / count * 1000 if count else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": latencies[-1] * 1000 if count else 0.0,
+    }
+
+
+async def run_round(
+    app: Any,
+    dataset: Dataset,
+    requests: int,
+    concurrency: int,
+    read_ratio: float,
+    html_ratio: float,
+    rng: Random,
+) -> Dict[str, Any]:
+    plan = [choose(rng, read_ratio, html_ratio) for _ in range(requests)]
+    latencies: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+    cursor = 0
+
+    async def worker() -> None:
+        nonlocal cursor
+        while cursor < len(plan):
+            op = plan[cursor]
+            cursor += 1
+            url, kwargs = op.build(dataset, rng)
+            start = time.perf_counter()
+            response = await request(app, op.method, url, **kwargs)
+            latencies.setdefault(op.route, []).append(time.perf_counter() - start)
+            if response.status >= 500 or response.status in (400, 422):
+                errors[op.route] = errors.get(op.route, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    routes = {
+        route: summarize(values, errors.get(route, 0), elapsed)
+        for route, values in sorted(latencies.items())
+    }
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        "properties": dataset.properties,
+        "reviews": dataset.reviews,
+        "elapsed_s": elapsed,
+        "total": summarize(all_latencies, sum(errors.values()), elapsed),
+        "routes": routes,
+    }
+
+
+def print_round(result: Dict[str, Any]) -> None:
+    print(f"\n== {result['properties']} propiedades, {result['reviews']} reseñas "
+          f"({result['elapsed_s']:.2f}s) ==")
+    print(f"{'route':58} {'count':>6} {'err':>4} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    rows = list(result["routes"].items()) + [("TOTAL", result["total"])]
+    for route, stats in rows:
+        print(
+            f"{route:58} {stats['count']:>6} {stats['errors']:>4} {stats['throughput_rps']:>8.0f} "
+            f"{stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f}"
+        )
+
+
+def print_comparison(baseline: Dict[str, Any], report: Dict[str, Any]) -> None:
+    base_rounds = {r["properties"]: r for r in baseline.get("rounds", [])}
+    for current in report["rounds"]:
+        base = base_rounds.get(current["properties"])
+        if base is None:
+            continue
+        print(f"\n== comparación p95, {current['properties']} propiedades ==")
+        for route, stats in current["routes"].items():
+            old: Optional[Dict[str, Any]] = base["routes"].get(route)
+            if old is None or not old["p95_ms"]:
+                continue
+            ratio = stats["p95_ms"] / old["p95_ms"]
+            print(f"{route:58} {old['p95_ms']:>8.2f} -> {stats['p95_ms']:>8.2f} ms  x{ratio:.2f}")
+
+
+async def main_async(args: argparse.Namespace) -> Dict[str, Any]:
+    from api.main import app
+
+    rng = Random(args.seed)
+    dataset = Dataset()
+    rounds = []
+    for size in sorted(int(size) for size in args.properties.split(",")):
+        grow(dataset, size, args.reviews_per_property, args.seed)
+        result = await run_round(
+            app, dataset, args.requests, args.concurrency, args.read_ratio, args.html_ratio, rng
+        )
+        print_round(result)
+        rounds.append(result)
+    return {
+        "meta": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "read_ratio": args.read_ratio,
+            "html_ratio": args.html_ratio,
+            "reviews_per_property": args.reviews_per_property,
+            "seed": args.seed,
+        },
+        "rounds": rounds,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.loadtest",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--properties", default="100,1000",
+                        help="Tamaños del conjunto de datos por ronda, separados por coma")
+    parser.add_argument("--reviews-per-property", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=2000, help="Peticiones por ronda")
+    parser.add_argument("--concurrency", type=int, default=8, help="Clientes concurrentes")
+    parser.add_argument("--read-ratio", type=float, default=0.9, help="Fracción de lecturas (0-1)")
+    parser.add_argument("--html-ratio", type=float, default=0.3, help="Fracción de rutas HTML (0-1)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", dest="json_path", help="Guarda el reporte en este archivo")
+    parser.add_argument("--compare", help="Reporte JSON previo contra el que comparar p95")
+    args = parser.parse_args()
+
+    report = asyncio.run(main_async(args))
+
+    if args.json_path:
+        with open(args.json_path, "w") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"\nReporte guardado en {args.json_path}")
+    if args.compare:
+        with open(args.compare) as fh:
+            print_comparison(json.load(fh), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Escalado de escrituras con hilos: tabla única con un lock global frente a
+tabla particionada (ShardedST) con ids por bloques (IdAllocator).
+
+Cada hilo asigna un id, inserta la entidad y la vuelve a leer. Con el GIL
+los hilos se turnan y lo que se ve es el costo de sincronizar; en un
+CPython sin GIL (python3.13t) la versión particionada debería escalar con
+los hilos y la global quedarse plana.
+
+Uso:
+    python -m benchmarks.sharding --threads 1,2,4,8 --ops 200000
+    python -m benchmarks.sharding --shards 16 --json sharding.json
+"""
+
+import argparse
+import json
+import sys
+import threading
+from itertools import count
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Tuple
+
+from datastructures.IdAllocator import IdAllocator
+from datastructures.ShardedST import ShardedST
+from datastructures.SymbolTable import ST
+
+Store = Tuple[Callable[[], int], Callable[[int, Any], None], Callable[[int], Any]]
+
+
+def global_store(_shards: int) -> Store:
+    """Una ST, un lock y un contador compartido: todo hilo compite por lo mismo."""
+    table: ST[int, Any] = ST()
+    lock = threading.Lock()
+    ids = count(1)
+
+    def allocate() -> int:
+        with lock:
+            return next(ids)
+
+    def put(key: int, value: Any) -> None:
+        with lock:
+            table.put(key, value)
+
+    def get(key: int) -> Any:
+        with lock:
+            return table.get(key)
+
+    return allocate, put, get
+
+
+def sharded_store(shards: int) -> Store:
+    table: ShardedST[int, Any] = ShardedST(shards)
+    return IdAllocator().next, table.put, table.get
+
+
+STORES: Dict[str, Callable[[int], Store]] = {"global": global_store, "sharded": sharded_store}
+
+
+def run(store: Store, threads: int, ops: int) -> float:
+    """Escrituras por segundo con `threads` hilos repartiéndose `ops` altas."""
+    allocate, put, get = store
+    per_thread = ops // threads
+    barrier = threading.Barrier(threads + 1)
+
+    def worker() -> None:
+        barrier.wait()
+        for _ in range(per_thread):
+            key = allocate()
+            put(key, key)
+            get(key)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    started = perf_counter()
+    for thread in workers:
+        thread.join()
+    return per_thread * threads / (perf_counter() - started)
+
+
+def gil_enabled() -> bool:
+    check = getattr(sys, "_is_gil_enabled", None)
+    return True if check is None else check()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", default="1,2,4,8", help="Cantidades de hilos, separadas por coma")
+    parser.add_argument("--ops", type=int, default=200_000, help="Altas totales por corrida")
+    parser.add_argument("--shards", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3, help="Se toma la mejor de N corridas")
+    parser.add_argument("--json", dest="json_path", help="Guarda el resultado en este archivo")
+    args = parser.parse_args()
+
+    thread_counts = [int(n) for n in args.threads.split(",")]
+    print(f"Python {sys.version.split()[0]}, GIL {'activo' if gil_enabled() else 'desactivado'}, shards={args.shards}")
+    print(f"{'store':10} {'threads':>7} {'ops/s':>12} {'speedup':>8}")
+    results: List[Dict[str, Any]] = []
+    for name, factory in STORES.items():
+        baseline = None
+        for threads in thread_counts:
+            rate = max(run(factory(args.shards), threads, args.ops) for _ in range(args.repeat))
+            baseline = baseline or rate
+            print(f"{name:10} {threads:>7} {rate:>12,.0f} {rate / baseline:>7.2f}x")
+            results.append({"store": name, "threads": threads, "ops_per_sec": rate, "speedup": rate / baseline})
+    if args.json_path:
+        with open(args.json_path, "w") as fh:
+            json.dump({"gil": gil_enabled(), "shards": args.shards, "results": results}, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+from array import array
+from typing import Hashable, List
+
+
+class CountMinSketch:
+    """
+    Conteo aproximado de frecuencias en memoria fija.
+
+    `depth` filas de `width` contadores; cada fila tiene su propia función
+    hash. Agregar suma en un contador por fila y estimar toma el mínimo:
+    la estimación nunca es menor que el valor real y, con probabilidad
+    1 - (1/2)^depth, lo excede en a lo sumo 2 * total / width.
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 4) -> None:
+        """
+        Args:
+            width: Contadores por fila (>= 1)
+            depth: Número de filas / funciones hash (>= 1)
+
+        Raises:
+            ValueError: Si alguna dimensión no es positiva
+        """
+        if width < 1 or depth < 1:
+            raise ValueError("width and depth must be >= 1")
+        self._width = width
+        # Los contadores son float para poder aplicar decaimiento.
+        self._rows: List[array] = [array("d", bytes(8 * width)) for _ in range(depth)]
+        self._total = 0.0
+
+    def _slots(self, key: Hashable) -> List[int]:
+        width = self._width
+        return [hash((row, key)) % width for row in range(len(self._rows))]
+
+    def add(self, key: Hashable, count: float = 1.0) -> float:
+        """Suma `count` a la clave y devuelve su nueva estimación."""
+        estimate = float("inf")
+        for row, slot in zip(self._rows, self._slots(key)):
+            row[slot] += count
+            if row[slot] < estimate:
+                estimate = row[slot]
+        self._total += count
+        return estimate
+
+    def estimate(self, key: Hashable) -> float:
+        return min(row[slot] for row, slot in zip(self._rows, self._slots(key)))
+
+    def decay(self, factor: float) -> None:
+        """Multiplica todos los contadores por `factor` (0 < factor <= 1)."""
+        for i, row in enumerate(self._rows):
+            self._rows[i] = array("d", [value * factor for value in row])
+        self._total *= factor
+
+    def total(self) -> float:
+        return self._total
+
+    def footprint(self) -> int:
+        """Bytes de los contadores (fijos desde la creación)."""
+        return sum(row.itemsize * len(row) for row in self._rows)
+
+    def clear(self) -> None:
+        for row in self._rows:
+            for i in range(len(row)):
+                row[i] = 0.0
+        self._total = 0.0
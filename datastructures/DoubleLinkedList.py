@@ -1,7 +1,13 @@
-from typing import Iterator, overload
+from typing import Any, Callable, Iterator, overload
+
+from datastructures.ScanStats import ScanStats
 
 
 class DoubleLinkedList[T]:
+    # Llamadas y nodos recorridos por las operaciones lineales, sumados
+    # sobre todas las listas (se exponen en /metrics).
+    scans = ScanStats()
+
     class Node[NodeT]:
         """Nodo interno de la lista doblemente enlazada."""
 
@@ -99,9 +105,12 @@ class DoubleLinkedList[T]:
             True si se removió el elemento, False si no se encontró
         """
         current = self._first
+        visited = 0
 
         while current is not None:
+            visited += 1
             if current.item == item:
+                DoubleLinkedList.scans.record("remove", visited)
                 if current.prev is None:
                     self._first = current.next
                 else:
@@ -117,6 +126,7 @@ class DoubleLinkedList[T]:
 
             current = current.next
 
+        DoubleLinkedList.scans.record("remove", visited)
         return False
 
     def pop(self, index: int = -1, /) -> T:
@@ -155,6 +165,7 @@ class DoubleLinkedList[T]:
             raise IndexError(f"list index out of range: {index}")
 
         if index < self._count // 2:
+            DoubleLinkedList.scans.record("get_node", index + 1)
             current = self._first
             for _ in range(index):
                 if current is not None:
@@ -163,6 +174,7 @@ class DoubleLinkedList[T]:
                 raise IndexError(f"list index out of range: {index}")
             return current
         else:
+            DoubleLinkedList.scans.record("get_node", self._count - index)
             current = self._last
             for _ in range(self._count - 1 - index):
                 if current is not None:
@@ -262,10 +274,14 @@ class DoubleLinkedList[T]:
 
     def contains(self, item: T, /) -> bool:
         current = self._first
+        visited = 0
         while current is not None:
+            visited += 1
             if current.item == item:
+                DoubleLinkedList.scans.record("contains", visited)
                 return True
             current = current.next
+        DoubleLinkedList.scans.record("contains", visited)
         return False
 
     def index(self, item: T, /) -> int:
@@ -273,9 +289,11 @@ class DoubleLinkedList[T]:
         idx = 0
         while current is not None:
             if current.item == item:
+                DoubleLinkedList.scans.record("index", idx + 1)
                 return idx
             current = current.next
             idx += 1
+        DoubleLinkedList.scans.record("index", idx)
         raise ValueError(f"{item} is not in list")
 
     def count(self, item: T, /) -> int:
@@ -300,6 +318,106 @@ class DoubleLinkedList[T]:
             current.prev, current.next = current.next, current.prev
             current = current.prev
 
+    def sort(self, key: Callable[[T], Any] | None = None, reverse: bool = False) -> None:
+        """
+        Ordena la lista en su lugar con merge sort ascendente (bottom-up).
+        Operación O(n log n), estable y sin crear nodos nuevos: sólo se
+        reenlazan los nodos existentes.
+
+        Args:
+            key: Función que extrae la clave de comparación (default: el elemento)
+            reverse: Si es True, ordena de mayor a menor conservando el orden
+                relativo de los elementos con clave igual (como sorted)
+        """
+        if self._count < 2:
+            return
+
+        def comes_first(right: T, left: T) -> bool:
+            # True si el elemento de la derecha debe ir antes que el de la izquierda.
+            a = key(left) if key is not None else left
+            b = key(right) if key is not None else right
+            return b > a if reverse else b < a  # type: ignore[operator]
+
+        head = self._first
+        width = 1
+        while True:
+            left = head
+            head = None
+            tail: DoubleLinkedList.Node[T] | None = None
+            merges = 0
+
+            while left is not None:
+                merges += 1
+                right = left
+                left_size = 0
+                while left_size < width and right is not None:
+                    left_size += 1
+                    right = right.next
+                right_size = width
+
+                while left_size > 0 or (right_size > 0 and right is not None):
+                    if left_size == 0:
+                        chosen, right = right, right.next  # type: ignore[union-attr]
+                        right_size -= 1
+                    elif right_size == 0 or right is None:
+                        chosen, left = left, left.next  # type: ignore[union-attr]
+                        left_size -= 1
+                    elif comes_first(right.item, left.item):  # type: ignore[union-attr]
+                        chosen, right = right, right.next
+                        right_size -= 1
+                    else:
+                        chosen, left = left, left.next  # type: ignore[union-attr]
+                        left_size -= 1
+
+                    if tail is None:
+                        head = chosen
+                    else:
+                        tail.next = chosen
+                    chosen.prev = tail  # type: ignore[union-attr]
+                    tail = chosen
+
+                left = right
+
+            if tail is not None:
+                tail.next = None
+            if merges <= 1:
+                self._first = head
+                self._last = tail
+                return
+            width *= 2
+
+    def insert_sorted(
+        self, item: T, /, key: Callable[[T], Any] | None = None, reverse: bool = False
+    ) -> None:
+        """
+        Inserta el elemento manteniendo el orden de una lista ya ordenada
+        con los mismos `key`/`reverse`. Queda después de los elementos con
+        clave igual (estable). Recorre desde el final, así que insertar en
+        orden creciente es O(1).
+        """
+        item_key = key(item) if key is not None else item
+        current = self._last
+        visited = 0
+        while current is not None:
+            visited += 1
+            current_key = key(current.item) if key is not None else current.item
+            if not (current_key < item_key if reverse else item_key < current_key):  # type: ignore[operator]
+                break
+            current = current.prev
+        DoubleLinkedList.scans.record("insert_sorted", visited)
+
+        if current is None:
+            self.add_first(item)
+        elif current is self._last:
+            self.add_last(item)
+        else:
+            successor = current.next
+            new_node = DoubleLinkedList.Node(item, current, successor)
+            current.next = new_node
+            if successor is not None:
+                successor.prev = new_node
+            self._count += 1
+
     def is_empty(self) -> bool:
         return self._count == 0
 
@@ -312,6 +430,12 @@ class DoubleLinkedList[T]:
             yield current.item
             current = current.next
 
+    def __reversed__(self) -> Iterator[T]:
+        current = self._last
+        while current is not None:
+            yield current.item
+            current = current.prev
+
     def __repr__(self) -> str:
         items = list(self)
         return f"DoublyLinkedList({items})"
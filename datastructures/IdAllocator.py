@@ -0,0 +1,98 @@
+import heapq
+import threading
+from typing import List, Tuple
+
+
+class _Lease:
+    """Bloque de ids de un hilo: [next, end). Al morir el hilo devuelve el resto."""
+
+    __slots__ = ("allocator", "next", "end")
+
+    def __init__(self, allocator: "IdAllocator") -> None:
+        self.allocator = allocator
+        self.next = 0
+        self.end = 0
+
+    def __del__(self) -> None:
+        if self.next < self.end:
+            self.allocator._release(self.next, self.end)
+
+
+class IdAllocator:
+    """
+    Ids enteros únicos sin contención entre hilos.
+
+    Cada hilo reserva un bloque de `block` ids bajo un lock y después los
+    reparte sin sincronizar, así que el lock se toma una vez cada `block`
+    altas. Dentro de un bloque los ids son crecientes; con un solo hilo son
+    consecutivos (1, 2, 3, ...), igual que un contador. Lo que un hilo no
+    llegó a usar vuelve al terminar el hilo y se reparte antes que un
+    bloque nuevo, así que hilos de corta vida no dejan huecos.
+    """
+
+    def __init__(self, start: int = 1, block: int = 1024) -> None:
+        """
+        Raises:
+            ValueError: Si el bloque no es positivo
+        """
+        if block < 1:
+            raise ValueError("block must be >= 1")
+        self._block = block
+        # Primer id todavía no reservado por ningún hilo.
+        self._next = start
+        # Restos devueltos por hilos terminados: (inicio, fin).
+        self._free: List[Tuple[int, int]] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _lease(self) -> _Lease:
+        lease = getattr(self._local, "lease", None)
+        if lease is None:
+            lease = self._local.lease = _Lease(self)
+        return lease
+
+    def _release(self, start: int, end: int) -> None:
+        with self._lock:
+            if end == self._next:
+                self._next = start
+            else:
+                heapq.heappush(self._free, (start, end))
+
+    def next(self) -> int:
+        lease = self._lease()
+        current = lease.next
+        if current >= lease.end:
+            with self._lock:
+                if self._free:
+                    current, lease.end = heapq.heappop(self._free)
+                else:
+                    current = self._next
+                    self._next = lease.end = current + self._block
+        lease.next = current + 1
+        return current
+
+    def next_many(self, count: int) -> range:
+        """
+        `count` ids contiguos (cargas masivas). Usa lo que queda del bloque
+        del hilo y, si no alcanza, lo estira o reserva un tramo nuevo.
+        """
+        lease = self._lease()
+        current, end = lease.next, lease.end
+        if end - current < count:
+            with self._lock:
+                if end and self._next == end:
+                    # El bloque del hilo es el último reservado: se estira
+                    # sin dejar hueco.
+                    self._next = current + count
+                else:
+                    if current < end:
+                        heapq.heappush(self._free, (current, end))
+                    current = self._next
+                    self._next = current + count
+            lease.end = current + count
+        lease.next = current + count
+        return range(current, current + count)
+
+    def peek(self) -> int:
+        """Primer id aún no reservado (cota superior de los ids entregados)."""
+        return self._next
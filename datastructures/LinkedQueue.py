@@ -1,7 +1,12 @@
 from typing import Iterator
 
+from datastructures.ScanStats import ScanStats
+
 
 class LinkedQueue[T]:
+    # Nodos recorridos por las búsquedas lineales (se exponen en /metrics).
+    scans = ScanStats()
+
     class Node[E]:
         """Clase interna para representar un nodo de la cola."""
 
@@ -104,7 +109,16 @@ class LinkedQueue[T]:
         Verifica si un elemento está en la cola.
         Permite usar: item in queue
         """
-        return any(node_item == item for node_item in self)
+        current = self._first
+        visited = 0
+        while current is not None:
+            visited += 1
+            if current.item == item:
+                LinkedQueue.scans.record("contains", visited)
+                return True
+            current = current.next
+        LinkedQueue.scans.record("contains", visited)
+        return False
 
     def __repr__(self) -> str:
         """Representación en string para debugging."""
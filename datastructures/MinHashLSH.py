@@ -0,0 +1,95 @@
+from array import array
+from random import Random
+from typing import Dict, Hashable, Iterable, List, Optional, Set
+
+# Primo de Mersenne 2^61 - 1: módulo de las permutaciones universales.
+_PRIME = (1 << 61) - 1
+
+
+class MinHashLSH[K: Hashable]:
+    """
+    Índice de similitud de Jaccard aproximada: firmas MinHash agrupadas en
+    cubetas LSH.
+
+    La firma de un conjunto guarda, para cada una de `num_perm`
+    permutaciones, el menor hash de sus elementos. La probabilidad de que
+    dos firmas coincidan en una posición es la similitud de Jaccard de los
+    conjuntos. La firma se corta en `bands` bandas de num_perm / bands
+    filas; dos conjuntos son candidatos si coinciden en alguna banda
+    completa, lo que ocurre casi siempre por encima del umbral
+    (1 / bands) ^ (bands / num_perm) y casi nunca por debajo.
+
+    Cada cubeta guarda a lo sumo `max_bucket` claves (las más recientes),
+    así que buscar candidatos cuesta O(bands * max_bucket) sin importar
+    cuántas claves haya indexadas.
+    """
+
+    def __init__(self, num_perm: int = 32, bands: int = 8, max_bucket: int = 64, seed: int = 1) -> None:
+        """
+        Raises:
+            ValueError: Si `bands` no divide a `num_perm`
+        """
+        if num_perm < 1 or bands < 1 or num_perm % bands:
+            raise ValueError("bands must divide num_perm")
+        rng = Random(seed)
+        self._perms = [(rng.randrange(1, _PRIME) | 1, rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+        self._rows = num_perm // bands
+        self._max_bucket = max_bucket
+        self._buckets: List[Dict[int, List[K]]] = [{} for _ in range(bands)]
+        self._signatures: Dict[K, array] = {}
+
+    def signature(self, items: Iterable[Hashable]) -> array:
+        """Firma MinHash del conjunto (vacío: todas las posiciones en el máximo)."""
+        hashes = {hash(item) % _PRIME for item in items}
+        if not hashes:
+            return array("Q", [_PRIME] * len(self._perms))
+        return array("Q", [min((a * h + b) % _PRIME for h in hashes) for a, b in self._perms])
+
+    def _band_keys(self, signature: array) -> List[int]:
+        rows = self._rows
+        return [hash(tuple(signature[i * rows:(i + 1) * rows])) for i in range(len(self._buckets))]
+
+    def add(self, key: K, signature: array) -> None:
+        self.remove(key)
+        self._signatures[key] = signature
+        for buckets, band in zip(self._buckets, self._band_keys(signature)):
+            bucket = buckets.setdefault(band, [])
+            bucket.append(key)
+            if len(bucket) > self._max_bucket:
+                del bucket[0]
+
+    def remove(self, key: K) -> None:
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        for buckets, band in zip(self._buckets, self._band_keys(signature)):
+            bucket = buckets.get(band)
+            if bucket is not None and key in bucket:
+                bucket.remove(key)
+                if not bucket:
+                    del buckets[band]
+
+    def get(self, key: K) -> Optional[array]:
+        return self._signatures.get(key)
+
+    def candidates(self, signature: array) -> Set[K]:
+        """Claves que comparten al menos una banda con la firma."""
+        found: Set[K] = set()
+        for buckets, band in zip(self._buckets, self._band_keys(signature)):
+            bucket = buckets.get(band)
+            if bucket:
+                found.update(bucket)
+        return found
+
+    @staticmethod
+    def similarity(a: array, b: array) -> float:
+        """Jaccard estimada: fracción de posiciones iguales de dos firmas."""
+        return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+    def size(self) -> int:
+        return len(self._signatures)
+
+    def clear(self) -> None:
+        for buckets in self._buckets:
+            buckets.clear()
+        self._signatures.clear()
@@ -0,0 +1,70 @@
+from typing import Iterator, List, Optional
+
+
+class RingBuffer[T]:
+    """
+    Buffer circular de capacidad fija sobre un arreglo.
+
+    Al llenarse, cada inserción sobrescribe el elemento más antiguo, así
+    que la memoria queda acotada por `capacity` sin importar cuántos
+    elementos pasen por él. append es O(1).
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """
+        Args:
+            capacity: Número máximo de elementos retenidos (>= 1)
+
+        Raises:
+            ValueError: Si la capacidad no es positiva
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self._items: List[Optional[T]] = [None] * capacity
+        self._start = 0
+        self._count = 0
+        self._dropped = 0
+
+    def append(self, item: T, /) -> None:
+        """Agrega un elemento; si el buffer está lleno descarta el más antiguo."""
+        capacity = len(self._items)
+        if self._count < capacity:
+            self._items[(self._start + self._count) % capacity] = item
+            self._count += 1
+        else:
+            self._items[self._start] = item
+            self._start = (self._start + 1) % capacity
+            self._dropped += 1
+
+    def capacity(self) -> int:
+        return len(self._items)
+
+    def size(self) -> int:
+        return self._count
+
+    def is_empty(self) -> bool:
+        return self._count == 0
+
+    def dropped(self) -> int:
+        """Elementos descartados por falta de espacio desde la creación."""
+        return self._dropped
+
+    def clear(self) -> None:
+        self._items = [None] * len(self._items)
+        self._start = 0
+        self._count = 0
+
+    def __iter__(self) -> Iterator[T]:
+        """Recorre del más antiguo al más reciente."""
+        capacity = len(self._items)
+        for offset in range(self._count):
+            yield self._items[(self._start + offset) % capacity]  # type: ignore[misc]
+
+    def __reversed__(self) -> Iterator[T]:
+        """Recorre del más reciente al más antiguo."""
+        capacity = len(self._items)
+        for offset in range(self._count - 1, -1, -1):
+            yield self._items[(self._start + offset) % capacity]  # type: ignore[misc]
+
+    def __repr__(self) -> str:
+        return f"RingBuffer({list(self)}, capacity={len(self._items)})"
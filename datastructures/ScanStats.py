@@ -0,0 +1,35 @@
+from typing import Dict, List, Tuple
+
+
+class ScanStats:
+    """
+    Contadores de llamadas y de nodos recorridos por operación.
+
+    Cada estructura comparte una instancia entre todas sus listas, así que
+    registrar una operación cuesta una búsqueda en un dict y dos sumas. La
+    longitud media de recorrido de una operación es nodos / llamadas.
+    """
+
+    __slots__ = ("_ops",)
+
+    def __init__(self) -> None:
+        self._ops: Dict[str, List[int]] = {}
+
+    def record(self, op: str, nodes: int) -> None:
+        """
+        Args:
+            op: Nombre de la operación (p. ej. "remove")
+            nodes: Nodos o posiciones visitados por esta llamada
+        """
+        counts = self._ops.get(op)
+        if counts is None:
+            counts = self._ops[op] = [0, 0]
+        counts[0] += 1
+        counts[1] += nodes
+
+    def snapshot(self) -> Dict[str, Tuple[int, int]]:
+        """Copia de los contadores: operación -> (llamadas, nodos)."""
+        return {op: (calls, nodes) for op, (calls, nodes) in list(self._ops.items())}
+
+    def reset(self) -> None:
+        self._ops.clear()
@@ -0,0 +1,152 @@
+import heapq
+import threading
+from collections import Counter
+from random import Random
+from typing import Hashable, Iterable, Iterator, List, Optional
+
+from datastructures.SymbolTable import ST
+
+
+class ShardedST[K: Hashable, V]:
+    """
+    Tabla de símbolos particionada en `shards` ST, cada una con su propio
+    lock: escrituras de hilos distintos sólo compiten cuando caen en la
+    misma partición.
+
+    Las claves se reparten por tramos de `block` hashes consecutivos
+    (hash(key) // block). Con el mismo `block` que el IdAllocator, cada
+    bloque de ids de un hilo cae entero en una partición, así que un hilo
+    escribe casi siempre en la suya.
+
+    Recorrer mezcla las particiones por clave (las claves deben ser
+    comparables); como cada partición guarda tramos enteros, la mezcla
+    avanza por tramos y no compara elemento a elemento. Con ids crecientes
+    reproduce el orden de inserción de una ST única. Los recorridos no
+    toman locks: ven las escrituras concurrentes o no, pero nunca fallan.
+    """
+
+    def __init__(self, shards: int = 8, block: int = 1024) -> None:
+        """
+        Raises:
+            ValueError: Si `shards` o `block` no son positivos
+        """
+        if shards < 1 or block < 1:
+            raise ValueError("shards and block must be >= 1")
+        self._block = block
+        self._shards: List[ST[K, V]] = [ST() for _ in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+
+    def _index(self, key: K) -> int:
+        return hash(key) // self._block % len(self._shards)
+
+    def put(self, key: K, val: Optional[V]) -> None:
+        i = self._index(key)
+        with self._locks[i]:
+            self._shards[i].put(key, val)
+
+    def put_many(self, pairs: Iterable[tuple[K, V]]) -> None:
+        """Agrupa los pares por partición y toma cada lock una sola vez."""
+        groups: List[List[tuple[K, V]]] = [[] for _ in self._shards]
+        index = self._index
+        for key, val in pairs:
+            groups[index(key)].append((key, val))
+        for lock, shard, group in zip(self._locks, self._shards, groups):
+            if group:
+                with lock:
+                    shard.put_many(group)
+
+    def get(self, key: K) -> Optional[V]:
+        i = self._index(key)
+        with self._locks[i]:
+            return self._shards[i].get(key)
+
+    def get_many(self, keys: Iterable[K]) -> List[Optional[V]]:
+        """
+        Valores de varias claves, en el orden pedido (None si no existe).
+        Agrupa las claves por partición y toma cada lock una sola vez.
+        """
+        keys = list(keys)
+        groups: List[List[int]] = [[] for _ in self._shards]
+        index = self._index
+        for position, key in enumerate(keys):
+            groups[index(key)].append(position)
+        found: List[Optional[V]] = [None] * len(keys)
+        for lock, shard, positions in zip(self._locks, self._shards, groups):
+            if positions:
+                with lock:
+                    for position in positions:
+                        found[position] = shard.get(keys[position])
+        return found
+
+    def delete(self, key: K) -> None:
+        i = self._index(key)
+        with self._locks[i]:
+            self._shards[i].delete(key)
+
+    def contains(self, key: K) -> bool:
+        return self._shards[self._index(key)].contains(key)
+
+    def isEmpty(self) -> bool:
+        return all(shard.isEmpty() for shard in self._shards)
+
+    def size(self) -> int:
+        return sum(shard.size() for shard in self._shards)
+
+    def shard_sizes(self) -> List[int]:
+        return [shard.size() for shard in self._shards]
+
+    def iter_items(self) -> Iterator[tuple[K, V]]:
+        """Pares (clave, valor) de todas las particiones, mezclados por clave."""
+        if len(self._shards) == 1:
+            return self._shards[0].iter_items()
+        return self._merge()
+
+    def _merge(self) -> Iterator[tuple[K, V]]:
+        """
+        Mezcla por tramos: toma la partición con la menor clave y la
+        recorre mientras sus claves no superen la menor de las demás.
+        """
+        iterators = [shard.iter_items() for shard in self._shards]
+        heads = []
+        for i, iterator in enumerate(iterators):
+            pair = next(iterator, None)
+            if pair is not None:
+                heads.append((pair[0], i, pair))
+        heapq.heapify(heads)
+        while heads:
+            _key, i, pair = heapq.heappop(heads)
+            yield pair
+            if not heads:
+                yield from iterators[i]
+                return
+            bound = heads[0][0]
+            for pair in iterators[i]:
+                if pair[0] > bound:
+                    heapq.heappush(heads, (pair[0], i, pair))
+                    break
+                yield pair
+
+    def keys(self) -> List[K]:
+        return [pair[0] for pair in self.iter_items()]
+
+    def iter_values(self) -> Iterator[V]:
+        for pair in self.iter_items():
+            yield pair[1]
+
+    def sample(self, k: int, rng: Optional[Random] = None) -> List[V]:
+        """
+        Hasta k valores al azar: reparte k entre las particiones según su
+        tamaño y muestrea cada una sin recorrerla.
+        """
+        rng = rng or Random()
+        sizes = self.shard_sizes()
+        if k >= sum(sizes):
+            return list(self.iter_values())
+        picked: List[V] = []
+        for i, count in sorted(Counter(rng.choices(range(len(sizes)), weights=sizes, k=k)).items()):
+            picked.extend(self._shards[i].sample(min(count, sizes[i]), rng))
+        return picked
+
+    def footprint(self) -> int:
+        """Bytes aproximados de las particiones, sin contar claves ni valores."""
+        return sum(shard.footprint() for shard in self._shards)
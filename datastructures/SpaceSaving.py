@@ -0,0 +1,119 @@
+from typing import Dict, Hashable, List, Tuple
+
+
+class SpaceSaving[K: Hashable]:
+    """
+    Elementos más frecuentes de un flujo (algoritmo Space-Saving) con `k`
+    contadores fijos.
+
+    Un elemento nuevo con la tabla llena reemplaza al de menor conteo y
+    hereda ese conteo como error. Todo elemento con frecuencia real mayor
+    que total / k queda garantizado en la tabla, y para cada uno
+    `count - error <= real <= count`.
+
+    El mínimo se encuentra con un montículo indexado (posición de cada
+    clave), así que agregar es O(log k).
+    """
+
+    def __init__(self, k: int = 100) -> None:
+        """
+        Raises:
+            ValueError: Si k no es positivo
+        """
+        if k < 1:
+            raise ValueError("k must be >= 1")
+        self._k = k
+        self._keys: List[K] = []
+        self._counts: List[float] = []
+        self._errors: List[float] = []
+        self._pos: Dict[K, int] = {}
+
+    def add(self, key: K, count: float = 1.0) -> None:
+        pos = self._pos.get(key)
+        if pos is not None:
+            self._counts[pos] += count
+            self._sift_down(pos)
+            return
+        if len(self._keys) < self._k:
+            self._keys.append(key)
+            self._counts.append(count)
+            self._errors.append(0.0)
+            self._pos[key] = len(self._keys) - 1
+            self._sift_up(len(self._keys) - 1)
+            return
+        # Reemplaza al mínimo (la raíz).
+        del self._pos[self._keys[0]]
+        floor = self._counts[0]
+        self._keys[0] = key
+        self._counts[0] = floor + count
+        self._errors[0] = floor
+        self._pos[key] = 0
+        self._sift_down(0)
+
+    def _swap(self, i: int, j: int) -> None:
+        keys, counts, errors = self._keys, self._counts, self._errors
+        keys[i], keys[j] = keys[j], keys[i]
+        counts[i], counts[j] = counts[j], counts[i]
+        errors[i], errors[j] = errors[j], errors[i]
+        self._pos[keys[i]] = i
+        self._pos[keys[j]] = j
+
+    def _sift_up(self, i: int) -> None:
+        counts = self._counts
+        while i > 0:
+            parent = (i - 1) // 2
+            if counts[parent] <= counts[i]:
+                return
+            self._swap(i, parent)
+            i = parent
+
+    def _sift_down(self, i: int) -> None:
+        counts = self._counts
+        n = len(counts)
+        while True:
+            smallest = i
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < n and counts[child] < counts[smallest]:
+                    smallest = child
+            if smallest == i:
+                return
+            self._swap(i, smallest)
+            i = smallest
+
+    def top(self, n: int) -> List[Tuple[K, float, float]]:
+        """Los `n` elementos con mayor conteo: (clave, conteo, error), de mayor a menor."""
+        order = sorted(range(len(self._keys)), key=lambda i: self._counts[i], reverse=True)
+        return [(self._keys[i], self._counts[i], self._errors[i]) for i in order[:n]]
+
+    def discard(self, key: K) -> None:
+        """Quita una clave (p. ej. una entidad borrada) y libera su contador."""
+        pos = self._pos.get(key)
+        if pos is None:
+            return
+        last = len(self._keys) - 1
+        if pos != last:
+            self._swap(pos, last)
+        del self._pos[key]
+        self._keys.pop()
+        self._counts.pop()
+        self._errors.pop()
+        if pos < len(self._keys):
+            self._sift_down(pos)
+            self._sift_up(pos)
+
+    def decay(self, factor: float) -> None:
+        """Multiplica conteos y errores por `factor`; el orden del montículo se conserva."""
+        self._counts = [count * factor for count in self._counts]
+        self._errors = [error * factor for error in self._errors]
+
+    def size(self) -> int:
+        return len(self._keys)
+
+    def capacity(self) -> int:
+        return self._k
+
+    def clear(self) -> None:
+        self._keys.clear()
+        self._counts.clear()
+        self._errors.clear()
+        self._pos.clear()
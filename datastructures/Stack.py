@@ -58,6 +58,33 @@ class Stack[T]:
         self._top = None
         self._count = 0
 
+    def truncate(self, max_size: int, /) -> list[T]:
+        """
+        Conserva sólo los `max_size` elementos superiores y descarta los de
+        abajo (los más antiguos). Recorre `max_size` nodos.
+
+        Returns:
+            Los elementos descartados, del más reciente al más antiguo
+        """
+        if self._count <= max_size:
+            return []
+        dropped: list[T] = []
+        if max_size <= 0:
+            dropped = list(self)
+            self.clear()
+            return dropped
+
+        current = self._top
+        for _ in range(max_size - 1):
+            current = current.next  # type: ignore[union-attr]
+        rest = current.next  # type: ignore[union-attr]
+        current.next = None  # type: ignore[union-attr]
+        while rest is not None:
+            dropped.append(rest.item)
+            rest = rest.next
+        self._count = max_size
+        return dropped
+
     def to_list(self) -> list[T]:
         """Convierte la pila en una lista (de arriba hacia abajo)."""
         return list(self)
@@ -1,15 +1,31 @@
-from typing import TypeVar, Generic, Optional, List
+import sys
+from random import Random
+from typing import TypeVar, Generic, Optional, List, Iterator, Dict, Iterable
+
+from datastructures.ScanStats import ScanStats
 
 K = TypeVar('K')
 V = TypeVar('V')
 
 
 class ST(Generic[K, V]):
-    """Tabla de símbolos implementada usando una lista de pares clave-valor"""
+    """
+    Tabla de símbolos implementada usando una lista de pares clave-valor.
+
+    Un diccionario auxiliar clave -> posición en la lista hace que put, get
+    y contains sean O(1); la lista conserva el orden de inserción. Borrar
+    deja un hueco (None) en la lista, que se compacta cuando los huecos
+    superan a los elementos vivos, así que delete es O(1) amortizado.
+    """
+
+    # Solo se registran las operaciones que recorren la lista (carga
+    # masiva y compactación); las búsquedas son O(1) y no se cuentan.
+    scans = ScanStats()
 
     def __init__(self) -> None:
         """Crea una tabla de símbolos vacía"""
-        self._items: List[tuple[K, V]] = []
+        self._items: List[Optional[tuple[K, V]]] = []
+        self._positions: Dict[K, int] = {}
 
     def put(self, key: K, val: Optional[V]) -> None:
         """
@@ -24,15 +40,36 @@ class ST(Generic[K, V]):
             self.delete(key)
             return
 
+        i = self._positions.get(key)
+        if i is not None:
+            # Update existing key
+            self._items[i] = (key, val)
+            return
 
-        for i in range(len(self._items)):
-            if self._items[i][0] == key:
-                # Update existing key
-                self._items[i] = (key, val)
-                return
+        self._positions[key] = len(self._items)
+        self._items.append((key, val))
 
+    def put_many(self, pairs: Iterable[tuple[K, V]]) -> None:
+        """
+        Inserta varios pares de una vez (carga masiva).
+        Las claves repetidas se actualizan como en `put`.
 
-        self._items.append((key, val))
+        Args:
+            pairs: Pares (clave, valor); los valores None se ignoran
+        """
+        items = self._items
+        positions = self._positions
+        before = len(items)
+        for key, val in pairs:
+            if val is None:
+                continue
+            i = positions.get(key)
+            if i is not None:
+                items[i] = (key, val)
+            else:
+                positions[key] = len(items)
+                items.append((key, val))
+        ST.scans.record("put_many", len(items) - before)
 
     def get(self, key: K) -> Optional[V]:
         """
@@ -44,10 +81,10 @@ class ST(Generic[K, V]):
         Returns:
             El valor asociado a la clave, o None si la clave no existe
         """
-        for k, v in self._items:
-            if k == key:
-                return v
-        return None
+        i = self._positions.get(key)
+        if i is None:
+            return None
+        return self._items[i][1]  # type: ignore[index]
 
     def delete(self, key: K) -> None:
         """
@@ -56,10 +93,18 @@ class ST(Generic[K, V]):
         Args:
             key: La clave a eliminar
         """
-        for i in range(len(self._items)):
-            if self._items[i][0] == key:
-                self._items.pop(i)
-                return
+        i = self._positions.pop(key, None)
+        if i is None:
+            return
+        self._items[i] = None
+        if len(self._items) > 32 and len(self._positions) < len(self._items) // 2:
+            self._compact()
+
+    def _compact(self) -> None:
+        """Elimina los huecos de la lista y recalcula las posiciones."""
+        ST.scans.record("compact", len(self._items))
+        self._items = [pair for pair in self._items if pair is not None]
+        self._positions = {pair[0]: i for i, pair in enumerate(self._items)}
 
     def contains(self, key: K) -> bool:
         """
@@ -71,10 +116,7 @@ class ST(Generic[K, V]):
         Returns:
             True si la clave existe en la tabla, False en caso contrario
         """
-        for k, v in self._items:
-            if k == key:
-                return True
-        return False
+        return key in self._positions
 
     def isEmpty(self) -> bool:
         """
@@ -83,7 +125,7 @@ class ST(Generic[K, V]):
         Returns:
             True si la tabla está vacía, False en caso contrario
         """
-        return len(self._items) == 0
+        return len(self._positions) == 0
 
     def size(self) -> int:
         """
@@ -92,7 +134,7 @@ class ST(Generic[K, V]):
         Returns:
             El número de elementos en la tabla
         """
-        return len(self._items)
+        return len(self._positions)
 
     def keys(self) -> List[K]:
         """
@@ -101,4 +143,61 @@ class ST(Generic[K, V]):
         Returns:
             Una lista con todas las claves almacenadas
         """
-        return [k for k, v in self._items]
+        return [pair[0] for pair in self._items if pair is not None]
+
+    def iter_values(self) -> Iterator[V]:
+        """
+        Recorre los valores de la tabla sin construir una lista.
+
+        Returns:
+            Un iterador sobre los valores, en orden de inserción
+        """
+        for pair in self._items:
+            if pair is not None:
+                yield pair[1]
+
+    def iter_items(self) -> Iterator[tuple[K, V]]:
+        """
+        Recorre los pares (clave, valor) sin construir una lista.
+
+        Returns:
+            Un iterador sobre los pares, en orden de inserción
+        """
+        for pair in self._items:
+            if pair is not None:
+                yield pair
+
+    def sample(self, k: int, rng: Optional[Random] = None) -> List[V]:
+        """
+        Toma hasta k valores al azar sin recorrer la tabla: elige posiciones
+        de la lista y descarta las que son huecos. O(k) esperado, porque la
+        compactación mantiene los huecos por debajo de la mitad.
+
+        Args:
+            k: Número máximo de valores
+            rng: Generador aleatorio (para muestras reproducibles)
+        """
+        rng = rng or Random()
+        size = len(self._positions)
+        if k >= size:
+            return list(self.iter_values())
+        picked: Dict[int, V] = {}
+        items = self._items
+        while len(picked) < k:
+            i = rng.randrange(len(items))
+            pair = items[i]
+            if pair is not None:
+                picked[i] = pair[1]
+        return list(picked.values())
+
+    def footprint(self) -> int:
+        """
+        Bytes aproximados de la propia tabla (lista, diccionario de
+        posiciones y tuplas de pares), sin contar claves ni valores.
+        """
+        pair_size = sys.getsizeof((None, None))
+        return (
+            sys.getsizeof(self._items)
+            + sys.getsizeof(self._positions)
+            + pair_size * len(self._positions)
+        )
@@ -0,0 +1,90 @@
+from collections import deque
+from typing import Callable, Deque, Iterable, Iterator, List, Tuple
+
+
+class TimeBuckets[T]:
+    """
+    Índice por tiempo: los elementos se agrupan en cubetas de `width`
+    segundos, de la más antigua a la más reciente.
+
+    Los elementos llegan en orden de tiempo (se agregan al crearse), así
+    que agregar es O(1) y pedir "los de las últimas N horas" recorre sólo
+    las cubetas de la ventana: O(resultado + cubetas). Las cubetas fuera de
+    `retention` segundos se descartan enteras, y `max_items` acota el total.
+    """
+
+    def __init__(
+        self,
+        width: float,
+        retention: float,
+        max_items: int,
+        key: Callable[[T], float],
+    ) -> None:
+        """
+        Args:
+            width: Ancho de cada cubeta en segundos (> 0)
+            retention: Segundos que se conserva una cubeta
+            max_items: Tope de elementos en todas las cubetas
+            key: Marca de tiempo (epoch, segundos) de un elemento
+
+        Raises:
+            ValueError: Si el ancho no es positivo
+        """
+        if width <= 0:
+            raise ValueError("width must be > 0")
+        self._width = width
+        self._retention = retention
+        self._max_items = max_items
+        self._key = key
+        self._buckets: Deque[Tuple[int, List[T]]] = deque()
+        self._count = 0
+
+    def add(self, item: T, /) -> None:
+        self.extend((item,), self._key(item))
+
+    def extend(self, items: Iterable[T], timestamp: float) -> None:
+        """Agrega varios elementos con la misma marca de tiempo (carga masiva)."""
+        slot = int(timestamp // self._width)
+        buckets = self._buckets
+        # Si el reloj retrocede, el elemento va a la última cubeta: las
+        # consultas filtran por `key` igual, así que el resultado es correcto.
+        if not buckets or slot > buckets[-1][0]:
+            buckets.append((slot, []))
+        bucket = buckets[-1][1]
+        before = len(bucket)
+        bucket.extend(items)
+        self._count += len(bucket) - before
+        self._evict(slot)
+
+    def _evict(self, newest_slot: int) -> None:
+        buckets = self._buckets
+        oldest_kept = newest_slot - int(self._retention // self._width)
+        while len(buckets) > 1 and (buckets[0][0] < oldest_kept or self._count - len(buckets[0][1]) >= self._max_items):
+            self._count -= len(buckets.popleft()[1])
+        if self._count > self._max_items:
+            # Una sola cubeta excede el tope: se recorta por el principio.
+            bucket = buckets[0][1]
+            excess = self._count - self._max_items
+            del bucket[:excess]
+            self._count -= excess
+
+    def since(self, cutoff: float) -> Iterator[T]:
+        """Elementos con marca de tiempo >= cutoff, del más reciente al más antiguo."""
+        key = self._key
+        first_slot = int(cutoff // self._width)
+        for slot, bucket in reversed(self._buckets):
+            if slot < first_slot:
+                return
+            for item in reversed(bucket):
+                if key(item) >= cutoff:
+                    yield item
+
+    def size(self) -> int:
+        return self._count
+
+    def buckets(self) -> int:
+        return len(self._buckets)
+
+    def clear(self) -> None:
+        self._buckets.clear()
+        self._count = 0
@@ -0,0 +1,72 @@
+from typing import Callable, Iterator, Protocol
+
+
+class _Collection[T](Protocol):
+    def __iter__(self) -> Iterator[T]: ...
+
+    def size(self) -> int: ...
+
+
+class View[T]:
+    """
+    Vista de sólo lectura sobre una colección.
+
+    No copia los elementos: cada iteración recorre la estructura original,
+    así que las capas repositorio -> servicio -> API pueden pasarse la
+    vista sin construir listas intermedias.
+    """
+
+    __slots__ = ("_iterate", "_size")
+
+    def __init__(self, iterate: Callable[[], Iterator[T]], size: Callable[[], int]) -> None:
+        """
+        Args:
+            iterate: Función que devuelve un iterador nuevo sobre los elementos
+            size: Función que devuelve el número de elementos
+        """
+        self._iterate = iterate
+        self._size = size
+
+    @classmethod
+    def of(cls, collection: _Collection[T]) -> "View[T]":
+        """Vista sobre una estructura con `__iter__` y `size()` (listas, colas, pilas)."""
+        return cls(collection.__iter__, collection.size)
+
+    @classmethod
+    def empty(cls) -> "View[T]":
+        return cls(lambda: iter(()), lambda: 0)
+
+    def filter_map[R](self, fn: Callable[[T], R | None]) -> "View[R]":
+        """
+        Vista perezosa que aplica `fn` y descarta los resultados None.
+        El tamaño se calcula recorriendo la vista (sin copiar).
+        """
+
+        def iterate() -> Iterator[R]:
+            for item in self._iterate():
+                mapped = fn(item)
+                if mapped is not None:
+                    yield mapped
+
+        return View(iterate, lambda: sum(1 for _ in iterate()))
+
+    def size(self) -> int:
+        return self._size()
+
+    def is_empty(self) -> bool:
+        return self._size() == 0
+
+    def __iter__(self) -> Iterator[T]:
+        return self._iterate()
+
+    def __len__(self) -> int:
+        return self._size()
+
+    def __bool__(self) -> bool:
+        # Basta con encontrar un elemento; no hace falta contar.
+        for _ in self._iterate():
+            return True
+        return False
+
+    def __repr__(self) -> str:
+        return f"View({list(self)})"
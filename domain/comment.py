@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Optional
 
 
 @dataclass
@@ -6,3 +7,7 @@ class Comment:
     id: int
     review_id: int
     body: str
+    # Comentario al que responde (None = comentario de primer nivel).
+    parent_id: Optional[int] = None
+    # Momento de creación (epoch, segundos).
+    created_at: float = 0.0
@@ -1,9 +1,23 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import List
+from typing import Any, Callable, Dict, List, Tuple
 
 from datastructures.DoubleLinkedList import DoubleLinkedList  # Ajusta si tu nombre de clase cambia
+from datastructures.View import View
+
+
+# Campos por los que se pueden ordenar las reseñas de una propiedad.
+REVIEW_SORT_FIELDS = ("rating", "title")
+
+
+def _review_sort_key(sort: str) -> Tuple[Callable[[Any], Any], bool]:
+    name = sort.lstrip("-")
+    if name not in REVIEW_SORT_FIELDS:
+        raise ValueError(f"Unknown sort field: {name}")
+    # El id desempata: así una vista mantenida y una recién ordenada
+    # coinciden aunque una reseña se haya editado después.
+    return (lambda review: (getattr(review, name), review.id)), sort.startswith("-")
 
 
 @dataclass
@@ -13,18 +27,57 @@ class Property:
     body: str
     rating: int
     reviews: DoubleLinkedList = field(default_factory=DoubleLinkedList)
+    # Vistas ordenadas de `reviews` ("rating", "-title", ...), creadas la
+    # primera vez que se piden y mantenidas en cada alta/baja/edición.
+    _sorted_reviews: Dict[str, DoubleLinkedList] = field(
+        default_factory=dict, repr=False, compare=False
+    )
 
     def add_review(self, review: "Review") -> None:
         """Agrega una reseña a la lista de reseñas de la propiedad."""
         # Suponemos que DoubleLinkedList tiene un método append.
         self.reviews.append(review)
+        for sort, view in self._sorted_reviews.items():
+            key, reverse = _review_sort_key(sort)
+            view.insert_sorted(review, key=key, reverse=reverse)
 
     def remove_review(self, review: "Review") -> None:
         """Elimina una reseña de la lista de reseñas."""
         # Suponemos que DoubleLinkedList tiene un método remove.
         self.reviews.remove(review)
+        for view in self._sorted_reviews.values():
+            view.remove(review)
+
+    def reorder_review(self, review: "Review") -> None:
+        """Recoloca una reseña editada en las vistas ordenadas."""
+        for sort, view in self._sorted_reviews.items():
+            key, reverse = _review_sort_key(sort)
+            view.remove(review)
+            view.insert_sorted(review, key=key, reverse=reverse)
+
+    def sorted_view_sizes(self) -> List[int]:
+        """Tamaño de cada vista ordenada ya materializada."""
+        return [view.size() for view in self._sorted_reviews.values()]
+
+    def get_reviews(self) -> View["Review"]:
+        """Devuelve una vista de sólo lectura de las reseñas (sin copiarlas)."""
+        return View.of(self.reviews)
+
+    def get_sorted_reviews(self, sort: str) -> View["Review"]:
+        """
+        Devuelve las reseñas ordenadas por `sort` ("rating", "-rating",
+        "title", "-title"). La vista se ordena una sola vez con merge sort
+        y luego se mantiene, así que las siguientes llamadas no reordenan.
 
-    def get_reviews(self) -> List["Review"]:
-        """Devuelve una lista normal de reseñas (para serializar)."""
-        # Suponemos que DoubleLinkedList es iterable.
-        return [review for review in self.reviews]
+        Raises:
+            ValueError: Si el campo de orden no es válido
+        """
+        view = self._sorted_reviews.get(sort)
+        if view is None:
+            key, reverse = _review_sort_key(sort)
+            view = DoubleLinkedList()
+            for review in self.reviews:
+                view.append(review)
+            view.sort(key=key, reverse=reverse)
+            self._sorted_reviews[sort] = view
+        return View.of(view)
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import List
+from typing import Optional
 
 from datastructures.LinkedQueue import LinkedQueue  # Ajusta si tu nombre de clase cambia
+from datastructures.View import View
 
 
 @dataclass
@@ -13,6 +14,10 @@ class Review:
     title: str
     body: str
     rating: int
+    # Momento de creación (epoch, segundos).
+    created_at: float = 0.0
+    # Reseña casi idéntica anterior (política de duplicados "flag").
+    duplicate_of: Optional[int] = None
     comments: LinkedQueue = field(default_factory=LinkedQueue)
 
     def add_comment(self, comment: "Comment") -> None:
@@ -20,6 +25,8 @@ class Review:
         # Suponemos que LinkedQueue tiene enqueue.
         self.comments.enqueue(comment)
 
-    def get_comments(self) -> List["Comment"]:
-        """Devuelve una lista con todos los comentarios."""
-        return [comment for comment in self.comments]
+    def get_comments(self) -> View["Comment"]:
+        """Devuelve una vista de sólo lectura de los comentarios (sin copiarlos)."""
+        # `comments` se reemplaza al borrar un comentario, así que la vista
+        # resuelve el atributo en cada uso.
+        return View(lambda: iter(self.comments), lambda: self.comments.size())
@@ -0,0 +1,79 @@
+"""
+Estimación de memoria por muestreo.
+
+Medir cada objeto vivo con un recorrido profundo sería O(todo el heap);
+en su lugar se mide el tamaño "propio" de una muestra de entidades y se
+extrapola por la cantidad, mientras que las partes fijas (tablas, índices,
+nodos) se calculan con sys.getsizeof sobre los contenedores.
+"""
+
+import dataclasses
+import sys
+from typing import Any, Iterable, Sequence
+
+# Enteros pequeños compartidos por el intérprete: no ocupan memoria propia.
+_SMALL_INT_MIN = -5
+_SMALL_INT_MAX = 256
+# Desde 3.11 los atributos de instancia viven en un arreglo en línea con
+# las claves compartidas por la clase: ~8 bytes por valor más cabecera.
+_INLINE_VALUES = sys.version_info >= (3, 11)
+
+
+def _scalar_size(value: Any, holders: int) -> float:
+    """
+    Bytes de un atributo escalar. Un objeto compartido (un texto repetido,
+    un id que también es clave de un índice) se reparte entre sus
+    `holders` referencias, para no contarlo una vez por cada una.
+    """
+    if isinstance(value, bool) or value is None:
+        return 0
+    if isinstance(value, int):
+        if _SMALL_INT_MIN <= value <= _SMALL_INT_MAX:
+            return 0
+    elif not isinstance(value, (str, bytes, float)):
+        return 0
+    return sys.getsizeof(value) / max(1, holders)
+
+
+def _attribute_names(obj: Any) -> Sequence[str]:
+    # En las dataclasses se leen los campos uno a uno: pedir __dict__
+    # materializaría un diccionario que el intérprete no tenía creado.
+    if dataclasses.is_dataclass(obj):
+        return [f.name for f in dataclasses.fields(obj)]
+    return list(getattr(obj, "__dict__", ()))
+
+
+def own_size(obj: Any, exclude: Sequence[str] = ()) -> float:
+    """
+    Bytes del objeto, de sus atributos y de sus valores escalares (textos,
+    números). Los contenedores (listas de reseñas, colas...) no se
+    cuentan: se contabilizan aparte como estructuras.
+
+    Args:
+        obj: Entidad o nodo a medir
+        exclude: Atributos que no se deben sumar aunque sean escalares
+    """
+    total: float = sys.getsizeof(obj)
+    names = _attribute_names(obj)
+    if names:
+        if _INLINE_VALUES:
+            total += 8 * len(names) + 24
+        else:
+            total += sys.getsizeof(obj.__dict__)
+    for name in names:
+        if name in exclude:
+            continue
+        value = getattr(obj, name)
+        # getrefcount también ve la variable local y su propio argumento.
+        total += _scalar_size(value, sys.getrefcount(value) - 2)
+    return total
+
+
+def average_own_size(objs: Iterable[Any]) -> float:
+    """Tamaño propio promedio de una muestra (0 si está vacía)."""
+    total = 0.0
+    count = 0
+    for obj in objs:
+        total += own_size(obj)
+        count += 1
+    return total / count if count else 0.0
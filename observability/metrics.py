@@ -0,0 +1,182 @@
+"""
+Métricas en memoria con exposición en formato de texto de Prometheus.
+
+Los contadores son diccionarios etiqueta -> valor que se actualizan sin
+locks: bajo el GIL cada `inc` es una lectura y una escritura de dict, y en
+el peor caso dos hilos simultáneos pierden un incremento. A cambio, el
+coste por observación es de unas decenas de nanosegundos.
+"""
+
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+Labels = Tuple[str, ...]
+
+# Buckets por defecto para latencias HTTP, en segundos.
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+class Counter:
+    """Contador monótono, opcionalmente con etiquetas."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, labels: Labels = (), amount: float = 1) -> None:
+        values = self._values
+        values[labels] = values.get(labels, 0) + amount
+
+    def value(self, labels: Labels = ()) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> Iterable[str]:
+        for labels, value in list(self._values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Histogram:
+    """Histograma con buckets fijos (se exponen acumulados)."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # etiquetas -> [conteo por bucket (+Inf al final), suma, total]
+        self._series: Dict[Labels, List] = {}
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def count(self, labels: Labels = ()) -> int:
+        series = self._series.get(labels)
+        return series[2] if series else 0
+
+    def render(self) -> Iterable[str]:
+        for labels, (counts, total, count) in list(self._series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, labels, f'le=\"{le}\"')} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {repr(total)}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {count}"
+
+
+class Gauge:
+    """
+    Valor instantáneo calculado al momento de exponer las métricas.
+
+    `collect` devuelve pares (etiquetas, valor); así los tamaños de las
+    estructuras no cuestan nada en el camino de cada petición.
+    """
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str],
+        collect: Callable[[], Iterable[Tuple[Labels, float]]],
+        kind: str = "gauge",
+    ) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.kind = kind
+        self._collect = collect
+
+    def render(self) -> Iterable[str]:
+        for labels, value in self._collect():
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+Metric = Counter | Histogram | Gauge
+
+
+class Registry:
+    """Registro de métricas; pedir dos veces el mismo nombre devuelve la misma métrica."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Metric] = {}
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = Counter(name, help_text, labelnames)
+        return metric  # type: ignore[return-value]
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = Histogram(name, help_text, labelnames, buckets)
+        return metric  # type: ignore[return-value]
+
+    def gauge(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str],
+        collect: Callable[[], Iterable[Tuple[Labels, float]]],
+        kind: str = "gauge",
+    ) -> Gauge:
+        """
+        Registra una métrica calculada al exponer. `kind="counter"` sirve
+        para contadores que ya viven en otra parte (p. ej. en una estructura).
+        """
+        metric = Gauge(name, help_text, labelnames, collect, kind)
+        self._metrics[name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
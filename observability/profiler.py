@@ -0,0 +1,159 @@
+"""
+Perfilador por muestreo de pila, por petición.
+
+Un hilo de fondo toma cada `interval` segundos las pilas de todos los hilos
+(sys._current_frames) y atribuye cada muestra a la petición perfilada cuyo
+frame raíz aparece en la cadena. Como las rutas son `async def` y corren en
+el hilo del event loop, una muestra sólo cuenta cuando la petición está
+realmente ejecutando (no mientras espera en un await).
+
+El hilo sólo existe mientras hay peticiones perfiladas, así que con el
+perfilador apagado el coste es nulo.
+
+Las pilas se agregan por ruta en formato "collapsed" (una línea
+`raíz;...;hoja conteo`), el que consumen flamegraph.pl y speedscope.
+"""
+
+import sys
+import threading
+import time
+from types import CodeType, FrameType
+from typing import Dict, List, Optional
+
+# Tope de pilas distintas por ruta; el resto se acumula en OTHER_STACK.
+MAX_STACKS_PER_ROUTE = 5_000
+OTHER_STACK = "[other]"
+
+
+class ProfileSession:
+    """Muestras de una sola petición."""
+
+    __slots__ = ("stacks", "samples")
+
+    def __init__(self) -> None:
+        self.stacks: Dict[str, int] = {}
+        self.samples = 0
+
+    def add(self, stack: str) -> None:
+        self.stacks[stack] = self.stacks.get(stack, 0) + 1
+        self.samples += 1
+
+
+class StackSampler:
+    """Hilo de muestreo compartido por todas las peticiones perfiladas."""
+
+    def __init__(self, interval: float = 0.002) -> None:
+        """
+        Args:
+            interval: Segundos entre muestras
+        """
+        self.interval = interval
+        self._active: Dict[int, ProfileSession] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._labels: Dict[CodeType, str] = {}
+
+    def begin(self, root: FrameType) -> ProfileSession:
+        """
+        Empieza a muestrear la petición cuyo frame raíz es `root`; las
+        muestras incluyen sólo los frames por debajo de él.
+        """
+        session = ProfileSession()
+        with self._lock:
+            self._active[id(root)] = session
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+                self._thread.start()
+        return session
+
+    def end(self, root: FrameType) -> None:
+        with self._lock:
+            self._active.pop(id(root), None)
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._active:
+                    self._thread = None
+                    return
+                active = dict(self._active)
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != own_id:
+                    self._attribute(frame, active)
+
+    def _attribute(self, frame: Optional[FrameType], active: Dict[int, ProfileSession]) -> None:
+        stack: List[str] = []
+        while frame is not None:
+            session = active.get(id(frame))
+            if session is not None:
+                if stack:
+                    stack.reverse()
+                    session.add(";".join(stack))
+                return
+            stack.append(self._label(frame.f_code, frame))
+            frame = frame.f_back
+
+    def _label(self, code: CodeType, frame: FrameType) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            module = frame.f_globals.get("__name__", "?")
+            label = self._labels[code] = f"{module}:{code.co_qualname}"
+        return label
+
+
+class RouteProfile:
+    """Pilas agregadas de todas las peticiones perfiladas de una ruta."""
+
+    __slots__ = ("requests", "samples", "stacks")
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.samples = 0
+        self.stacks: Dict[str, int] = {}
+
+    def merge(self, session: ProfileSession) -> None:
+        self.requests += 1
+        self.samples += session.samples
+        stacks = self.stacks
+        for stack, count in session.stacks.items():
+            if stack not in stacks and len(stacks) >= MAX_STACKS_PER_ROUTE:
+                stack = OTHER_STACK
+            stacks[stack] = stacks.get(stack, 0) + count
+
+
+class ProfileStore:
+    """Perfiles acumulados por plantilla de ruta."""
+
+    def __init__(self) -> None:
+        self._routes: Dict[str, RouteProfile] = {}
+
+    def record(self, route: str, session: ProfileSession) -> None:
+        profile = self._routes.get(route)
+        if profile is None:
+            profile = self._routes[route] = RouteProfile()
+        profile.merge(session)
+
+    def get(self, route: str) -> Optional[RouteProfile]:
+        return self._routes.get(route)
+
+    def collapsed(self, route: str) -> str:
+        """Pilas de la ruta en formato collapsed, de la más a la menos frecuente."""
+        profile = self._routes.get(route)
+        if profile is None:
+            return ""
+        lines = sorted(profile.stacks.items(), key=lambda item: item[1], reverse=True)
+        return "".join(f"{stack} {count}\n" for stack, count in lines)
+
+    def summary(self) -> List[Dict[str, object]]:
+        return [
+            {"route": route, "requests": p.requests, "samples": p.samples, "stacks": len(p.stacks)}
+            for route, p in sorted(self._routes.items(), key=lambda item: item[1].samples, reverse=True)
+        ]
+
+    def clear(self) -> None:
+        self._routes.clear()
+
+
+profile_store = ProfileStore()
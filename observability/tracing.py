@@ -0,0 +1,237 @@
+"""
+Trazas en proceso: spans por capa (api -> servicio -> repositorio ->
+estructura de datos / dominio) sin colector externo.
+
+La traza activa viaja en una ContextVar, así que funciona igual en las
+rutas async y en las que FastAPI corre en el threadpool. Fuera de una
+traza, un método instrumentado sólo paga una lectura de la ContextVar.
+
+Cada traza terminada se guarda en un RingBuffer acotado y, si se
+configura un archivo, se escribe como una línea JSON.
+"""
+
+import functools
+import inspect
+import json
+import secrets
+import threading
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from datastructures.RingBuffer import RingBuffer
+
+# Tope de spans por traza: un recorrido de miles de nodos instrumentados
+# no debe poder crecer sin límite; los que sobran sólo se cuentan.
+MAX_SPANS_PER_TRACE = 2_000
+
+_current: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+class Span:
+    __slots__ = ("trace", "span_id", "parent_id", "name", "layer", "start", "duration", "attributes")
+
+    def __init__(self, trace: "Trace", span_id: int, parent_id: Optional[int], name: str, layer: str) -> None:
+        self.trace = trace
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.name = name
+        self.layer = layer
+        self.start = perf_counter()
+        self.duration = 0.0
+        self.attributes: Dict[str, Any] = {}
+
+    def finish(self) -> None:
+        self.duration = perf_counter() - self.start
+
+    def as_dict(self, origin: float) -> Dict[str, Any]:
+        return {
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "layer": self.layer,
+            "start_ms": round((self.start - origin) * 1000, 4),
+            "duration_ms": round(self.duration * 1000, 4),
+            "attributes": self.attributes,
+        }
+
+
+class Trace:
+    """Spans de una petición; el primero es la raíz."""
+
+    def __init__(self, name: str) -> None:
+        self.trace_id = secrets.token_hex(8)
+        self.token: Any = None
+        self.spans: List[Span] = []
+        self.dropped = 0
+        self.root = Span(self, 0, None, name, "api")
+        self.spans.append(self.root)
+
+    def start_span(self, name: str, layer: str, parent: Span) -> Optional[Span]:
+        if len(self.spans) >= MAX_SPANS_PER_TRACE:
+            self.dropped += 1
+            return None
+        span = Span(self, len(self.spans), parent.span_id, name, layer)
+        self.spans.append(span)
+        return span
+
+    def layer_times(self) -> Dict[str, float]:
+        """
+        Tiempo propio por capa, en ms: la duración de cada span menos la de
+        sus hijos directos. La suma es la duración de la raíz.
+        """
+        children: Dict[int, float] = {}
+        for span in self.spans:
+            if span.parent_id is not None:
+                children[span.parent_id] = children.get(span.parent_id, 0.0) + span.duration
+        layers: Dict[str, float] = {}
+        for span in self.spans:
+            own = max(0.0, span.duration - children.get(span.span_id, 0.0))
+            layers[span.layer] = layers.get(span.layer, 0.0) + own * 1000
+        return {layer: round(ms, 4) for layer, ms in layers.items()}
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "name": self.root.name,
+            "duration_ms": round(self.root.duration * 1000, 4),
+            "spans": len(self.spans),
+            "dropped_spans": self.dropped,
+            "layers": self.layer_times(),
+        }
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = self.summary()
+        data["spans"] = [span.as_dict(self.root.start) for span in self.spans]
+        return data
+
+
+class TraceStore:
+    """Últimas trazas terminadas (acotadas) y, opcionalmente, un archivo JSONL."""
+
+    def __init__(self, capacity: int = 200, path: Optional[str] = None) -> None:
+        self._traces: RingBuffer[Trace] = RingBuffer(capacity)
+        self._path = path
+        self._file = None
+        self._lock = threading.Lock()
+
+    def configure(self, capacity: int, path: Optional[str]) -> None:
+        with self._lock:
+            self._traces = RingBuffer(capacity)
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self._path = path
+
+    def record(self, trace: Trace) -> None:
+        with self._lock:
+            self._traces.append(trace)
+            if self._path:
+                if self._file is None:
+                    self._file = open(self._path, "a", encoding="utf-8", buffering=1)
+                self._file.write(json.dumps(trace.as_dict(), ensure_ascii=False, default=str) + "\n")
+
+    def recent(self, limit: int) -> List[Trace]:
+        """Las `limit` trazas más recientes, de la más nueva a la más vieja."""
+        result: List[Trace] = []
+        for trace in reversed(self._traces):
+            if len(result) >= limit:
+                break
+            result.append(trace)
+        return result
+
+    def get(self, trace_id: str) -> Optional[Trace]:
+        for trace in reversed(self._traces):
+            if trace.trace_id == trace_id:
+                return trace
+        return None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._traces.clear()
+
+
+trace_store = TraceStore()
+
+
+def start_trace(name: str) -> Trace:
+    """Abre una traza y la deja como activa en el contexto actual."""
+    trace = Trace(name)
+    trace.token = _current.set(trace.root)
+    return trace
+
+
+def end_trace(trace: Trace, name: Optional[str] = None) -> None:
+    """Cierra la raíz (opcionalmente renombrada) y guarda la traza."""
+    if name is not None:
+        trace.root.name = name
+    trace.root.finish()
+    _current.reset(trace.token)
+    trace_store.record(trace)
+
+
+def _attribute_value(value: Any) -> Any:
+    if isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, str):
+        return value if len(value) <= 64 else value[:61] + "..."
+    return None
+
+
+def _wrap(fn: Callable[..., Any], name: str, layer: str) -> Callable[..., Any]:
+    code = fn.__code__
+    # Nombres de los parámetros posicionales, sin `self`.
+    argnames = code.co_varnames[1:code.co_argcount]
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        parent = _current.get()
+        if parent is None:
+            return fn(*args, **kwargs)
+        span = parent.trace.start_span(name, layer, parent)
+        if span is None:
+            return fn(*args, **kwargs)
+        attributes = span.attributes
+        for argname, value in zip(argnames, args[1:]):
+            value = _attribute_value(value)
+            if value is not None:
+                attributes[argname] = value
+        token = _current.set(span)
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as exc:
+            attributes["error"] = type(exc).__name__
+            raise
+        finally:
+            _current.reset(token)
+            span.finish()
+        # Tamaños baratos de calcular: listas ya materializadas y
+        # estructuras con size() O(1).
+        if isinstance(result, (list, tuple)):
+            attributes["items"] = len(result)
+        size = getattr(args[0], "size", None) if args else None
+        if callable(size) and layer == "datastructure":
+            attributes["size"] = size()
+        return result
+
+    wrapper.__traced__ = True  # type: ignore[attr-defined]
+    return wrapper
+
+
+def instrument(cls: type, name: str, layer: str, methods: Optional[Iterable[str]] = None) -> None:
+    """
+    Envuelve métodos de `cls` para que abran un span "<name>.<método>".
+
+    Sin `methods` se instrumentan todos los métodos públicos. Los
+    generadores no se envuelven (el span sólo mediría su creación), y
+    llamar dos veces no duplica los spans.
+    """
+    if methods is None:
+        methods = [attr for attr in vars(cls) if not attr.startswith("_")]
+    for method in methods:
+        fn = vars(cls).get(method)
+        if not inspect.isfunction(fn) or getattr(fn, "__traced__", False):
+            continue
+        if inspect.isgeneratorfunction(fn) or inspect.iscoroutinefunction(fn):
+            continue
+        setattr(cls, method, _wrap(fn, f"{name}.{method}", layer))
@@ -0,0 +1,101 @@
+"""
+Registro de actividad reciente: altas de reseñas y comentarios.
+
+- Un RingBuffer con las últimas altas de ambos tipos, para el feed de
+  "lo último" (memoria fija, sin importar cuántas altas pasen).
+- Un TimeBuckets por tipo, para "las reseñas de las últimas N horas".
+
+Los repositorios registran cada alta; las bajas no se quitan de aquí:
+quien consulta descarta las entidades que ya no existen.
+"""
+
+from typing import Any, Dict, Iterator, List, NamedTuple
+
+from datastructures.RingBuffer import RingBuffer
+from datastructures.TimeBuckets import TimeBuckets
+
+KINDS = ("review", "comment")
+
+
+class Activity(NamedTuple):
+    kind: str
+    entity: Any
+
+
+def _created_at(entity: Any) -> float:
+    return entity.created_at
+
+
+class ActivityLog:
+    def __init__(
+        self,
+        capacity: int = 500,
+        bucket_seconds: float = 300.0,
+        retention_hours: float = 168.0,
+        max_entries: int = 200_000,
+    ) -> None:
+        """
+        Args:
+            capacity: Altas que guarda el feed
+            bucket_seconds: Ancho de las cubetas de tiempo
+            retention_hours: Horas que se conservan en las cubetas
+            max_entries: Tope de entidades en las cubetas, por tipo
+        """
+        self.configure(capacity, bucket_seconds, retention_hours, max_entries)
+
+    def configure(
+        self,
+        capacity: int,
+        bucket_seconds: float,
+        retention_hours: float,
+        max_entries: int,
+    ) -> None:
+        """Redimensiona el registro conservando lo que quepa (p. ej. datos cargados antes de la app)."""
+        previous_feed = list(getattr(self, "_feed", ()))
+        previous = getattr(self, "_windows", {})
+        self.retention_hours = retention_hours
+        self._feed: RingBuffer[Activity] = RingBuffer(capacity)
+        for activity in previous_feed:
+            self._feed.append(activity)
+        self._windows: Dict[str, TimeBuckets[Any]] = {}
+        for kind in KINDS:
+            window = TimeBuckets(bucket_seconds, retention_hours * 3600, max_entries, _created_at)
+            if kind in previous:
+                for entity in reversed(list(previous[kind].since(0))):
+                    window.add(entity)
+            self._windows[kind] = window
+
+    def record(self, kind: str, entity: Any) -> None:
+        """Registra una alta. O(1)."""
+        self._feed.append(Activity(kind, entity))
+        self._windows[kind].add(entity)
+
+    def record_many(self, kind: str, entities: List[Any], created_at: float) -> None:
+        """Registra una carga masiva: al feed sólo van las últimas que caben."""
+        if not entities:
+            return
+        for entity in entities[-self._feed.capacity():]:
+            self._feed.append(Activity(kind, entity))
+        self._windows[kind].extend(entities, created_at)
+
+    def latest(self) -> Iterator[Activity]:
+        """Altas del feed, de la más reciente a la más antigua."""
+        return reversed(self._feed)
+
+    def since(self, kind: str, cutoff: float) -> Iterator[Any]:
+        """Entidades de `kind` creadas desde `cutoff` (epoch), de la más reciente a la más antigua."""
+        return self._windows[kind].since(cutoff)
+
+    def stats(self) -> Dict[str, int]:
+        stats = {"feed": self._feed.size()}
+        for kind, window in self._windows.items():
+            stats[f"{kind}_window"] = window.size()
+        return stats
+
+    def clear(self) -> None:
+        self._feed.clear()
+        for window in self._windows.values():
+            window.clear()
+
+
+activity_log = ActivityLog()
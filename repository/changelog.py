@@ -0,0 +1,164 @@
+"""
+Registro de cambios (CDC) para sincronización incremental.
+
+Cada escritura de los repositorios llega por repository.events con su
+número de secuencia global; aquí se guarda como una entrada liviana
+(sin copiar la entidad) en orden de secuencia. Un espejo que ya vio
+hasta la secuencia N pide sólo las entradas posteriores en lugar de
+volver a descargar todo.
+
+El registro está acotado a `max_entries` entradas:
+
+- Compactación: de las entradas de una misma entidad sólo importa la
+  última (la entidad se lee en su estado actual), así que las
+  anteriores se descartan. Corre como trabajo periódico y también antes
+  de descartar por tamaño; las cargas masivas (sin id) no se compactan.
+- Si aun así no entra, se descartan las más viejas y sube `floor`: un
+  cliente que quedó más atrás ya no puede ponerse al día con deltas y
+  tiene que volver a descargar todo (resync).
+
+Todo corre en el hilo del event loop, así que no hace falta ningún lock.
+"""
+
+from bisect import bisect_right
+from time import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from repository.events import Change
+
+
+class ChangeEntry(NamedTuple):
+    seq: int
+    at: float
+    entity: str
+    op: str
+    entity_id: Optional[int]
+    parent_id: Optional[int]
+
+
+class ChangePage(NamedTuple):
+    """Respuesta a "qué cambió desde `since`"."""
+
+    entries: List[ChangeEntry]
+    # Secuencia desde la que seguir pidiendo (la última entregada).
+    next_seq: int
+    # Última secuencia registrada y la más vieja desde la que se puede sincronizar.
+    latest: int
+    floor: int
+    has_more: bool
+    resync_required: bool
+
+
+def _seq(entry: ChangeEntry) -> int:
+    return entry.seq
+
+
+class ChangeLog:
+    def __init__(self, max_entries: int = 50_000) -> None:
+        """
+        Args:
+            max_entries: Entradas que se conservan tras compactar y recortar
+        """
+        self.max_entries = max_entries
+        self._entries: List[ChangeEntry] = []
+        # (entidad, id) -> secuencia de su última entrada, para compactar.
+        self._latest: Dict[Tuple[str, int], int] = {}
+        # Se puede sincronizar desde cualquier secuencia >= floor.
+        self.floor = 0
+        self.latest = 0
+        self.compactions = 0
+        self.compacted = 0
+        self.evicted = 0
+
+    def configure(self, max_entries: int) -> None:
+        """
+        Raises:
+            ValueError: Si el tope no es positivo
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        self.max_entries = max_entries
+        self._trim()
+
+    def clear(self) -> None:
+        """
+        Descarta todas las entradas. Sube `floor` hasta `latest`: quien ya
+        sincronizó hasta ahí sigue recibiendo deltas, los demás hacen resync.
+        """
+        self._entries.clear()
+        self._latest.clear()
+        self.floor = self.latest
+
+    def record(self, change: Change) -> None:
+        """Suscriptor de eventos: agrega la escritura al final del registro."""
+        entry = ChangeEntry(change.seq, time(), change.entity, change.op, change.entity_id, change.parent_id)
+        self._entries.append(entry)
+        self.latest = change.seq
+        if change.entity_id is not None:
+            self._latest[(change.entity, change.entity_id)] = change.seq
+        # Holgura de 1/8: compactar y recortar es O(n), así queda O(1)
+        # amortizado por escritura.
+        if len(self._entries) > self.max_entries + self.max_entries // 8:
+            self._trim()
+
+    def compact(self) -> int:
+        """Descarta las entradas superadas por otra posterior de la misma entidad. Devuelve cuántas."""
+        latest = self._latest
+        before = len(self._entries)
+        self._entries = [
+            entry
+            for entry in self._entries
+            if entry.entity_id is None or latest.get((entry.entity, entry.entity_id)) == entry.seq
+        ]
+        removed = before - len(self._entries)
+        self.compactions += 1
+        self.compacted += removed
+        return removed
+
+    def _trim(self) -> None:
+        if len(self._entries) <= self.max_entries:
+            return
+        self.compact()
+        excess = len(self._entries) - self.max_entries
+        if excess <= 0:
+            return
+        for entry in self._entries[:excess]:
+            key = (entry.entity, entry.entity_id)
+            if entry.entity_id is not None and self._latest.get(key) == entry.seq:
+                del self._latest[key]
+        self.floor = self._entries[excess - 1].seq
+        del self._entries[:excess]
+        self.evicted += excess
+
+    def since(self, seq: int, limit: int = 100) -> ChangePage:
+        """
+        Entradas con secuencia mayor que `seq`, en orden, hasta `limit`.
+
+        Si `seq` es anterior a `floor` (se descartaron entradas que el
+        cliente no vio) o posterior a la última (el registro es de otro
+        arranque del proceso), no hay deltas válidos: `resync_required`.
+        """
+        if seq < self.floor or seq > self.latest:
+            return ChangePage([], self.latest, self.latest, self.floor, False, True)
+        entries = self._entries
+        start = bisect_right(entries, seq, key=_seq)
+        page = entries[start : start + limit]
+        next_seq = page[-1].seq if page else seq
+        return ChangePage(page, next_seq, self.latest, self.floor, start + limit < len(entries), False)
+
+    def size(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "floor": self.floor,
+            "latest": self.latest,
+            "compactions": self.compactions,
+            "compacted": self.compacted,
+            "evicted": self.evicted,
+        }
+
+
+change_log = ChangeLog()
@@ -1,43 +1,134 @@
-from typing import List, Optional
+import asyncio
+import sys
+from itertools import islice
+from random import Random
+from time import time
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
 
-from datastructures.SymbolTable import ST
+from datastructures.IdAllocator import IdAllocator
+from datastructures.ShardedST import ShardedST
+from datastructures.View import View
 from datastructures.LinkedQueue import LinkedQueue
 from domain.comment import Comment
 from domain.review import Review
-from repository.review_repository import review_repository
+from repository.activity import activity_log
+from repository.events import Change, events
+from repository.editable import EditableRepository
+from repository.history import edit_history
+from repository.indexes import HashIndex, IndexSet
+from repository.metrics import operations
+from repository.review_repository import SWEEP_CHUNK, review_repository
 
 
-class CommentRepository:
+class ThreadEntry(NamedTuple):
+    """Un comentario del hilo, su profundidad y cuántas respuestas directas tiene."""
+
+    comment: Comment
+    depth: int
+    replies: int
+
+
+class CommentRepository(EditableRepository):
     """
     Repositorio de comentarios.
 
-    - Tabla global de comentarios por id (ST)
+    - Tabla global de comentarios por id (ShardedST, ids por bloques)
     - Cada reseña guarda sus comentarios en una LinkedQueue.
+    - Índice secundario: `review_id` (hash).
+    - Respuestas: listas de hijos por id del comentario padre. Sólo existen
+      para comentarios con respuestas; los de primer nivel son los de la
+      cola de la reseña con `parent_id` None.
+    - Huérfanos: un comentario sólo se ve si su reseña se ve, así que al
+      borrar una reseña (o su propiedad) dejan de verse en el momento,
+      aunque el barrido que los borra corre después.
     """
 
+    kind = "comment"
+    editable_fields = ("body",)
+
     def __init__(self) -> None:
-        self._table = ST()
-        self._next_id = 1
+        self.clear()
+
+    def clear(self) -> None:
+        """Vacía la tabla, los índices y los hilos, y vuelve a contar ids desde 1."""
+        self._table: ShardedST[int, Comment] = ShardedST()
+        self._ids = IdAllocator()
+        self.indexes = IndexSet(HashIndex("review_id"))
+        self._replies: Dict[int, List[Comment]] = {}
+        # Reseñas borradas cuyos comentarios todavía no se barrieron.
+        self._orphaned: Set[int] = set()
 
-    def create(self, review: Review, body: str) -> Comment:
-        comment = Comment(id=self._next_id, review_id=review.id, body=body)
+    def create(self, review: Review, body: str, parent: Optional[Comment] = None) -> Comment:
+        operations.inc(("comment", "create"))
+        comment = Comment(
+            id=self._ids.next(),
+            review_id=review.id,
+            body=body,
+            parent_id=parent.id if parent is not None else None,
+            created_at=time(),
+        )
         review.add_comment(comment)
-        self._table.put(self._next_id, comment)
-        self._next_id += 1
+        self._table.put(comment.id, comment)
+        self.indexes.on_create(comment)
+        activity_log.record("comment", comment)
+        if parent is not None:
+            self._replies.setdefault(parent.id, []).append(comment)
+        events.emit("comment", "create", comment.id, comment.review_id)
         return comment
 
+    def bulk_create(self, rows: Iterable[Tuple[Review, str]]) -> List[Comment]:
+        """Carga masiva: crea un comentario por cada (reseña, body)."""
+        operations.inc(("comment", "bulk_create"))
+        created: List[Comment] = []
+        rows = list(rows)
+        created_at = time()
+        for comment_id, (review, body) in zip(self._ids.next_many(len(rows)), rows):
+            comment = Comment(id=comment_id, review_id=review.id, body=body, created_at=created_at)
+            review.add_comment(comment)
+            created.append(comment)
+        self._table.put_many((comment.id, comment) for comment in created)
+        self.indexes.on_bulk_create(created)
+        activity_log.record_many("comment", created, created_at)
+        events.emit("comment", "bulk_create")
+        return created
+
     def get(self, comment_id: int) -> Optional[Comment]:
-        return self._table.get(comment_id)
+        operations.inc(("comment", "get"))
+        comment = self._table.get(comment_id)
+        return comment if comment is not None and self._visible(comment) else None
+
+    def exists(self, comment_id: int) -> bool:
+        comment = self._table.get(comment_id)
+        return comment is not None and self._visible(comment)
+
+    def _pending(self) -> bool:
+        return bool(self._orphaned) or review_repository.has_orphans()
+
+    def _visible(self, comment: Comment) -> bool:
+        # Sin barridos pendientes no hay huérfanos: no hace falta mirar la reseña.
+        return not self._pending() or review_repository.exists(comment.review_id)
 
     def update(self, comment_id: int, body: str) -> Optional[Comment]:
+        operations.inc(("comment", "update"))
         comment = self.get(comment_id)
         if comment is None:
             return None
-        comment.body = body
-        self._table.put(comment_id, comment)
+        self._edited(comment, {"body": body})
         return comment
 
+    def _parent_id(self, comment: Comment) -> int:
+        return comment.review_id
+
+    def _apply(self, comment: Comment, values: Dict[str, Any]) -> Dict[str, Any]:
+        """Asigna los campos y devuelve los valores anteriores de los que cambiaron."""
+        changed = {name: getattr(comment, name) for name, value in values.items() if getattr(comment, name) != value}
+        for name, value in values.items():
+            setattr(comment, name, value)
+        self._table.put(comment.id, comment)
+        return changed
+
     def delete(self, comment_id: int) -> bool:
+        operations.inc(("comment", "delete"))
         comment = self.get(comment_id)
         if comment is None:
             return False
@@ -52,14 +143,146 @@ class CommentRepository:
                     new_queue.enqueue(c)
             review.comments = new_queue
 
+        self._detach(comment)
         self._table.delete(comment_id)
+        self.indexes.on_delete(comment)
+        edit_history.discard("comment", comment_id)
+        events.emit("comment", "delete", comment_id, comment.review_id)
         return True
 
-    def list_by_review(self, review_id: int) -> List[Comment]:
+    async def delete_by_review(self, review_id: int) -> int:
+        """
+        Borra los comentarios (huérfanos) de una reseña ya borrada, con sus
+        hilos completos: no hace falta re-colgar respuestas. Va de a
+        SWEEP_CHUNK y cede el event loop entre tramos. Devuelve cuántos.
+        """
+        deleted = 0
+        while True:
+            orphans = list(islice(self.indexes.find("review_id", review_id), SWEEP_CHUNK))
+            if not orphans:
+                break
+            for comment in orphans:
+                self._replies.pop(comment.id, None)
+                self._table.delete(comment.id)
+                self.indexes.on_delete(comment)
+                edit_history.discard("comment", comment.id)
+                events.emit("comment", "delete", comment.id, review_id)
+            deleted += len(orphans)
+            await asyncio.sleep(0)
+        self._orphaned.discard(review_id)
+        return deleted
+
+    def on_change(self, change: Change) -> None:
+        """
+        Suscriptor de eventos: los comentarios de una reseña borrada dejan
+        de verse en el momento; el barrido (`delete_by_review`) lo encola
+        la app.
+        """
+        if change.entity == "review" and change.op == "delete" and change.entity_id is not None:
+            self._orphaned.add(change.entity_id)
+
+    def _detach(self, comment: Comment) -> None:
+        """
+        Saca el comentario del árbol de respuestas. Sus respuestas no se
+        pierden: pasan a colgar del padre del comentario borrado (o a ser
+        de primer nivel), en orden de creación.
+        """
+        if comment.parent_id is not None:
+            siblings = self._replies.get(comment.parent_id)
+            if siblings is not None:
+                siblings.remove(comment)
+                if not siblings:
+                    del self._replies[comment.parent_id]
+        orphans = self._replies.pop(comment.id, None)
+        if not orphans:
+            return
+        for child in orphans:
+            child.parent_id = comment.parent_id
+        if comment.parent_id is not None:
+            siblings = self._replies.setdefault(comment.parent_id, [])
+            siblings.extend(orphans)
+            siblings.sort(key=lambda c: c.id)
+
+    def thread(
+        self,
+        review_id: int,
+        max_depth: Optional[int] = None,
+        parent_id: Optional[int] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> Optional[List[ThreadEntry]]:
+        """
+        Hilo de comentarios en preorden: cada comentario va seguido de todas
+        sus respuestas, así que el subárbol de un comentario es un tramo
+        contiguo y el anidamiento se reconstruye en una pasada con una pila.
+
+        Args:
+            review_id: Reseña del hilo
+            max_depth: Niveles de respuestas a incluir (None = todos)
+            parent_id: Si se indica, el subárbol bajo ese comentario
+            offset: Comentarios de primer nivel (del hilo o del subárbol) a saltar
+            limit: Máximo de comentarios de primer nivel
+
+        Returns:
+            Las entradas del hilo, o None si la reseña o el comentario no
+            existen (o el comentario es de otra reseña)
+        """
+        operations.inc(("comment", "thread"))
+        replies = self._replies
+        if parent_id is None:
+            review = review_repository.get(review_id)
+            if review is None:
+                return None
+            top: Iterable[Comment] = (c for c in review.comments if c.parent_id is None)
+        else:
+            parent = self._table.get(parent_id)
+            if parent is None or parent.review_id != review_id or not self._visible(parent):
+                return None
+            top = replies.get(parent_id, ())
+
+        entries: List[ThreadEntry] = []
+        stop = None if limit is None else offset + limit
+        for root in islice(top, offset, stop):
+            stack = [(root, 0)]
+            while stack:
+                comment, depth = stack.pop()
+                children = replies.get(comment.id, ())
+                entries.append(ThreadEntry(comment, depth, len(children)))
+                if children and (max_depth is None or depth < max_depth):
+                    stack.extend((child, depth + 1) for child in reversed(children))
+        return entries
+
+    def list_by_review(self, review_id: int) -> View[Comment]:
+        operations.inc(("comment", "list_by_review"))
         review = review_repository.get(review_id)
         if review is None:
-            return []
+            return View.empty()
         return review.get_comments()
 
+    def size(self) -> int:
+        return self._table.size()
+
+    def sample(self, k: int, rng: Optional[Random] = None) -> List[Comment]:
+        """Hasta k entidades al azar, sin recorrer la tabla."""
+        return self._table.sample(k, rng)
+
+    def footprint(self) -> int:
+        """Bytes aproximados de la tabla, los índices y las listas de respuestas, sin las entidades."""
+        replies = sys.getsizeof(self._replies) + sum(sys.getsizeof(c) for c in self._replies.values())
+        return self._table.footprint() + self.indexes.footprint() + replies
+
+    def find(self, field: str, value: Optional[Any] = None) -> View[Comment]:
+        """Busca comentarios usando el índice secundario de `field`."""
+        operations.inc(("comment", "find"))
+
+        def alive() -> Iterator[Comment]:
+            return (comment for comment in self.indexes.find(field, value) if self._visible(comment))
+
+        # Mientras haya huérfanos sin barrer, contar es recorrer.
+        return View(
+            alive,
+            lambda: sum(1 for _ in alive()) if self._pending() else self.indexes.count(field, value),
+        )
+
 
 comment_repository = CommentRepository()
@@ -0,0 +1,67 @@
+"""
+Deshacer e historial de ediciones, comunes a los repositorios.
+
+Un repositorio editable declara `kind` (nombre de la entidad en el
+historial y en los eventos) y `editable_fields`, e implementa `get` y
+`_apply`; los deltas viven en repository.history.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+
+from repository.events import events
+from repository.history import edit_history
+from repository.metrics import operations
+
+
+class EditableRepository(ABC):
+    kind: str
+    # Campos que se pueden editar (y por lo tanto deshacer).
+    editable_fields: Tuple[str, ...]
+
+    @abstractmethod
+    def get(self, entity_id: int) -> Optional[Any]:
+        """La entidad con ese id, o None si no existe."""
+
+    @abstractmethod
+    def _apply(self, entity: Any, values: Dict[str, Any]) -> Dict[str, Any]:
+        """Asigna los campos y devuelve los valores anteriores de los que cambiaron."""
+
+    def _parent_id(self, entity: Any) -> Optional[int]:
+        """Entidad a la que pertenece, para los eventos (ver repository.events)."""
+        return None
+
+    def _edited(self, entity: Any, values: Dict[str, Any]) -> None:
+        """Aplica una edición, guarda su delta y la publica."""
+        changed = self._apply(entity, values)
+        edit_history.record(self.kind, entity.id, changed)
+        events.emit(self.kind, "update", entity.id, self._parent_id(entity))
+
+    def undo(self, entity_id: int) -> Optional[Any]:
+        """
+        Deshace la última edición registrada. O(1): saca un delta de la pila.
+
+        Returns:
+            La entidad restaurada, o None si no existe
+
+        Raises:
+            ValueError: Si no hay ediciones que deshacer
+        """
+        operations.inc((self.kind, "undo"))
+        entity = self.get(entity_id)
+        if entity is None:
+            return None
+        delta = edit_history.pop(self.kind, entity_id)
+        if delta is None:
+            raise ValueError("Nothing to undo")
+        self._apply(entity, delta.old)
+        events.emit(self.kind, "undo", entity_id, self._parent_id(entity))
+        return entity
+
+    def history(self, entity_id: int, offset: int = 0, limit: int = 20) -> Optional[List[Dict[str, Any]]]:
+        """Ediciones de la entidad, de la más reciente a la más antigua (None si no existe)."""
+        entity = self.get(entity_id)
+        if entity is None:
+            return None
+        current = {name: getattr(entity, name) for name in self.editable_fields}
+        return edit_history.changes(self.kind, entity_id, current, offset, limit)
@@ -0,0 +1,57 @@
+"""
+Eventos de cambio emitidos por los repositorios.
+
+Cada escritura (alta, edición, baja, deshacer, carga masiva) publica un
+Change; quien necesite enterarse (cachés, flujos) se suscribe aquí en
+lugar de que los repositorios lo conozcan.
+
+Cada Change lleva un número de secuencia global y creciente, asignado
+al emitirlo (haya o no suscriptores): es el orden de las escrituras.
+"""
+
+from dataclasses import dataclass
+from itertools import count
+from typing import Callable, List, Optional
+
+Subscriber = Callable[["Change"], None]
+
+
+@dataclass(frozen=True, slots=True)
+class Change:
+    entity: str  # "property" | "review" | "comment" | "favorite"
+    op: str  # "create" | "update" | "delete" | "undo" | "bulk_create"
+    entity_id: Optional[int] = None
+    # Entidad a la que pertenece: la propiedad de una reseña o de un
+    # favorito, la reseña de un comentario.
+    parent_id: Optional[int] = None
+    seq: int = 0
+
+
+class EventBus:
+    def __init__(self) -> None:
+        self._subscribers: List[Subscriber] = []
+        self._sequence = count(1)
+        # Secuencia de la última escritura emitida.
+        self.last_seq = 0
+
+    def subscribe(self, subscriber: Subscriber) -> Callable[[], None]:
+        """Registra un suscriptor; devuelve la función para darlo de baja."""
+        self._subscribers.append(subscriber)
+
+        def unsubscribe() -> None:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+        return unsubscribe
+
+    def emit(self, entity: str, op: str, entity_id: Optional[int] = None, parent_id: Optional[int] = None) -> None:
+        # next() sobre un count es atómico con el GIL: no hace falta lock.
+        seq = self.last_seq = next(self._sequence)
+        if not self._subscribers:
+            return
+        change = Change(entity, op, entity_id, parent_id, seq)
+        for subscriber in list(self._subscribers):
+            subscriber(change)
+
+
+events = EventBus()
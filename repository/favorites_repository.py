@@ -1,6 +1,9 @@
-from typing import List
+from typing import Iterable
 
 from datastructures.DoubleLinkedList import DoubleLinkedList
+from datastructures.View import View
+from repository.events import events
+from repository.metrics import operations
 
 
 class FavoritesRepository:
@@ -11,22 +14,44 @@ class FavoritesRepository:
     def __init__(self) -> None:
         self._favorites = DoubleLinkedList()
 
+    def clear(self) -> None:
+        self._favorites.clear()
+
     def add(self, property_id: int) -> None:
+        operations.inc(("favorites", "add"))
         # Evitar duplicados
-        for pid in self._favorites:
-            if pid == property_id:
-                return
+        if self._favorites.contains(property_id):
+            return
         self._favorites.append(property_id)
+        events.emit("favorite", "create", property_id, property_id)
+
+    def bulk_add(self, property_ids: Iterable[int]) -> None:
+        """Carga masiva: agrega varios ids, omitiendo los ya presentes."""
+        operations.inc(("favorites", "bulk_add"))
+        seen = set(self._favorites)
+        for pid in property_ids:
+            if pid not in seen:
+                seen.add(pid)
+                self._favorites.append(pid)
+        events.emit("favorite", "bulk_create")
 
     def remove(self, property_id: int) -> bool:
-        for pid in self._favorites:
-            if pid == property_id:
-                self._favorites.remove(pid)
-                return True
-        return False
-
-    def list_all(self) -> List[int]:
-        return [pid for pid in self._favorites]
+        operations.inc(("favorites", "remove"))
+        removed = self._favorites.remove(property_id)
+        if removed:
+            events.emit("favorite", "delete", property_id, property_id)
+        return removed
+
+    def contains(self, property_id: int) -> bool:
+        operations.inc(("favorites", "contains"))
+        return self._favorites.contains(property_id)
+
+    def list_all(self) -> View[int]:
+        operations.inc(("favorites", "list_all"))
+        return View.of(self._favorites)
+
+    def size(self) -> int:
+        return self._favorites.size()
 
 
 favorites_repository = FavoritesRepository()
@@ -0,0 +1,170 @@
+"""
+Historial de ediciones por entidad.
+
+Cada edición guarda sólo los campos que cambiaron, con su valor anterior
+(un delta), en una Stack por entidad: deshacer es un pop O(1). El
+historial está acotado por entidad y globalmente (entradas y bytes
+aproximados); al pasar el tope global se descarta el historial completo
+de la entidad editada hace más tiempo.
+"""
+
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from datastructures.Stack import Stack
+
+HistoryKey = Tuple[str, int]
+
+# Costo fijo aproximado de un delta: el objeto, su diccionario y el nodo
+# de la pila.
+_DELTA_OVERHEAD = 200
+
+
+@dataclass(slots=True)
+class Delta:
+    """Valores anteriores de los campos que cambió una edición."""
+
+    edit_id: int
+    changed_at: float
+    old: Dict[str, Any]
+    size: int
+
+
+def _delta_size(old: Dict[str, Any]) -> int:
+    return _DELTA_OVERHEAD + sum(sys.getsizeof(value) for value in old.values())
+
+
+class EditHistory:
+    def __init__(
+        self,
+        max_per_entity: int = 50,
+        max_entries: int = 100_000,
+        max_bytes: int = 32 * 1024 * 1024,
+    ) -> None:
+        self._stacks: "OrderedDict[HistoryKey, Stack[Delta]]" = OrderedDict()
+        self._next_edit_id = 1
+        self._entries = 0
+        self._bytes = 0
+        self._evicted = 0
+        self.configure(max_per_entity, max_entries, max_bytes)
+
+    def configure(self, max_per_entity: int, max_entries: int, max_bytes: int) -> None:
+        self.max_per_entity = max_per_entity
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._evict()
+
+    def record(self, kind: str, entity_id: int, old: Dict[str, Any]) -> Optional[Delta]:
+        """
+        Guarda los valores anteriores de los campos cambiados. Una edición
+        que no cambió nada no ocupa historial.
+        """
+        if not old or self.max_per_entity <= 0:
+            return None
+        key = (kind, entity_id)
+        stack = self._stacks.get(key)
+        if stack is None:
+            stack = self._stacks[key] = Stack()
+        else:
+            self._stacks.move_to_end(key)
+
+        delta = Delta(self._next_edit_id, time.time(), old, _delta_size(old))
+        self._next_edit_id += 1
+        stack.push(delta)
+        self._entries += 1
+        self._bytes += delta.size
+
+        for dropped in stack.truncate(self.max_per_entity):
+            self._forget(dropped)
+        self._evict()
+        return delta
+
+    def pop(self, kind: str, entity_id: int) -> Optional[Delta]:
+        """Saca la edición más reciente de la entidad (para deshacerla)."""
+        key = (kind, entity_id)
+        stack = self._stacks.get(key)
+        if stack is None:
+            return None
+        delta = stack.pop()
+        self._forget(delta)
+        if stack.is_empty():
+            del self._stacks[key]
+        return delta
+
+    def discard(self, kind: str, entity_id: int) -> None:
+        """Borra el historial de una entidad (p. ej. al eliminarla)."""
+        stack = self._stacks.pop((kind, entity_id), None)
+        if stack is not None:
+            for delta in stack:
+                self._forget(delta)
+
+    def changes(
+        self,
+        kind: str,
+        entity_id: int,
+        current: Dict[str, Any],
+        offset: int = 0,
+        limit: int = 20,
+    ) -> List[Dict[str, Any]]:
+        """
+        Ediciones de la más reciente a la más antigua, paginadas. El valor
+        nuevo de cada campo no se guarda: se reconstruye partiendo del
+        estado actual (`current`) y retrocediendo delta por delta.
+        """
+        stack = self._stacks.get((kind, entity_id))
+        if stack is None:
+            return []
+        state = dict(current)
+        result: List[Dict[str, Any]] = []
+        for position, delta in enumerate(stack):
+            if position >= offset + limit:
+                break
+            if position >= offset:
+                result.append(
+                    {
+                        "edit_id": delta.edit_id,
+                        "changed_at": delta.changed_at,
+                        "fields": {
+                            name: {"from": old, "to": state.get(name)}
+                            for name, old in delta.old.items()
+                        },
+                    }
+                )
+            state.update(delta.old)
+        return result
+
+    def count(self, kind: str, entity_id: int) -> int:
+        stack = self._stacks.get((kind, entity_id))
+        return stack.size() if stack is not None else 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entities": len(self._stacks),
+            "entries": self._entries,
+            "bytes": self._bytes,
+            "evicted_entries": self._evicted,
+        }
+
+    def clear(self) -> None:
+        self._stacks.clear()
+        self._entries = 0
+        self._bytes = 0
+        self._evicted = 0
+
+    def _forget(self, delta: Delta) -> None:
+        self._entries -= 1
+        self._bytes -= delta.size
+
+    def _evict(self) -> None:
+        # La entidad menos recientemente editada está al principio.
+        while self._stacks and (self._entries > self.max_entries or self._bytes > self.max_bytes):
+            _key, stack = self._stacks.popitem(last=False)
+            for delta in stack:
+                self._forget(delta)
+                self._evicted += 1
+
+
+edit_history = EditHistory()
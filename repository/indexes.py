@@ -0,0 +1,251 @@
+import sys
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class HashIndex:
+    """
+    Índice hash sobre un campo: valor -> {id: entidad}.
+
+    Guarda referencias a las entidades (no sólo ids) para que una consulta
+    no tenga que volver a buscar cada id en la tabla de símbolos.
+    """
+
+    kind = "hash"
+
+    def __init__(self, field: str) -> None:
+        self.field = field
+        self._buckets: Dict[Any, Dict[int, Any]] = {}
+
+    def add(self, entity: Any) -> None:
+        value = getattr(entity, self.field)
+        self._buckets.setdefault(value, {})[entity.id] = entity
+
+    def bulk_add(self, entities: Iterable[Any]) -> None:
+        field = self.field
+        buckets = self._buckets
+        for entity in entities:
+            buckets.setdefault(getattr(entity, field), {})[entity.id] = entity
+
+    def remove(self, entity: Any, value: Any) -> None:
+        bucket = self._buckets.get(value)
+        if bucket is None:
+            return
+        bucket.pop(entity.id, None)
+        if not bucket:
+            del self._buckets[value]
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+    def lookup(self, value: Any) -> Iterator[Any]:
+        """Entidades cuyo campo es igual a `value`, en orden de inserción."""
+        return iter(self._buckets.get(value, {}).values())
+
+    def count(self, value: Any) -> int:
+        return len(self._buckets.get(value, ()))
+
+    def counts(self) -> Iterator[Tuple[Any, int]]:
+        """Pares (valor, número de entidades) de cada cubeta."""
+        for value, bucket in list(self._buckets.items()):
+            yield value, len(bucket)
+
+    def size(self) -> int:
+        return sum(len(bucket) for bucket in self._buckets.values())
+
+    def footprint(self) -> int:
+        """Bytes aproximados del índice (diccionarios), sin las entidades."""
+        return sys.getsizeof(self._buckets) + sum(sys.getsizeof(b) for b in self._buckets.values())
+
+
+class OrderedIndex:
+    """
+    Índice ordenado sobre un campo.
+
+    Mantiene una lista ordenada de pares (valor, id) y un diccionario
+    id -> entidad. Igualdad y rangos se resuelven con búsqueda binaria;
+    el desempate por id hace que el orden sea estable y determinista.
+    """
+
+    kind = "ordered"
+
+    def __init__(self, field: str) -> None:
+        self.field = field
+        self._keys: List[Tuple[Any, int]] = []
+        self._entities: Dict[int, Any] = {}
+
+    def add(self, entity: Any) -> None:
+        insort(self._keys, (getattr(entity, self.field), entity.id))
+        self._entities[entity.id] = entity
+
+    def bulk_add(self, entities: Iterable[Any]) -> None:
+        """
+        Agrega muchas entidades ordenando una sola vez: O((n + m) log m)
+        en lugar de m inserciones O(n). Timsort fusiona en tiempo lineal la
+        lista existente con el bloque nuevo ya ordenado.
+        """
+        field = self.field
+        new_keys = []
+        for entity in entities:
+            new_keys.append((getattr(entity, field), entity.id))
+            self._entities[entity.id] = entity
+        new_keys.sort()
+        self._keys.extend(new_keys)
+        self._keys.sort()
+
+    def remove(self, entity: Any, value: Any) -> None:
+        key = (value, entity.id)
+        pos = bisect_left(self._keys, key)
+        if pos < len(self._keys) and self._keys[pos] == key:
+            self._keys.pop(pos)
+            self._entities.pop(entity.id, None)
+
+    def clear(self) -> None:
+        self._keys.clear()
+        self._entities.clear()
+
+    def _bounds(
+        self,
+        low: Optional[Any],
+        high: Optional[Any],
+        low_inclusive: bool,
+        high_inclusive: bool,
+    ) -> Tuple[int, int]:
+        # Los ids son siempre >= 1, así que (v, 0) queda antes de cualquier
+        # par con valor v y (v, inf) después.
+        start = 0
+        end = len(self._keys)
+        if low is not None:
+            start = bisect_left(self._keys, (low, 0) if low_inclusive else (low, float("inf")))
+        if high is not None:
+            end = bisect_right(self._keys, (high, float("inf")) if high_inclusive else (high, 0))
+        return start, max(start, end)
+
+    def lookup(self, value: Any) -> Iterator[Any]:
+        return self.range(value, value)
+
+    def count(self, value: Any) -> int:
+        return self.count_range(value, value)
+
+    def range(
+        self,
+        low: Optional[Any] = None,
+        high: Optional[Any] = None,
+        low_inclusive: bool = True,
+        high_inclusive: bool = True,
+        descending: bool = False,
+    ) -> Iterator[Any]:
+        """Entidades con `low <= campo <= high` (límites opcionales), en orden."""
+        start, end = self._bounds(low, high, low_inclusive, high_inclusive)
+        positions: Iterable[int] = range(end - 1, start - 1, -1) if descending else range(start, end)
+        for pos in positions:
+            yield self._entities[self._keys[pos][1]]
+
+    def count_range(
+        self,
+        low: Optional[Any] = None,
+        high: Optional[Any] = None,
+        low_inclusive: bool = True,
+        high_inclusive: bool = True,
+    ) -> int:
+        start, end = self._bounds(low, high, low_inclusive, high_inclusive)
+        return end - start
+
+    def size(self) -> int:
+        return len(self._keys)
+
+    def footprint(self) -> int:
+        """Bytes aproximados del índice (lista de pares y diccionario), sin las entidades."""
+        return (
+            sys.getsizeof(self._keys)
+            + sys.getsizeof((None, None)) * len(self._keys)
+            + sys.getsizeof(self._entities)
+        )
+
+
+Index = HashIndex | OrderedIndex
+
+
+class IndexSet:
+    """
+    Conjunto de índices secundarios declarados por un repositorio.
+
+    El repositorio llama a `on_create`, `on_update` y `on_delete` desde sus
+    propios métodos de escritura, de modo que los índices nunca quedan
+    desfasados respecto a la tabla principal.
+    """
+
+    def __init__(self, *indexes: Index) -> None:
+        self._indexes: Dict[str, Index] = {index.field: index for index in indexes}
+
+    def get(self, field: str) -> Optional[Index]:
+        return self._indexes.get(field)
+
+    def fields(self) -> List[str]:
+        return list(self._indexes)
+
+    def footprint(self) -> int:
+        return sum(index.footprint() for index in self._indexes.values())
+
+    def snapshot(self, entity: Any) -> Dict[str, Any]:
+        """Valores actuales de los campos indexados (antes de una actualización)."""
+        return {field: getattr(entity, field) for field in self._indexes}
+
+    def on_create(self, entity: Any) -> None:
+        for index in self._indexes.values():
+            index.add(entity)
+
+    def on_bulk_create(self, entities: List[Any]) -> None:
+        for index in self._indexes.values():
+            index.bulk_add(entities)
+
+    def on_update(self, entity: Any, old_values: Dict[str, Any]) -> None:
+        for field, index in self._indexes.items():
+            old = old_values[field]
+            if getattr(entity, field) != old:
+                index.remove(entity, old)
+                index.add(entity)
+
+    def on_delete(self, entity: Any) -> None:
+        for field, index in self._indexes.items():
+            index.remove(entity, getattr(entity, field))
+
+    def count(
+        self,
+        field: str,
+        value: Optional[Any] = None,
+        low: Optional[Any] = None,
+        high: Optional[Any] = None,
+    ) -> int:
+        """Número de entidades que devolvería `find` con los mismos argumentos."""
+        index = self._indexes.get(field)
+        if index is None:
+            raise KeyError(f"Field not indexed: {field}")
+        if value is not None:
+            return index.count(value)
+        if not isinstance(index, OrderedIndex):
+            raise ValueError(f"Range query needs an ordered index: {field}")
+        return index.count_range(low, high)
+
+    def find(
+        self,
+        field: str,
+        value: Optional[Any] = None,
+        low: Optional[Any] = None,
+        high: Optional[Any] = None,
+    ) -> Iterator[Any]:
+        """
+        Busca entidades por igualdad (`value`) o por rango (`low`/`high`).
+
+        Raises:
+            KeyError: Si el campo no está indexado
+            ValueError: Si se pide un rango sobre un índice hash
+        """
+        index = self._indexes.get(field)
+        if index is None:
+            raise KeyError(f"Field not indexed: {field}")
+        if value is not None:
+            return index.lookup(value)
+        if not isinstance(index, OrderedIndex):
+            raise ValueError(f"Range query needs an ordered index: {field}")
+        return index.range(low, high)
@@ -0,0 +1,20 @@
+"""
+Contadores de los repositorios, expuestos en /metrics.
+
+Las etiquetas son tuplas constantes (repositorio, operación), así que
+cada incremento es una suma sobre un dict sin reservar memoria.
+"""
+
+from observability.metrics import registry
+
+operations = registry.counter(
+    "rentview_repository_operations_total",
+    "Operaciones ejecutadas por cada repositorio",
+    ("repository", "operation"),
+)
+
+query_rows = registry.counter(
+    "rentview_repository_query_candidate_rows_total",
+    "Filas candidatas que el plan elegido debe leer, por camino de acceso",
+    ("repository", "access"),
+)
@@ -1,57 +1,151 @@
-from typing import List, Optional
+from random import Random
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from datastructures.SymbolTable import ST
+from datastructures.IdAllocator import IdAllocator
+from datastructures.ShardedST import ShardedST
+from datastructures.View import View
 from domain.property import Property
+from repository.events import events
+from repository.editable import EditableRepository
+from repository.history import edit_history
+from repository.indexes import IndexSet, OrderedIndex
+from repository.metrics import operations, query_rows
+from repository.query import Plan, QuerySpec, plan_query
 
 
-class PropertyRepository:
+class PropertyRepository(EditableRepository):
     """
-    Repositorio de propiedades usando una tabla de símbolos manual (ST).
+    Repositorio de propiedades usando una tabla de símbolos manual,
+    particionada por id (ShardedST) para que hilos distintos no compitan
+    por un solo lock. Los ids salen de un IdAllocator por bloques.
 
-    Suposiciones mínimas sobre ST:
+    Suposiciones mínimas sobre la tabla:
     - put(key, value)
     - get(key) -> value o None
     - delete(key)
     - keys() -> lista de claves almacenadas
+
+    Índices secundarios: `rating` (ordenado).
     """
 
+    kind = "property"
+    editable_fields = ("address", "body", "rating")
+
     def __init__(self) -> None:
-        self._table = ST()
-        self._next_id = 1
+        self.clear()
+
+    def clear(self) -> None:
+        """Vacía la tabla y los índices, y vuelve a contar ids desde 1."""
+        self._table: ShardedST[int, Property] = ShardedST()
+        self._ids = IdAllocator()
+        self.indexes = IndexSet(OrderedIndex("rating"))
 
     def create(self, address: str, body: str, rating: int) -> Property:
-        prop = Property(id=self._next_id, address=address, body=body, rating=rating)
-        self._table.put(self._next_id, prop)
-        self._next_id += 1
+        operations.inc(("property", "create"))
+        prop = Property(id=self._ids.next(), address=address, body=body, rating=rating)
+        self._table.put(prop.id, prop)
+        self.indexes.on_create(prop)
+        events.emit("property", "create", prop.id)
         return prop
 
+    def bulk_create(self, rows: Iterable[Tuple[str, str, int]]) -> List[Property]:
+        """
+        Carga masiva: crea una propiedad por cada (address, body, rating)
+        con ids consecutivos y actualiza los índices una sola vez.
+        """
+        operations.inc(("property", "bulk_create"))
+        rows = list(rows)
+        created = [
+            Property(id=prop_id, address=address, body=body, rating=rating)
+            for prop_id, (address, body, rating) in zip(self._ids.next_many(len(rows)), rows)
+        ]
+        self._table.put_many((prop.id, prop) for prop in created)
+        self.indexes.on_bulk_create(created)
+        events.emit("property", "bulk_create")
+        return created
+
     def get(self, property_id: int) -> Optional[Property]:
+        operations.inc(("property", "get"))
         return self._table.get(property_id)
 
+    def get_many(self, ids: Iterable[int]) -> List[Property]:
+        """Las entidades existentes entre `ids`, en el orden pedido, en una pasada por la tabla."""
+        operations.inc(("property", "get_many"))
+        return [entity for entity in self._table.get_many(ids) if entity is not None]
+
+    def exists(self, property_id: int) -> bool:
+        return self._table.contains(property_id)
+
     def update(self, property_id: int, address: str, body: str, rating: int) -> Optional[Property]:
+        operations.inc(("property", "update"))
         prop = self.get(property_id)
         if prop is None:
             return None
-        prop.address = address
-        prop.body = body
-        prop.rating = rating
-        self._table.put(property_id, prop)
+        self._edited(prop, {"address": address, "body": body, "rating": rating})
         return prop
 
+    def _apply(self, prop: Property, values: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Asigna los campos y mantiene los índices. Devuelve los valores
+        anteriores de los campos que cambiaron (el delta del historial).
+        """
+        old_values = self.indexes.snapshot(prop)
+        changed = {name: getattr(prop, name) for name, value in values.items() if getattr(prop, name) != value}
+        for name, value in values.items():
+            setattr(prop, name, value)
+        self._table.put(prop.id, prop)
+        self.indexes.on_update(prop, old_values)
+        return changed
+
     def delete(self, property_id: int) -> bool:
+        operations.inc(("property", "delete"))
         prop = self.get(property_id)
         if prop is None:
             return False
         self._table.delete(property_id)
+        self.indexes.on_delete(prop)
+        edit_history.discard("property", property_id)
+        events.emit("property", "delete", property_id)
         return True
 
-    def list_all(self) -> List[Property]:
-        properties: List[Property] = []
-        for key in self._table.keys():
-            prop = self._table.get(key)
-            if prop is not None:
-                properties.append(prop)
-        return properties
+    def list_all(self) -> View[Property]:
+        operations.inc(("property", "list_all"))
+        return View(self._table.iter_values, self._table.size)
+
+    def size(self) -> int:
+        return self._table.size()
+
+    def sample(self, k: int, rng: Optional[Random] = None) -> List[Property]:
+        """Hasta k entidades al azar, sin recorrer la tabla."""
+        return self._table.sample(k, rng)
+
+    def footprint(self) -> int:
+        """Bytes aproximados de la tabla y los índices, sin las entidades."""
+        return self._table.footprint() + self.indexes.footprint()
+
+    def find(
+        self,
+        field: str,
+        value: Optional[Any] = None,
+        low: Optional[Any] = None,
+        high: Optional[Any] = None,
+    ) -> View[Property]:
+        """Busca propiedades usando el índice secundario de `field`."""
+        operations.inc(("property", "find"))
+        return View(
+            lambda: self.indexes.find(field, value, low, high),
+            lambda: self.indexes.count(field, value, low, high),
+        )
+
+    def plan(self, spec: QuerySpec) -> Plan:
+        """Planifica una consulta filtro/orden/límite sobre las propiedades."""
+        return plan_query(spec, self.indexes, self.list_all, self.size(), self.get_many)
+
+    def query(self, spec: QuerySpec) -> List[Property]:
+        operations.inc(("property", "query"))
+        plan = self.plan(spec)
+        query_rows.inc(("property", plan.path.access), plan.path.estimated_rows)
+        return plan.execute()
 
 
 # Instancia singleton para usar en servicios
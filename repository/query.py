@@ -0,0 +1,350 @@
+import heapq
+import operator
+import re
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from repository.indexes import HashIndex, IndexSet, OrderedIndex
+
+
+_COMPARATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "in": lambda value, options: value in options,
+    "not in": lambda value, options: value not in options,
+}
+
+_CONDITION_RE = re.compile(r"^\s*(\w+)\s*([<>=!]+)\s*(.*?)\s*$")
+# Operadores que se aceptan en `filter` ("==" es sinónimo de "=").
+_FILTER_OPS = {"=": "=", "==": "=", "!=": "!=", "<": "<", "<=": "<=", ">": ">", ">=": ">="}
+
+
+@dataclass(frozen=True)
+class Predicate:
+    """Condición simple `campo op valor` sobre una entidad."""
+
+    field: str
+    op: str
+    value: Any
+
+    def matches(self, entity: Any) -> bool:
+        return _COMPARATORS[self.op](getattr(entity, self.field), self.value)
+
+    def __str__(self) -> str:
+        if self.op in ("in", "not in"):
+            return f"{self.field} {self.op} ({','.join(map(str, sorted(self.value)))})"
+        return f"{self.field}{self.op}{self.value}"
+
+
+@dataclass
+class QuerySpec:
+    """Consulta declarativa: filtros, orden y límite."""
+
+    predicates: List[Predicate] = field(default_factory=list)
+    sort: Optional[str] = None
+    descending: bool = False
+    limit: Optional[int] = None
+
+
+def _parse_value(name: str, raw: str, kind: type) -> Any:
+    """Convierte el valor crudo al tipo declarado del campo."""
+    if kind is str:
+        return raw.strip("\"'")
+    try:
+        return kind(raw)
+    except ValueError:
+        raise ValueError(f"Invalid value for {name}: {raw!r}") from None
+
+
+def parse_query(
+    filter_expr: Optional[str],
+    sort: Optional[str],
+    limit: Optional[int],
+    fields: Mapping[str, type],
+) -> QuerySpec:
+    """
+    Construye un QuerySpec a partir de los parámetros de la URL.
+
+    Args:
+        filter_expr: Condiciones separadas por coma, p. ej. "rating>=4,rating<5"
+        sort: Campo de orden; con prefijo "-" para orden descendente
+        limit: Número máximo de resultados
+        fields: Campos válidos de la entidad y su tipo
+
+    Raises:
+        ValueError: Si la sintaxis es inválida, el campo o el operador no
+            existen o el valor no es del tipo del campo
+    """
+    spec = QuerySpec(limit=limit)
+    if limit is not None and limit < 0:
+        raise ValueError("limit must be >= 0")
+
+    if filter_expr:
+        for condition in filter_expr.split(","):
+            match = _CONDITION_RE.match(condition)
+            if match is None:
+                raise ValueError(f"Invalid filter condition: {condition!r}")
+            name, op, raw = match.groups()
+            if name not in fields:
+                raise ValueError(f"Unknown field: {name}")
+            if op not in _FILTER_OPS:
+                raise ValueError(f"Unknown operator: {op}")
+            spec.predicates.append(Predicate(name, _FILTER_OPS[op], _parse_value(name, raw, fields[name])))
+
+    if sort:
+        spec.descending = sort.startswith("-")
+        name = sort.lstrip("-+")
+        if name not in fields:
+            raise ValueError(f"Unknown sort field: {name}")
+        spec.sort = name
+
+    return spec
+
+
+def parse_ids(raw: str, max_ids: int = 1000) -> Tuple[int, ...]:
+    """
+    Ids separados por coma ("1,2,3"), sin repetir y en el orden pedido.
+
+    Raises:
+        ValueError: Si algún id no es un entero o son más de `max_ids`
+    """
+    try:
+        ids = tuple(dict.fromkeys(int(part) for part in raw.split(",") if part.strip()))
+    except ValueError:
+        raise ValueError(f"Invalid ids: {raw!r}") from None
+    if len(ids) > max_ids:
+        raise ValueError(f"At most {max_ids} ids per request")
+    return ids
+
+
+def rating_predicates(
+    rating: Optional[int] = None,
+    min_rating: Optional[int] = None,
+    max_rating: Optional[int] = None,
+) -> List[Predicate]:
+    """Traduce los filtros clásicos `rating`/`min_rating`/`max_rating` a predicados."""
+    predicates: List[Predicate] = []
+    if rating is not None:
+        predicates.append(Predicate("rating", "=", rating))
+    if min_rating is not None:
+        predicates.append(Predicate("rating", ">=", min_rating))
+    if max_rating is not None:
+        predicates.append(Predicate("rating", "<=", max_rating))
+    return predicates
+
+
+@dataclass
+class _Bounds:
+    low: Optional[Any] = None
+    high: Optional[Any] = None
+    low_inclusive: bool = True
+    high_inclusive: bool = True
+
+    def tighten(self, op: str, value: Any) -> None:
+        if op in ("=", ">", ">="):
+            inclusive = op != ">"
+            if self.low is None or value > self.low or (value == self.low and not inclusive):
+                self.low, self.low_inclusive = value, inclusive
+        if op in ("=", "<", "<="):
+            inclusive = op != "<"
+            if self.high is None or value < self.high or (value == self.high and not inclusive):
+                self.high, self.high_inclusive = value, inclusive
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "low": self.low,
+            "high": self.high,
+            "low_inclusive": self.low_inclusive,
+            "high_inclusive": self.high_inclusive,
+        }
+
+
+_RANGE_OPS = ("=", "<", "<=", ">", ">=")
+
+
+@dataclass
+class _AccessPath:
+    access: str
+    estimated_rows: int
+    rows: Callable[[bool], Iterator[Any]]
+    consumed: Tuple[Predicate, ...] = ()
+    index: Optional[str] = None
+    bounds: Optional[_Bounds] = None
+
+
+@dataclass
+class Plan:
+    """
+    Plan de ejecución elegido por `plan_query`.
+
+    access: "full_scan", "index_scan" (igualdad sobre índice) o "range_scan"
+    (rango sobre índice ordenado).
+    order: "none", "index" (el acceso ya entrega el orden pedido),
+    "top_k_heap" (montículo acotado a `limit`) o "sort" (orden completo).
+    """
+
+    spec: QuerySpec
+    path: _AccessPath
+    residual: List[Predicate]
+    order: str
+    table_size: int
+    alternatives: List[_AccessPath]
+
+    def explain(self) -> Dict[str, Any]:
+        return {
+            "access": self.path.access,
+            "index": self.path.index,
+            "bounds": self.path.bounds.as_dict() if self.path.bounds else None,
+            "estimated_rows": self.path.estimated_rows,
+            "table_size": self.table_size,
+            "residual": [str(p) for p in self.residual],
+            "order": self.order,
+            "sort": ("-" if self.spec.descending else "") + self.spec.sort if self.spec.sort else None,
+            "limit": self.spec.limit,
+            "alternatives": [
+                {"access": alt.access, "index": alt.index, "estimated_rows": alt.estimated_rows}
+                for alt in self.alternatives
+            ],
+        }
+
+    def execute(self) -> List[Any]:
+        spec = self.spec
+        residual = self.residual
+        rows: Iterable[Any] = self.path.rows(self.order == "index" and spec.descending)
+        if residual:
+            rows = (e for e in rows if all(p.matches(e) for p in residual))
+
+        if self.order in ("none", "index"):
+            return list(rows if spec.limit is None else islice(rows, spec.limit))
+
+        sort_field = spec.sort
+
+        def key(entity: Any) -> Tuple[Any, int]:
+            return (getattr(entity, sort_field), entity.id)
+
+        if self.order == "top_k_heap":
+            select = heapq.nlargest if spec.descending else heapq.nsmallest
+            return select(spec.limit, rows, key=key)
+        return sorted(rows, key=key, reverse=spec.descending)
+
+
+def _index_paths(spec: QuerySpec, indexes: IndexSet) -> List[_AccessPath]:
+    paths: List[_AccessPath] = []
+    for name in indexes.fields():
+        index = indexes.get(name)
+        on_field = [p for p in spec.predicates if p.field == name]
+
+        if isinstance(index, HashIndex):
+            equality = next((p for p in on_field if p.op == "="), None)
+            if equality is None:
+                continue
+            paths.append(
+                _AccessPath(
+                    access="index_scan",
+                    index=name,
+                    estimated_rows=index.count(equality.value),
+                    rows=lambda _desc, index=index, value=equality.value: index.lookup(value),
+                    consumed=(equality,),
+                )
+            )
+            continue
+
+        if isinstance(index, OrderedIndex):
+            ranged = tuple(p for p in on_field if p.op in _RANGE_OPS)
+            if not ranged and name != spec.sort:
+                continue
+            bounds = _Bounds()
+            for predicate in ranged:
+                bounds.tighten(predicate.op, predicate.value)
+            is_equality = bool(ranged) and all(p.op == "=" for p in ranged)
+            paths.append(
+                _AccessPath(
+                    access="index_scan" if is_equality else "range_scan",
+                    index=name,
+                    estimated_rows=index.count_range(
+                        bounds.low, bounds.high, bounds.low_inclusive, bounds.high_inclusive
+                    ),
+                    rows=lambda desc, index=index, b=bounds: index.range(
+                        b.low, b.high, b.low_inclusive, b.high_inclusive, descending=desc
+                    ),
+                    consumed=ranged,
+                    bounds=bounds,
+                )
+            )
+    return paths
+
+
+def plan_query(
+    spec: QuerySpec,
+    indexes: IndexSet,
+    scan: Callable[[], Iterable[Any]],
+    table_size: int,
+    lookup: Optional[Callable[[Sequence[Any]], Iterable[Any]]] = None,
+) -> Plan:
+    """
+    Elige el camino de acceso más barato según la cardinalidad estimada.
+
+    Los índices dan estimaciones exactas (tamaño de la cubeta o del rango),
+    así que el camino con menos filas candidatas gana. Si además se pide
+    orden con límite, se compara recorrer el índice ordenado del campo de
+    orden (parando al llegar a `limit`) contra un montículo acotado sobre
+    las filas candidatas; nunca se ordena la tabla completa cuando alguna
+    de las dos alternativas basta.
+
+    Un predicado `id in (...)` se resuelve con `lookup` (búsqueda directa
+    por id en la tabla), que lee sólo esas filas y en el orden pedido.
+    """
+    full = _AccessPath(access="full_scan", estimated_rows=table_size, rows=lambda _desc: iter(scan()))
+    alternatives = [full] + _index_paths(spec, indexes)
+    by_id = next((p for p in spec.predicates if p.field == "id" and p.op == "in"), None)
+    if by_id is not None and lookup is not None:
+        alternatives.append(
+            _AccessPath(
+                access="id_lookup",
+                index="id",
+                estimated_rows=len(by_id.value),
+                rows=lambda _desc, ids=by_id.value: iter(lookup(ids)),
+                consumed=(by_id,),
+            )
+        )
+    # Un rango sin predicados (sólo candidato por orden) no filtra nada.
+    filtering = [p for p in alternatives if p.access == "full_scan" or p.consumed]
+    best = min(filtering, key=lambda p: p.estimated_rows)
+
+    order = "none"
+    if spec.sort is not None:
+        sort_path = next(
+            (p for p in alternatives if p.bounds is not None and p.index == spec.sort),
+            None,
+        )
+        if best is sort_path:
+            order = "index"
+        elif sort_path is not None:
+            in_range = max(sort_path.estimated_rows, 1)
+            if spec.limit is None:
+                # Sin límite: recorrer el índice evita ordenar si de todos
+                # modos habría que leer toda la tabla.
+                use_index = best.access == "full_scan"
+            else:
+                selectivity = min(1.0, max(best.estimated_rows, 1) / in_range)
+                expected_reads = min(in_range, spec.limit / selectivity)
+                use_index = expected_reads < best.estimated_rows
+            if use_index:
+                best, order = sort_path, "index"
+        if order != "index":
+            order = "top_k_heap" if spec.limit is not None else "sort"
+
+    residual = [p for p in spec.predicates if p not in best.consumed]
+    return Plan(
+        spec=spec,
+        path=best,
+        residual=residual,
+        order=order,
+        table_size=table_size,
+        alternatives=alternatives,
+    )
@@ -1,67 +1,296 @@
-from typing import List, Optional
+import asyncio
+from itertools import islice
+from random import Random
+from time import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
-from datastructures.SymbolTable import ST
+from datastructures.IdAllocator import IdAllocator
+from datastructures.ShardedST import ShardedST
+from datastructures.View import View
 from domain.review import Review
 from domain.property import Property
+from repository.activity import activity_log
+from repository.events import Change, events
+from repository.editable import EditableRepository
+from repository.history import edit_history
+from repository.indexes import HashIndex, IndexSet, OrderedIndex
+from repository.metrics import operations, query_rows
+from repository.query import Plan, Predicate, QuerySpec, plan_query
 from repository.property_repository import property_repository
+from repository.similarity import review_similarity
 
+# Reseñas que borra un barrido antes de ceder el event loop.
+SWEEP_CHUNK = 500
 
-class ReviewRepository:
+
+class ReviewRepository(EditableRepository):
     """
     Repositorio de reseñas.
     Guarda:
-    - Tabla global de reseñas por id (ST)
+    - Tabla global de reseñas por id (ShardedST, ids por bloques)
     - Cada propiedad tiene su propia DoubleLinkedList de reseñas.
+    - Índices secundarios: `rating` (ordenado) y `property_id` (hash).
+    - Huérfanas: al borrar una propiedad sus reseñas dejan de verse en el
+      momento (`_orphaned`), aunque el barrido que las borra corre después.
     """
 
+    kind = "review"
+    editable_fields = ("title", "body", "rating")
+
     def __init__(self) -> None:
-        self._table = ST()
-        self._next_id = 1
+        self.clear()
+
+    def clear(self) -> None:
+        """Vacía la tabla y los índices, y vuelve a contar ids desde 1."""
+        self._table: ShardedST[int, Review] = ShardedST()
+        self._ids = IdAllocator()
+        self.indexes = IndexSet(OrderedIndex("rating"), HashIndex("property_id"))
+        # Propiedades borradas cuyas reseñas todavía no se barrieron.
+        self._orphaned: Set[int] = set()
 
     def create(self, property_obj: Property, title: str, body: str, rating: int) -> Review:
+        """
+        Raises:
+            DuplicateReviewError: Si es casi idéntica a otra reseña y la
+                política de duplicados es "reject"
+        """
+        operations.inc(("review", "create"))
+        signature = None
+        duplicate_of = None
+        if review_similarity.enabled:
+            signature = review_similarity.signature(title, body)
+            duplicate_of = review_similarity.check(signature)
         review = Review(
-            id=self._next_id,
+            id=self._ids.next(),
             property_id=property_obj.id,
             title=title,
             body=body,
             rating=rating,
+            created_at=time(),
+            duplicate_of=duplicate_of,
         )
         property_obj.add_review(review)
-        self._table.put(self._next_id, review)
-        self._next_id += 1
+        self._table.put(review.id, review)
+        self.indexes.on_create(review)
+        if signature is not None:
+            review_similarity.add(review.id, signature)
+        activity_log.record("review", review)
+        events.emit("review", "create", review.id, review.property_id)
         return review
 
+    def bulk_create(self, rows: Iterable[Tuple[Property, str, str, int]]) -> List[Review]:
+        """
+        Carga masiva: crea una reseña por cada (propiedad, title, body, rating),
+        la agrega a la lista de su propiedad y actualiza los índices una vez.
+        """
+        operations.inc(("review", "bulk_create"))
+        created: List[Review] = []
+        rows = list(rows)
+        # Una sola marca de tiempo (un solo float) para todo el lote.
+        created_at = time()
+        for review_id, (property_obj, title, body, rating) in zip(self._ids.next_many(len(rows)), rows):
+            review = Review(
+                id=review_id,
+                property_id=property_obj.id,
+                title=title,
+                body=body,
+                rating=rating,
+                created_at=created_at,
+            )
+            property_obj.add_review(review)
+            created.append(review)
+        self._table.put_many((review.id, review) for review in created)
+        self.indexes.on_bulk_create(created)
+        activity_log.record_many("review", created, created_at)
+        events.emit("review", "bulk_create")
+        return created
+
     def get(self, review_id: int) -> Optional[Review]:
-        return self._table.get(review_id)
+        operations.inc(("review", "get"))
+        review = self._table.get(review_id)
+        return review if review is not None and self._visible(review) else None
+
+    def get_many(self, ids: Iterable[int]) -> List[Review]:
+        """Las entidades existentes entre `ids`, en el orden pedido, en una pasada por la tabla."""
+        operations.inc(("review", "get_many"))
+        return [entity for entity in self._table.get_many(ids) if entity is not None and self._visible(entity)]
+
+    def exists(self, review_id: int) -> bool:
+        review = self._table.get(review_id)
+        return review is not None and self._visible(review)
+
+    def has_orphans(self) -> bool:
+        """True mientras haya reseñas huérfanas sin barrer."""
+        return bool(self._orphaned)
+
+    def _visible(self, review: Review) -> bool:
+        return not self._orphaned or review.property_id not in self._orphaned
+
+    def _alive(self, reviews: Iterable[Review]) -> Iterator[Review]:
+        if not self._orphaned:
+            return iter(reviews)
+        return (review for review in reviews if review.property_id not in self._orphaned)
+
+    def _view(self, items: Callable[[], Iterable[Review]], count: Callable[[], int]) -> View[Review]:
+        """Vista sin huérfanas; mientras haya alguna, contar es recorrer."""
+        return View(
+            lambda: self._alive(items()),
+            lambda: sum(1 for _ in self._alive(items())) if self._orphaned else count(),
+        )
 
     def update(self, review_id: int, title: str, body: str, rating: int) -> Optional[Review]:
+        operations.inc(("review", "update"))
         review = self.get(review_id)
         if review is None:
             return None
-        review.title = title
-        review.body = body
-        review.rating = rating
-        self._table.put(review_id, review)
+        self._edited(review, {"title": title, "body": body, "rating": rating})
         return review
 
+    def _parent_id(self, review: Review) -> int:
+        return review.property_id
+
+    def _apply(self, review: Review, values: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Asigna los campos, mantiene los índices y las vistas ordenadas de
+        la propiedad. Devuelve los valores anteriores de los que cambiaron.
+        """
+        old_values = self.indexes.snapshot(review)
+        changed = {name: getattr(review, name) for name, value in values.items() if getattr(review, name) != value}
+        for name, value in values.items():
+            setattr(review, name, value)
+        self._table.put(review.id, review)
+        self.indexes.on_update(review, old_values)
+        if ("title" in changed or "body" in changed) and review_similarity.get(review.id) is not None:
+            review_similarity.add(review.id, review_similarity.signature(review.title, review.body))
+        prop = property_repository.get(review.property_id)
+        if prop is not None:
+            prop.reorder_review(review)
+        return changed
+
     def delete(self, review_id: int) -> bool:
+        operations.inc(("review", "delete"))
         review = self.get(review_id)
         if review is None:
             return False
+        self._delete(review)
+        return True
 
+    def _delete(self, review: Review) -> None:
+        review_id = review.id
         prop = property_repository.get(review.property_id)
         if prop is not None:
             # Suponemos que DoubleLinkedList tiene remove
             prop.remove_review(review)
 
         self._table.delete(review_id)
-        return True
+        self.indexes.on_delete(review)
+        review_similarity.remove(review_id)
+        edit_history.discard("review", review_id)
+        events.emit("review", "delete", review_id, review.property_id)
+
+    async def delete_by_property(self, property_id: int) -> int:
+        """
+        Borra las reseñas (huérfanas) de una propiedad de a SWEEP_CHUNK,
+        cediendo el event loop entre tramos. Devuelve cuántas. La marca de
+        huérfanas se quita sólo al terminar: si el barrido falla, el
+        planificador lo reintenta.
+        """
+        deleted = 0
+        while True:
+            orphans = list(islice(self.indexes.find("property_id", property_id), SWEEP_CHUNK))
+            if not orphans:
+                break
+            for review in orphans:
+                self._delete(review)
+            deleted += len(orphans)
+            await asyncio.sleep(0)
+        self._orphaned.discard(property_id)
+        return deleted
 
-    def list_by_property(self, property_id: int) -> List[Review]:
+    def on_change(self, change: Change) -> None:
+        """
+        Suscriptor de eventos: al borrar una propiedad, sus reseñas dejan
+        de verse en el momento; el barrido (`delete_by_property`) lo
+        encola la app.
+        """
+        if change.entity == "property" and change.op == "delete" and change.entity_id is not None:
+            self._orphaned.add(change.entity_id)
+
+    def list_by_property(self, property_id: int, sort: Optional[str] = None) -> View[Review]:
+        operations.inc(("review", "list_by_property"))
         prop = property_repository.get(property_id)
         if prop is None:
-            return []
+            return View.empty()
+        if sort is not None:
+            return prop.get_sorted_reviews(sort)
         return prop.get_reviews()
 
+    def list_all(self) -> View[Review]:
+        operations.inc(("review", "list_all"))
+        return self._view(self._table.iter_values, self._table.size)
+
+    def similar(self, review_id: int, limit: int = 10, threshold: float = 0.0) -> Optional[List[Tuple[Review, float]]]:
+        """
+        Reseñas parecidas según el índice LSH: (reseña, similitud estimada),
+        de mayor a menor. Las reseñas de cargas masivas no están indexadas;
+        su firma se calcula al vuelo. None si la reseña no existe.
+        """
+        operations.inc(("review", "similar"))
+        review = self.get(review_id)
+        if review is None:
+            return None
+        signature = review_similarity.get(review_id)
+        if signature is None:
+            signature = review_similarity.signature(review.title, review.body)
+        result: List[Tuple[Review, float]] = []
+        for other_id, score in review_similarity.similar(signature, exclude=review_id):
+            if score < threshold or len(result) >= limit:
+                break
+            other = self._table.get(other_id)
+            if other is not None and self._visible(other):
+                result.append((other, score))
+        return result
+
+    def size(self) -> int:
+        return self._table.size()
+
+    def sample(self, k: int, rng: Optional[Random] = None) -> List[Review]:
+        """Hasta k entidades al azar, sin recorrer la tabla."""
+        return self._table.sample(k, rng)
+
+    def footprint(self) -> int:
+        """Bytes aproximados de la tabla y los índices, sin las entidades."""
+        return self._table.footprint() + self.indexes.footprint()
+
+    def find(
+        self,
+        field: str,
+        value: Optional[Any] = None,
+        low: Optional[Any] = None,
+        high: Optional[Any] = None,
+    ) -> View[Review]:
+        """Busca reseñas usando el índice secundario de `field`."""
+        operations.inc(("review", "find"))
+        return self._view(
+            lambda: self.indexes.find(field, value, low, high),
+            lambda: self.indexes.count(field, value, low, high),
+        )
+
+    def plan(self, spec: QuerySpec) -> Plan:
+        """
+        Planifica una consulta filtro/orden/límite sobre las reseñas. Las
+        huérfanas sin barrer se descartan con un predicado más.
+        """
+        if self._orphaned:
+            orphaned = Predicate("property_id", "not in", frozenset(self._orphaned))
+            spec = QuerySpec(spec.predicates + [orphaned], spec.sort, spec.descending, spec.limit)
+        return plan_query(spec, self.indexes, self.list_all, self.size(), self.get_many)
+
+    def query(self, spec: QuerySpec) -> List[Review]:
+        operations.inc(("review", "query"))
+        plan = self.plan(spec)
+        query_rows.inc(("review", plan.path.access), plan.path.estimated_rows)
+        return plan.execute()
+
 
 review_repository = ReviewRepository()
@@ -0,0 +1,105 @@
+"""
+Detección de reseñas casi duplicadas (MinHash + LSH sobre título y texto).
+
+El texto se normaliza (minúsculas, sin signos) y se parte en pares de
+palabras consecutivas; dos reseñas que sólo cambian unas pocas palabras
+comparten casi todos sus pares. Buscar duplicados de una reseña nueva
+revisa sólo las cubetas LSH de su firma, no todas las reseñas.
+
+Las cargas masivas (`bulk_create`) no se indexan: son datos de partida,
+sin validaciones, y firmar millones de reseñas dominaría la carga.
+"""
+
+import re
+from array import array
+from typing import List, Optional, Tuple
+
+from datastructures.MinHashLSH import MinHashLSH
+
+POLICIES = ("off", "flag", "reject")
+
+_WORD_RE = re.compile(r"\w+")
+
+
+class DuplicateReviewError(ValueError):
+    """La reseña es casi idéntica a una existente y la política es "reject"."""
+
+    def __init__(self, duplicate_of: int) -> None:
+        super().__init__(f"Near-duplicate of review {duplicate_of}")
+        self.duplicate_of = duplicate_of
+
+
+def shingles(title: str, body: str) -> List[str]:
+    words = _WORD_RE.findall(f"{title} {body}".lower())
+    if len(words) < 2:
+        return words
+    return [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+class ReviewSimilarity:
+    def __init__(self, policy: str = "flag", threshold: float = 0.8) -> None:
+        self.configure(policy, threshold)
+
+    def configure(self, policy: str, threshold: float, num_perm: int = 32, bands: int = 8, max_bucket: int = 64) -> None:
+        """
+        Args:
+            policy: "off" (no indexa), "flag" (marca `duplicate_of`) o "reject"
+            threshold: Jaccard estimada a partir de la cual se considera duplicado
+
+        Raises:
+            ValueError: Si la política no existe
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown duplicate policy: {policy}")
+        self.policy = policy
+        self.threshold = threshold
+        self._index: MinHashLSH[int] = MinHashLSH(num_perm, bands, max_bucket)
+
+    @property
+    def enabled(self) -> bool:
+        return self.policy != "off"
+
+    def signature(self, title: str, body: str) -> array:
+        return self._index.signature(shingles(title, body))
+
+    def similar(self, signature: array, exclude: Optional[int] = None) -> List[Tuple[int, float]]:
+        """Reseñas indexadas candidatas y su similitud estimada, de mayor a menor."""
+        index = self._index
+        scored = []
+        for review_id in index.candidates(signature):
+            if review_id == exclude:
+                continue
+            other = index.get(review_id)
+            if other is not None:
+                scored.append((review_id, index.similarity(signature, other)))
+        scored.sort(key=lambda pair: (-pair[1], pair[0]))
+        return scored
+
+    def check(self, signature: array) -> Optional[int]:
+        """
+        Id de la reseña más parecida si supera el umbral (None si no hay).
+
+        Raises:
+            DuplicateReviewError: Si hay duplicado y la política es "reject"
+        """
+        best = next(iter(self.similar(signature)), None)
+        if best is None or best[1] < self.threshold:
+            return None
+        if self.policy == "reject":
+            raise DuplicateReviewError(best[0])
+        return best[0]
+
+    def add(self, review_id: int, signature: array) -> None:
+        self._index.add(review_id, signature)
+
+    def remove(self, review_id: int) -> None:
+        self._index.remove(review_id)
+
+    def get(self, review_id: int) -> Optional[array]:
+        return self._index.get(review_id)
+
+    def size(self) -> int:
+        return self._index.size()
+
+
+review_similarity = ReviewSimilarity()
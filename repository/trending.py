@@ -0,0 +1,90 @@
+"""
+Vistas por propiedad en memoria fija: Count-Min Sketch para estimar las
+vistas de cualquier propiedad y Space-Saving para las más vistas.
+
+No hay un diccionario por propiedad que crezca sin límite ni locks: todo
+corre en el event loop. Con `half_life > 0` los conteos decaen a la
+mitad cada `half_life` segundos, así que "trending" refleja el tráfico
+reciente y no el acumulado desde el arranque.
+"""
+
+from time import monotonic
+from typing import Dict, List, Optional, Tuple
+
+from datastructures.CountMinSketch import CountMinSketch
+from datastructures.SpaceSaving import SpaceSaving
+from repository.events import Change
+
+# El decaimiento recorre todos los contadores: se aplica a lo sumo cada
+# half_life / DECAY_STEPS segundos, con el factor del tiempo transcurrido.
+DECAY_STEPS = 8
+
+
+class ViewStats:
+    def __init__(self, width: int = 2048, depth: int = 4, top_k: int = 100, half_life: float = 3600.0) -> None:
+        self.configure(width, depth, top_k, half_life)
+
+    def configure(self, width: int, depth: int, top_k: int, half_life: float) -> None:
+        """Redimensiona las estructuras (se vacían)."""
+        self.half_life = half_life
+        self._sketch = CountMinSketch(width, depth)
+        self._top: SpaceSaving[int] = SpaceSaving(top_k)
+        self._decayed_at = monotonic()
+        self.views = 0
+
+    def _maybe_decay(self, now: float) -> None:
+        if self.half_life <= 0:
+            return
+        elapsed = now - self._decayed_at
+        if elapsed < self.half_life / DECAY_STEPS:
+            return
+        factor = 0.5 ** (elapsed / self.half_life)
+        self._sketch.decay(factor)
+        self._top.decay(factor)
+        self._decayed_at = now
+
+    def maintain(self) -> None:
+        """Aplica el decaimiento pendiente (trabajo periódico, fuera de las peticiones)."""
+        self._maybe_decay(monotonic())
+
+    def record(self, property_id: int, now: Optional[float] = None) -> None:
+        """Cuenta una vista. O(depth + log k)."""
+        self._maybe_decay(monotonic() if now is None else now)
+        self._sketch.add(property_id)
+        self._top.add(property_id)
+        self.views += 1
+
+    def estimate(self, property_id: int) -> float:
+        """Vistas estimadas de cualquier propiedad (nunca por debajo de las reales)."""
+        self._maybe_decay(monotonic())
+        return self._sketch.estimate(property_id)
+
+    def top(self, n: int) -> List[Tuple[int, float, float]]:
+        """
+        Las `n` propiedades más vistas: (id, vistas estimadas, vistas
+        garantizadas). Ambas estructuras sobreestiman, así que se toma el
+        menor de los dos valores.
+        """
+        self._maybe_decay(monotonic())
+        sketch = self._sketch
+        return [
+            (property_id, min(count, sketch.estimate(property_id)), count - error)
+            for property_id, count, error in self._top.top(n)
+        ]
+
+    def on_change(self, change: Change) -> None:
+        """Suscriptor de eventos: una propiedad borrada libera su contador del top."""
+        if change.entity == "property" and change.op == "delete" and change.entity_id is not None:
+            self._top.discard(change.entity_id)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "views": self.views,
+            "tracked": self._top.size(),
+            "top_k": self._top.capacity(),
+            "sketch_bytes": self._sketch.footprint(),
+            "half_life": self.half_life,
+        }
+
+
+view_stats = ViewStats()
@@ -0,0 +1,51 @@
+import heapq
+from itertools import islice
+from time import time
+from typing import Callable, Dict, Iterator, List, Optional
+
+from repository.activity import KINDS, Activity, activity_log
+from repository.comment_repository import comment_repository
+from repository.review_repository import review_repository
+
+_EXISTS: Dict[str, Callable[[int], bool]] = {
+    "review": review_repository.exists,
+    "comment": comment_repository.exists,
+}
+
+
+def _alive(activities: Iterator[Activity]) -> Iterator[Activity]:
+    """Descarta las altas de entidades borradas después (los ids no se reutilizan)."""
+    for activity in activities:
+        if _EXISTS[activity.kind](activity.entity.id):
+            yield activity
+
+
+class ActivityService:
+    def latest(self, limit: int = 20) -> List[Activity]:
+        """Últimas reseñas y comentarios creados, del más reciente al más antiguo."""
+        return list(islice(_alive(activity_log.latest()), limit))
+
+    def window(self, hours: float, kind: Optional[str] = None, limit: Optional[int] = None) -> List[Activity]:
+        """
+        Altas de las últimas `hours` horas (sólo de `kind`, si se indica),
+        de la más reciente a la más antigua.
+
+        Raises:
+            ValueError: Si `hours` no es positivo, supera la retención o `kind` no existe
+        """
+        if hours <= 0:
+            raise ValueError("hours must be > 0")
+        if hours > activity_log.retention_hours:
+            raise ValueError(f"hours must be <= {activity_log.retention_hours:g}")
+        if kind is not None and kind not in KINDS:
+            raise ValueError(f"Unknown activity kind: {kind}")
+        cutoff = time() - hours * 3600
+        streams = [
+            (Activity(k, entity) for entity in activity_log.since(k, cutoff))
+            for k in ((kind,) if kind is not None else KINDS)
+        ]
+        merged = heapq.merge(*streams, key=lambda a: a.entity.created_at, reverse=True)
+        return list(islice(_alive(merged), limit))
+
+
+activity_service = ActivityService()
@@ -1,16 +1,22 @@
 from typing import List, Optional
 
+from datastructures.View import View
 from domain.comment import Comment
-from repository.comment_repository import comment_repository
+from repository.comment_repository import ThreadEntry, comment_repository
 from repository.review_repository import review_repository
 
 
 class CommentService:
-    def create_comment(self, review_id: int, body: str) -> Comment:
+    def create_comment(self, review_id: int, body: str, parent_id: Optional[int] = None) -> Comment:
         review = review_repository.get(review_id)
         if review is None:
             raise ValueError("Review not found")
-        return comment_repository.create(review, body)
+        parent = None
+        if parent_id is not None:
+            parent = comment_repository.get(parent_id)
+            if parent is None or parent.review_id != review_id:
+                raise ValueError("Parent comment not found")
+        return comment_repository.create(review, body, parent)
 
     def get_comment(self, comment_id: int) -> Optional[Comment]:
         return comment_repository.get(comment_id)
@@ -21,8 +27,24 @@ class CommentService:
     def delete_comment(self, comment_id: int) -> bool:
         return comment_repository.delete(comment_id)
 
-    def list_comments_by_review(self, review_id: int) -> List[Comment]:
+    def undo_comment(self, comment_id: int) -> Optional[Comment]:
+        return comment_repository.undo(comment_id)
+
+    def comment_history(self, comment_id: int, offset: int = 0, limit: int = 20) -> Optional[List[dict]]:
+        return comment_repository.history(comment_id, offset, limit)
+
+    def list_comments_by_review(self, review_id: int) -> View[Comment]:
         return comment_repository.list_by_review(review_id)
 
+    def comment_thread(
+        self,
+        review_id: int,
+        depth: Optional[int] = None,
+        parent_id: Optional[int] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> Optional[List[ThreadEntry]]:
+        return comment_repository.thread(review_id, depth, parent_id, offset, limit)
+
 
 comment_service = CommentService()
@@ -1,5 +1,4 @@
-from typing import List
-
+from datastructures.View import View
 from repository.favorites_repository import favorites_repository
 from repository.property_repository import property_repository
 from domain.property import Property
@@ -14,14 +13,12 @@ class FavoritesService:
     def remove_favorite(self, property_id: int) -> bool:
         return favorites_repository.remove(property_id)
 
-    def list_favorites(self) -> List[Property]:
-        ids = favorites_repository.list_all()
-        properties: List[Property] = []
-        for pid in ids:
-            prop = property_repository.get(pid)
-            if prop is not None:
-                properties.append(prop)
-        return properties
+    def is_favorite(self, property_id: int) -> bool:
+        return favorites_repository.contains(property_id)
+
+    def list_favorites(self) -> View[Property]:
+        # Ids cuya propiedad ya no existe se omiten al recorrer la vista.
+        return favorites_repository.list_all().filter_map(property_repository.get)
 
 
 favorites_service = FavoritesService()
@@ -1,7 +1,11 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
+
+from datastructures.View import View
 
 from domain.property import Property
 from repository.property_repository import property_repository
+from repository.query import QuerySpec, rating_predicates
+from repository.trending import view_stats
 
 
 class PropertyService:
@@ -11,14 +15,46 @@ class PropertyService:
     def get_property(self, property_id: int) -> Optional[Property]:
         return property_repository.get(property_id)
 
+    def record_view(self, property_id: int) -> None:
+        view_stats.record(property_id)
+
+    def trending(self, limit: int = 10) -> List[Tuple[Property, float, float]]:
+        """Propiedades más vistas: (propiedad, vistas estimadas, vistas garantizadas)."""
+        trending = []
+        for property_id, views, min_views in view_stats.top(limit):
+            prop = property_repository.get(property_id)
+            if prop is not None:
+                trending.append((prop, views, min_views))
+        return trending
+
     def update_property(self, property_id: int, address: str, body: str, rating: int) -> Optional[Property]:
         return property_repository.update(property_id, address, body, rating)
 
     def delete_property(self, property_id: int) -> bool:
         return property_repository.delete(property_id)
 
-    def list_properties(self) -> List[Property]:
-        return property_repository.list_all()
+    def undo_property(self, property_id: int) -> Optional[Property]:
+        return property_repository.undo(property_id)
+
+    def property_history(self, property_id: int, offset: int = 0, limit: int = 20) -> Optional[List[dict]]:
+        return property_repository.history(property_id, offset, limit)
+
+    def list_properties(
+        self,
+        rating: Optional[int] = None,
+        min_rating: Optional[int] = None,
+        max_rating: Optional[int] = None,
+    ) -> View[Property] | List[Property]:
+        spec = QuerySpec(predicates=rating_predicates(rating, min_rating, max_rating))
+        return self.query_properties(spec)
+
+    def query_properties(self, spec: QuerySpec) -> View[Property] | List[Property]:
+        if not spec.predicates and spec.sort is None and spec.limit is None:
+            return property_repository.list_all()
+        return property_repository.query(spec)
+
+    def explain_properties(self, spec: QuerySpec) -> dict:
+        return property_repository.plan(spec).explain()
 
 
 property_service = PropertyService()
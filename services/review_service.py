@@ -1,8 +1,12 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
+from datastructures.View import View
+
+from domain.property import REVIEW_SORT_FIELDS
 from domain.review import Review
 from repository.review_repository import review_repository
 from repository.property_repository import property_repository
+from repository.query import Predicate, QuerySpec, rating_predicates
 
 
 class ReviewService:
@@ -21,8 +25,48 @@ class ReviewService:
     def delete_review(self, review_id: int) -> bool:
         return review_repository.delete(review_id)
 
-    def list_reviews_by_property(self, property_id: int) -> List[Review]:
-        return review_repository.list_by_property(property_id)
+    def undo_review(self, review_id: int) -> Optional[Review]:
+        return review_repository.undo(review_id)
+
+    def review_history(self, review_id: int, offset: int = 0, limit: int = 20) -> Optional[List[dict]]:
+        return review_repository.history(review_id, offset, limit)
+
+    def similar_reviews(self, review_id: int, limit: int = 10, threshold: float = 0.0) -> Optional[List[Tuple[Review, float]]]:
+        return review_repository.similar(review_id, limit, threshold)
+
+    def list_reviews_by_property(
+        self,
+        property_id: int,
+        sort: Optional[str] = None,
+        rating: Optional[int] = None,
+        min_rating: Optional[int] = None,
+        max_rating: Optional[int] = None,
+    ) -> View[Review] | List[Review]:
+        """
+        Sin filtros de rating, la lista (o vista ordenada mantenida) de la
+        propiedad. Con filtros, el planificador elige entre los índices de
+        `property_id` y `rating`; sin `sort` se conserva el orden de alta.
+
+        Raises:
+            ValueError: Si el campo de orden no es válido
+        """
+        predicates = rating_predicates(rating, min_rating, max_rating)
+        if not predicates:
+            return review_repository.list_by_property(property_id, sort)
+        name = sort.lstrip("-") if sort else "id"
+        if sort is not None and name not in REVIEW_SORT_FIELDS:
+            raise ValueError(f"Unknown sort field: {name}")
+        predicates.append(Predicate("property_id", "=", property_id))
+        spec = QuerySpec(predicates=predicates, sort=name, descending=bool(sort) and sort.startswith("-"))
+        return review_repository.query(spec)
+
+    def query_reviews(self, spec: QuerySpec) -> View[Review] | List[Review]:
+        if not spec.predicates and spec.sort is None and spec.limit is None:
+            return review_repository.list_all()
+        return review_repository.query(spec)
+
+    def explain_reviews(self, spec: QuerySpec) -> dict:
+        return review_repository.plan(spec).explain()
 
 
 review_service = ReviewService()
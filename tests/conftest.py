@@ -0,0 +1,41 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from api.main import app
+from api.read_cache import read_cache
+from api.settings import settings
+from repository.activity import activity_log
+from repository.changelog import change_log
+from repository.comment_repository import comment_repository
+from repository.favorites_repository import favorites_repository
+from repository.history import edit_history
+from repository.property_repository import property_repository
+from repository.review_repository import review_repository
+from repository.similarity import review_similarity
+from repository.trending import view_stats
+
+
+def reset_state():
+    """Deja los singletons de la app como recién arrancada."""
+    for repository in (property_repository, review_repository, comment_repository, favorites_repository):
+        repository.clear()
+    change_log.clear()
+    edit_history.clear()
+    activity_log.clear()
+    read_cache.configure(settings.read_cache_ttl, settings.read_cache_entries)
+    view_stats.configure(settings.trending_width, settings.trending_depth, settings.trending_top_k, settings.trending_half_life)
+    review_similarity.configure(
+        settings.duplicate_policy,
+        settings.duplicate_threshold,
+        settings.duplicate_num_perm,
+        settings.duplicate_bands,
+        settings.duplicate_max_bucket,
+    )
+
+
+@pytest.fixture
+def client():
+    """Cliente de la app sobre repositorios vacíos; no deja datos para el siguiente test."""
+    reset_state()
+    yield TestClient(app)
+    reset_state()
@@ -0,0 +1,108 @@
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.admission import AdmissionController, TokenBucket
+from api.middleware import AdmissionMiddleware
+
+
+def test_token_bucket_refills_at_rate_up_to_capacity():
+    bucket = TokenBucket(capacity=2, now=0.0)
+    assert bucket.take(rate=1.0, capacity=2, now=0.0) == 0
+    assert bucket.take(rate=1.0, capacity=2, now=0.0) == 0
+    assert bucket.take(rate=1.0, capacity=2, now=0.0) == 1.0
+    assert bucket.take(rate=1.0, capacity=2, now=0.5) == 0.5
+    assert bucket.take(rate=1.0, capacity=2, now=100.0) == 0
+    assert bucket.tokens == 1
+
+
+def test_rate_limit_is_per_client():
+    controller = AdmissionController(rate=0.001, burst=2)
+    assert [controller.check_rate("a") for _ in range(2)] == [0, 0]
+    assert controller.check_rate("a") > 0
+    assert controller.check_rate("b") == 0
+
+
+def test_client_buckets_are_evicted_least_recently_used_first():
+    controller = AdmissionController(rate=0.001, burst=1, max_clients=2)
+    controller.check_rate("a")
+    controller.check_rate("b")
+    controller.check_rate("a")  # "a" pasa a ser el más reciente
+    controller.check_rate("c")  # descarta "b"
+    assert list(controller._buckets) == ["a", "c"]
+    # "a" sigue agotado; "b" vuelve con una cubeta nueva y llena.
+    assert controller.check_rate("a") > 0
+    assert controller.check_rate("b") == 0
+    assert list(controller._buckets) == ["a", "b"]
+
+
+def test_waiters_are_admitted_in_fifo_order():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, max_queue=5, queue_timeout=1.0)
+        assert await controller.acquire() is None
+        order = []
+
+        async def waiter(name):
+            assert await controller.acquire() is None
+            order.append(name)
+
+        tasks = [asyncio.create_task(waiter(name)) for name in "abc"]
+        await asyncio.sleep(0)
+        assert controller.waiting == 3
+        for _ in range(3):
+            controller.release()
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+        controller.release()
+        return order, controller
+
+    order, controller = asyncio.run(scenario())
+    assert order == ["a", "b", "c"]
+    assert (controller.in_flight, controller.waiting) == (0, 0)
+
+
+def test_full_queue_and_timeout_are_rejected():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, max_queue=1, queue_timeout=0.01)
+        await controller.acquire()
+        waiter = asyncio.create_task(controller.acquire())
+        await asyncio.sleep(0)
+        rejected = await controller.acquire()
+        timed_out = await waiter
+        return rejected, timed_out, controller
+
+    rejected, timed_out, controller = asyncio.run(scenario())
+    assert (rejected, timed_out) == ("queue_full", "timeout")
+    assert (controller.in_flight, controller.waiting) == (1, 0)
+
+
+def make_client(controller):
+    app = FastAPI()
+
+    @app.get("/api/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.get("/api/stream")
+    async def stream():
+        return {"in_flight": controller.in_flight}
+
+    app.add_middleware(AdmissionMiddleware, controller=controller)
+    return TestClient(app)
+
+
+def test_middleware_answers_429_with_retry_after():
+    client = make_client(AdmissionController(rate=0.5, burst=1))
+    assert client.get("/api/ping").status_code == 200
+    response = client.get("/api/ping")
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+def test_streaming_routes_do_not_hold_an_in_flight_slot():
+    controller = AdmissionController(max_in_flight=1)
+    client = make_client(controller)
+    assert client.get("/api/stream").json() == {"in_flight": 0}
+    assert client.get("/api/ping").status_code == 200
+    assert controller.in_flight == 0
@@ -0,0 +1,84 @@
+import pytest
+
+import api.main
+
+
+@pytest.fixture
+def batch(client):
+    def send(*operations):
+        response = client.post("/api/batch", json={"operations": list(operations)})
+        assert response.status_code == 200
+        return response.json()["results"]
+
+    return send
+
+
+def new_property(address):
+    return {"op": "create", "entity": "property", "data": {"address": address, "body": "b", "rating": 3}}
+
+
+def test_operations_run_in_order_and_see_earlier_writes(batch):
+    created, = batch(new_property("Batch 1"))
+    property_id = created["body"]["id"]
+    results = batch(
+        {"op": "update", "entity": "property", "id": property_id, "data": {"address": "Batch 1b", "body": "b", "rating": 4}},
+        {"op": "get", "entity": "property", "id": property_id},
+        {
+            "op": "create",
+            "entity": "review",
+            "property_id": property_id,
+            "data": {"title": "t", "body": "batch review body", "rating": 5},
+        },
+        {"op": "delete", "entity": "property", "id": property_id},
+        {"op": "get", "entity": "property", "id": property_id},
+    )
+    assert [r["status"] for r in results] == [200, 200, 200, 200, 404]
+    assert results[1]["body"]["address"] == "Batch 1b"
+    assert results[2]["body"]["property_id"] == property_id
+    assert results[3]["body"] == {"message": "Property deleted"}
+    assert results[4]["detail"] == "Property not found"
+
+
+def test_a_failure_does_not_stop_the_following_operations(batch):
+    results = batch(
+        {"op": "get", "entity": "review", "id": 10**9},
+        {"op": "delete", "entity": "property"},
+        {"op": "create", "entity": "review", "data": {"title": "t", "body": "b", "rating": 1}},
+        {"op": "create", "entity": "property", "data": {"address": "Batch bad", "rating": "high"}},
+        {"op": "create", "entity": "comment", "review_id": 10**9, "data": {"body": "c"}},
+        new_property("Batch 2"),
+    )
+    assert [r["status"] for r in results] == [404, 400, 400, 422, 404, 200]
+    assert results[1]["detail"] == "id is required"
+    assert results[2]["detail"] == "property_id is required"
+    assert {error["loc"][0] for error in results[3]["detail"]} == {"body", "rating"}
+    assert results[5]["body"]["address"] == "Batch 2"
+
+
+def test_repeated_reads_are_looked_up_once_until_a_write(batch, monkeypatch):
+    created, = batch(new_property("Batch 3"))
+    property_id = created["body"]["id"]
+    entity = api.main.BATCH_ENTITIES["property"]
+    calls = []
+
+    def get(entity_id):
+        calls.append(entity_id)
+        return entity.get(entity_id)
+
+    monkeypatch.setitem(api.main.BATCH_ENTITIES, "property", entity._replace(get=get))
+    read = {"op": "get", "entity": "property", "id": property_id}
+    results = batch(
+        read,
+        read,
+        {"op": "update", "entity": "property", "id": property_id, "data": {"address": "Batch 3b", "body": "b", "rating": 3}},
+        read,
+    )
+    assert calls == [property_id, property_id]
+    assert [r["body"]["address"] for r in results] == ["Batch 3", "Batch 3", "Batch 3b", "Batch 3b"]
+
+
+def test_batch_size_and_operation_shape_are_validated(client):
+    too_many = [{"op": "get", "entity": "property", "id": 1}] * 101
+    assert client.post("/api/batch", json={"operations": too_many}).status_code == 422
+    assert client.post("/api/batch", json={"operations": [{"op": "merge", "entity": "property"}]}).status_code == 422
+    assert client.post("/api/batch", json={"operations": [{"op": "get", "entity": "favorite"}]}).status_code == 422
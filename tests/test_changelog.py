@@ -0,0 +1,116 @@
+import pytest
+
+from repository.changelog import ChangeLog
+from repository.events import Change, events
+
+
+def record(log, *changes):
+    """Registra (entidad, op, id) con secuencias consecutivas a partir de la última."""
+    for entity, op, entity_id in changes:
+        log.record(Change(entity, op, entity_id, None, log.latest + 1))
+
+
+def seqs(page):
+    return [entry.seq for entry in page.entries]
+
+
+def test_since_pages_in_sequence_order():
+    log = ChangeLog()
+    record(log, *[("review", "create", i) for i in range(1, 6)])
+    page = log.since(0, limit=2)
+    assert seqs(page) == [1, 2]
+    assert (page.next_seq, page.has_more, page.resync_required) == (2, True, False)
+    page = log.since(page.next_seq, limit=10)
+    assert seqs(page) == [3, 4, 5]
+    assert not page.has_more
+    empty = log.since(5)
+    assert (empty.entries, empty.next_seq, empty.resync_required) == ([], 5, False)
+
+
+def test_compaction_keeps_only_the_latest_entry_per_entity():
+    log = ChangeLog()
+    record(
+        log,
+        ("review", "create", 1),
+        ("review", "update", 1),
+        ("property", "update", 1),
+        ("review", "bulk_create", None),
+        ("review", "update", 1),
+    )
+    assert log.compact() == 2
+    assert [(e.entity, e.op, e.entity_id) for e in log.since(0).entries] == [
+        ("property", "update", 1),
+        ("review", "bulk_create", None),
+        ("review", "update", 1),
+    ]
+    assert log.stats()["compacted"] == 2
+
+
+def test_trimming_compacts_first_and_then_raises_the_floor():
+    log = ChangeLog(max_entries=4)
+    # Siete ediciones de la misma reseña: al pasar el tope se compactan en
+    # la última y no sube el piso.
+    record(log, *[("review", "update", 1)] * 7)
+    assert log.size() <= 4
+    assert (log.floor, log.evicted) == (0, 0)
+    assert seqs(log.since(0))[-1] == 7
+
+    log = ChangeLog(max_entries=4)
+    record(log, *[("review", "create", i) for i in range(1, 6)])
+    log.configure(4)
+    assert seqs(log.since(log.floor)) == [2, 3, 4, 5]
+    assert (log.floor, log.evicted) == (1, 1)
+
+
+def test_clients_behind_the_floor_or_ahead_of_the_log_must_resync():
+    log = ChangeLog(max_entries=2)
+    record(log, *[("review", "create", i) for i in range(1, 4)])
+    log.configure(2)
+    assert log.since(0).resync_required
+    assert not log.since(log.floor).resync_required
+    # Secuencia de otro arranque del proceso.
+    assert log.since(log.latest + 10).resync_required
+
+
+def test_clear_keeps_clients_at_the_latest_sequence_in_sync():
+    log = ChangeLog()
+    record(log, *[("review", "create", i) for i in range(1, 4)])
+    log.clear()
+    assert (log.size(), log.floor, log.latest) == (0, 3, 3)
+    assert not log.since(3).resync_required
+    assert log.since(2).resync_required
+
+
+def test_configure_rejects_a_non_positive_cap():
+    with pytest.raises(ValueError):
+        ChangeLog().configure(0)
+
+
+def test_changes_endpoint_returns_current_state_and_pages(client):
+    since = events.last_seq
+    property_id = client.post("/api/properties", json={"address": "CDC 1", "body": "b", "rating": 3}).json()["id"]
+    client.put(f"/api/properties/{property_id}", json={"address": "CDC 1b", "body": "b", "rating": 3})
+    review = {"title": "t", "body": "changelog review body", "rating": 4}
+    review_id = client.post(f"/api/properties/{property_id}/reviews", json=review).json()["id"]
+    client.delete(f"/api/reviews/{review_id}")
+
+    first = client.get("/api/changes", params={"since": since, "limit": 2}).json()
+    assert first["has_more"] and not first["resync_required"]
+    assert [(c["entity"], c["op"]) for c in first["changes"]] == [("property", "create"), ("property", "update")]
+    # `data` es el estado actual, no el del momento del cambio.
+    assert first["changes"][0]["data"]["address"] == "CDC 1b"
+
+    rest = client.get("/api/changes", params={"since": first["next"]}).json()
+    assert [(c["entity"], c["op"], c["id"]) for c in rest["changes"]] == [
+        ("review", "create", review_id),
+        ("review", "delete", review_id),
+    ]
+    assert rest["changes"][0]["data"] is None
+    assert rest["changes"][1]["parent_id"] == property_id
+    assert rest["latest"] == events.last_seq
+
+
+def test_changes_endpoint_asks_stale_clients_to_resync(client):
+    body = client.get("/api/changes", params={"since": events.last_seq + 1000}).json()
+    assert body["resync_required"] and body["changes"] == []
+    assert client.get("/api/changes", params={"since": -1}).status_code == 422
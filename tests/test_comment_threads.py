@@ -0,0 +1,106 @@
+import pytest
+
+from repository.comment_repository import comment_repository
+
+
+@pytest.fixture
+def review_id(client, request):
+    property_id = client.post(
+        "/api/properties", json={"address": f"Thread {request.node.name}", "body": "b", "rating": 3}
+    ).json()["id"]
+    review = {"title": "t", "body": f"thread review for {request.node.name}", "rating": 4}
+    return client.post(f"/api/properties/{property_id}/reviews", json=review).json()["id"]
+
+
+def comment(client, review_id, body, parent_id=None):
+    response = client.post(f"/api/reviews/{review_id}/comments", json={"body": body, "parent_id": parent_id})
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+def shape(nodes):
+    """El hilo como (body, respuestas) anidados."""
+    return [(node["body"], shape(node["replies"])) for node in nodes]
+
+
+@pytest.fixture
+def tree(client, review_id):
+    """
+    a
+    ├── a1
+    │   └── a1x
+    └── a2
+    b
+    """
+    ids = {"a": comment(client, review_id, "a")}
+    ids["a1"] = comment(client, review_id, "a1", ids["a"])
+    ids["b"] = comment(client, review_id, "b")
+    ids["a2"] = comment(client, review_id, "a2", ids["a"])
+    ids["a1x"] = comment(client, review_id, "a1x", ids["a1"])
+    return ids
+
+
+def test_thread_is_preorder_with_depth_and_reply_counts(review_id, tree):
+    entries = comment_repository.thread(review_id)
+    assert [(e.comment.body, e.depth, e.replies) for e in entries] == [
+        ("a", 0, 2),
+        ("a1", 1, 1),
+        ("a1x", 2, 0),
+        ("a2", 1, 0),
+        ("b", 0, 0),
+    ]
+
+
+def test_nested_thread_over_http(client, review_id, tree):
+    nodes = client.get(f"/api/reviews/{review_id}/comments", params={"depth": 10}).json()
+    assert shape(nodes) == [("a", [("a1", [("a1x", [])]), ("a2", [])]), ("b", [])]
+    assert nodes[0]["reply_count"] == 2
+
+
+def test_max_depth_cuts_replies_but_keeps_their_count(client, review_id, tree):
+    nodes = client.get(f"/api/reviews/{review_id}/comments", params={"depth": 0}).json()
+    assert shape(nodes) == [("a", []), ("b", [])]
+    assert [node["reply_count"] for node in nodes] == [2, 0]
+    nodes = client.get(f"/api/reviews/{review_id}/comments", params={"depth": 1}).json()
+    assert shape(nodes) == [("a", [("a1", []), ("a2", [])]), ("b", [])]
+
+
+def test_subtree_and_top_level_paging(client, review_id, tree):
+    url = f"/api/reviews/{review_id}/comments"
+    assert shape(client.get(url, params={"parent_id": tree["a"], "depth": 5}).json()) == [
+        ("a1", [("a1x", [])]),
+        ("a2", []),
+    ]
+    assert shape(client.get(url, params={"depth": 0, "offset": 1, "limit": 1}).json()) == [("b", [])]
+    # Sin depth ni parent_id: lista plana en orden de creación.
+    assert [c["body"] for c in client.get(url).json()] == ["a", "a1", "b", "a2", "a1x"]
+
+
+def test_parent_must_belong_to_the_same_review(client, review_id, tree):
+    other = client.post(
+        "/api/properties", json={"address": "Thread other", "body": "b", "rating": 3}
+    ).json()["id"]
+    other_review = client.post(
+        f"/api/properties/{other}/reviews", json={"title": "t", "body": "other thread review", "rating": 4}
+    ).json()["id"]
+    response = client.post(f"/api/reviews/{other_review}/comments", json={"body": "x", "parent_id": tree["a"]})
+    assert response.status_code == 404
+    assert client.get(f"/api/reviews/{other_review}/comments", params={"parent_id": tree["a"]}).status_code == 404
+
+
+def test_deleting_a_reply_reparents_its_children_to_the_grandparent(client, review_id, tree):
+    assert client.delete(f"/api/comments/{tree['a1']}").status_code == 200
+    nodes = client.get(f"/api/reviews/{review_id}/comments", params={"depth": 10}).json()
+    # a1x pasa a colgar de "a", en orden de creación junto a a2.
+    assert shape(nodes) == [("a", [("a2", []), ("a1x", [])]), ("b", [])]
+    assert comment_repository.get(tree["a1x"]).parent_id == tree["a"]
+
+
+def test_deleting_a_top_level_comment_promotes_its_replies(client, review_id, tree):
+    client.delete(f"/api/comments/{tree['a']}")
+    entries = comment_repository.thread(review_id)
+    # Las respuestas de "a" quedan de primer nivel, en orden de creación y
+    # con su propio subárbol.
+    assert [(e.comment.body, e.depth) for e in entries] == [("a1", 0), ("a1x", 1), ("b", 0), ("a2", 0)]
+    assert comment_repository.get(tree["a1"]).parent_id is None
+    assert [e.comment.body for e in comment_repository.thread(review_id, parent_id=tree["a1"])] == ["a1x"]
@@ -0,0 +1,88 @@
+import pytest
+
+from repository.history import EditHistory
+
+
+def test_changes_rebuilds_new_values_from_the_current_state():
+    history = EditHistory()
+    history.record("property", 1, {"rating": 1})
+    history.record("property", 1, {"rating": 2, "body": "a"})
+    changes = history.changes("property", 1, {"rating": 3, "body": "b"})
+    assert [c["fields"] for c in changes] == [
+        {"rating": {"from": 2, "to": 3}, "body": {"from": "a", "to": "b"}},
+        {"rating": {"from": 1, "to": 2}},
+    ]
+    assert history.changes("property", 1, {"rating": 3, "body": "b"}, offset=1, limit=1)[0]["fields"] == {
+        "rating": {"from": 1, "to": 2}
+    }
+
+
+def test_empty_edits_take_no_history_and_per_entity_cap_drops_the_oldest():
+    history = EditHistory(max_per_entity=2)
+    assert history.record("review", 1, {}) is None
+    for value in range(5):
+        history.record("review", 1, {"rating": value})
+    assert history.count("review", 1) == 2
+    assert history.pop("review", 1).old == {"rating": 4}
+    assert history.pop("review", 1).old == {"rating": 3}
+    assert history.pop("review", 1) is None
+
+
+def test_global_cap_evicts_the_least_recently_edited_entity():
+    history = EditHistory(max_entries=3)
+    history.record("review", 1, {"rating": 1})
+    history.record("review", 2, {"rating": 1})
+    history.record("review", 1, {"rating": 2})
+    history.record("review", 3, {"rating": 1})
+    assert history.count("review", 2) == 0
+    assert history.count("review", 1) == 2
+    assert history.stats()["evicted_entries"] == 1
+
+
+def test_clear_resets_every_counter():
+    history = EditHistory(max_entries=1)
+    history.record("review", 1, {"rating": 1})
+    history.record("review", 2, {"rating": 1})
+    history.clear()
+    assert history.stats() == {"entities": 0, "entries": 0, "bytes": 0, "evicted_entries": 0}
+
+
+@pytest.fixture
+def review(client):
+    property_id = client.post("/api/properties", json={"address": "History 1", "body": "b", "rating": 3}).json()["id"]
+    return client.post(
+        f"/api/properties/{property_id}/reviews",
+        json={"title": "first", "body": "history review original text", "rating": 2},
+    ).json()
+
+
+def test_undo_restores_edits_in_reverse_order(client, review):
+    url = f"/api/reviews/{review['id']}"
+    client.put(url, json={"title": "second", "body": "history review original text", "rating": 4})
+    client.put(url, json={"title": "third", "body": "history review original text", "rating": 5})
+
+    items = client.get(f"{url}/history").json()["items"]
+    assert [item["fields"]["title"] for item in items] == [
+        {"from": "second", "to": "third"},
+        {"from": "first", "to": "second"},
+    ]
+    assert client.post(f"{url}/undo").json()["title"] == "second"
+    assert client.post(f"{url}/undo").json()["rating"] == 2
+    assert client.post(f"{url}/undo").status_code == 409
+
+
+@pytest.mark.parametrize("entity", ["properties", "reviews", "comments"])
+def test_undo_and_history_of_missing_entities(client, entity):
+    assert client.post(f"/api/{entity}/999999/undo").status_code == 404
+    assert client.get(f"/api/{entity}/999999/history").status_code == 404
+
+
+def test_unknown_entity_segment(client):
+    assert client.post("/api/users/1/undo").status_code == 404
+
+
+def test_deleting_an_entity_drops_its_history(client, review):
+    url = f"/api/reviews/{review['id']}"
+    client.put(url, json={"title": "edited", "body": "x", "rating": 1})
+    client.delete(url)
+    assert client.get(f"{url}/history").status_code == 404
@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+
+import pytest
+
+from repository.indexes import HashIndex, IndexSet, OrderedIndex
+from repository.review_repository import review_repository
+
+
+def entity(entity_id, **fields):
+    return SimpleNamespace(id=entity_id, **fields)
+
+
+def test_hash_index_lookup_keeps_insertion_order_and_drops_empty_buckets():
+    index = HashIndex("city")
+    a, b, c = entity(1, city="x"), entity(2, city="y"), entity(3, city="x")
+    index.bulk_add([a, b, c])
+    assert list(index.lookup("x")) == [a, c]
+    index.remove(a, "x")
+    index.remove(c, "x")
+    assert index.count("x") == 0
+    assert dict(index.counts()) == {"y": 1}
+
+
+def test_ordered_index_range_bounds_and_direction():
+    index = OrderedIndex("rating")
+    rows = [entity(i, rating=r) for i, r in enumerate([3, 1, 5, 3, 4], start=1)]
+    for row in rows:
+        index.add(row)
+    assert [e.rating for e in index.range(3, 4)] == [3, 3, 4]
+    assert [e.id for e in index.range(3, 3)] == [1, 4]
+    assert [e.rating for e in index.range(low=3, low_inclusive=False, descending=True)] == [5, 4]
+    assert index.count_range(None, 3, high_inclusive=False) == 1
+
+
+def test_index_set_follows_updates():
+    indexes = IndexSet(OrderedIndex("rating"), HashIndex("owner"))
+    row = entity(1, rating=2, owner="a")
+    indexes.on_create(row)
+    old = indexes.snapshot(row)
+    row.rating, row.owner = 5, "b"
+    indexes.on_update(row, old)
+    assert list(indexes.find("owner", "b")) == [row]
+    assert list(indexes.find("owner", "a")) == []
+    assert indexes.count("rating", low=4) == 1
+    with pytest.raises(ValueError):
+        indexes.count("owner", low=1)
+
+
+@pytest.fixture
+def property_with_reviews(client):
+    property_id = client.post("/api/properties", json={"address": "Index St 1", "body": "b", "rating": 3}).json()["id"]
+    for i, rating in enumerate([5, 2, 4, 5, 1]):
+        client.post(
+            f"/api/properties/{property_id}/reviews",
+            json={"title": f"t{i}", "body": f"index review {i} with words {i * 13}", "rating": rating},
+        )
+    return client, property_id
+
+
+def test_rating_filters_on_property_reviews_use_the_planner(property_with_reviews, monkeypatch):
+    client, property_id = property_with_reviews
+
+    def linear_scan(*_args, **_kwargs):
+        raise AssertionError("filtered listing should not scan the property's list")
+
+    monkeypatch.setattr(review_repository, "list_by_property", linear_scan)
+    response = client.get(f"/api/properties/{property_id}/reviews?min_rating=4")
+    assert response.status_code == 200
+    # Sin sort: orden de alta.
+    assert [r["title"] for r in response.json()] == ["t0", "t2", "t3"]
+
+    response = client.get(f"/api/properties/{property_id}/reviews?max_rating=4&sort=-rating")
+    assert [r["rating"] for r in response.json()] == [4, 2, 1]
+
+
+def test_property_reviews_rejects_unknown_sort_with_filters(property_with_reviews):
+    client, property_id = property_with_reviews
+    assert client.get(f"/api/properties/{property_id}/reviews?rating=5&sort=bogus").status_code == 400
@@ -0,0 +1,148 @@
+import asyncio
+import inspect
+
+import pytest
+
+import api.main
+from api.jobs import JobScheduler
+from repository.comment_repository import comment_repository
+from repository.review_repository import review_repository
+
+
+@pytest.fixture
+def deferred(monkeypatch):
+    """Retiene los barridos encolados en lugar de correrlos en el momento."""
+    pending = []
+    monkeypatch.setattr(api.main.jobs, "defer", lambda name, fn, key=None, retry=None: pending.append((name, fn)))
+    return pending
+
+
+def run_sweeps(pending):
+    while pending:
+        _name, fn = pending.pop(0)
+        result = fn()
+        if inspect.iscoroutine(result):
+            asyncio.run(result)
+
+
+@pytest.fixture
+def listing(client, request):
+    """Una propiedad favorita con una reseña comentada."""
+    address = f"Orphan {request.node.name}"
+    property_id = client.post("/api/properties", json={"address": address, "body": "b", "rating": 3}).json()["id"]
+    review = {"title": "t", "body": f"orphan review {request.node.name}", "rating": 2}
+    review_id = client.post(f"/api/properties/{property_id}/reviews", json=review).json()["id"]
+    comment_id = client.post(f"/api/reviews/{review_id}/comments", json={"body": "c"}).json()["id"]
+    client.post(f"/api/favorites/{property_id}")
+    return property_id, review_id, comment_id
+
+
+def test_reviews_and_comments_of_a_deleted_property_disappear_before_the_sweep(client, deferred, listing):
+    property_id, review_id, comment_id = listing
+    assert client.delete(f"/api/properties/{property_id}").status_code == 200
+    assert [name for name, _fn in deferred] == [
+        f"sweep reviews of property {property_id}",
+        f"unfavorite property {property_id}",
+    ]
+
+    # Siguen en la tabla, pero ninguna lectura las devuelve.
+    assert review_repository._table.get(review_id) is not None
+    assert client.get(f"/api/reviews/{review_id}").status_code == 404
+    assert client.get("/api/reviews", params={"property_id": property_id}).json() == []
+    assert client.get("/api/reviews", params={"ids": str(review_id)}).json() == []
+    assert review_id not in [r["id"] for r in client.get("/api/reviews", params={"filter": "rating=2"}).json()]
+    assert client.put(f"/api/reviews/{review_id}", json={"title": "x", "body": "y", "rating": 1}).status_code == 404
+    assert client.delete(f"/api/reviews/{review_id}").status_code == 404
+    assert client.put(f"/api/comments/{comment_id}", json={"body": "x"}).status_code == 404
+    assert client.get(f"/api/reviews/{review_id}/comments", params={"depth": 1}).status_code == 404
+    assert comment_repository.find("review_id", review_id).size() == 0
+    activity = client.get("/api/activity", params={"limit": 1000}).json()
+    assert review_id not in [a["review"]["id"] for a in activity if a["kind"] == "review"]
+    assert comment_id not in [a["comment"]["id"] for a in activity if a["kind"] == "comment"]
+    assert property_id not in [p["id"] for p in client.get("/api/favorites").json()]
+
+    explain = client.get("/api/reviews", params={"filter": "rating=2", "explain": "true"}).json()
+    assert f"property_id not in ({property_id})" in explain["residual"]
+
+    run_sweeps(deferred)
+    assert review_repository._table.get(review_id) is None
+    assert comment_repository._table.get(comment_id) is None
+    assert not review_repository.has_orphans()
+    assert not comment_repository._orphaned
+    assert not api.main.favorites_repository.contains(property_id)
+
+
+def test_comments_of_a_deleted_review_disappear_before_the_sweep(client, deferred, listing):
+    _property_id, review_id, comment_id = listing
+    assert client.delete(f"/api/reviews/{review_id}").status_code == 200
+    assert [name for name, _fn in deferred] == [f"sweep comments of review {review_id}"]
+    assert comment_repository._table.get(comment_id) is not None
+    assert comment_repository.get(comment_id) is None
+    assert client.delete(f"/api/comments/{comment_id}").status_code == 404
+
+    run_sweeps(deferred)
+    assert comment_repository._table.get(comment_id) is None
+    assert not comment_repository._orphaned
+
+
+def test_other_properties_are_unaffected_while_a_sweep_is_pending(client, deferred, listing):
+    property_id, _review_id, _comment_id = listing
+    other = client.post("/api/properties", json={"address": "Orphan bystander", "body": "b", "rating": 3}).json()["id"]
+    kept = client.post(
+        f"/api/properties/{other}/reviews", json={"title": "t", "body": "bystander review", "rating": 5}
+    ).json()["id"]
+    client.delete(f"/api/properties/{property_id}")
+    assert client.get(f"/api/reviews/{kept}").status_code == 200
+    assert [r["id"] for r in client.get("/api/reviews", params={"property_id": other}).json()] == [kept]
+    run_sweeps(deferred)
+
+
+def test_sweeps_yield_between_chunks(client, deferred, listing, monkeypatch):
+    property_id, _review_id, _comment_id = listing
+    for i in range(4):
+        review = {"title": "t", "body": f"chunked orphan review {i}", "rating": 1}
+        client.post(f"/api/properties/{property_id}/reviews", json=review)
+    client.delete(f"/api/properties/{property_id}")
+    monkeypatch.setattr("repository.review_repository.SWEEP_CHUNK", 2)
+    sweep = review_repository.delete_by_property(property_id)
+    # Cinco reseñas en tramos de dos: cede tres veces y la marca se quita
+    # al final.
+    assert [sweep.send(None) for _ in range(3)] == [None, None, None]
+    assert review_repository.has_orphans()
+    with pytest.raises(StopIteration) as done:
+        sweep.send(None)
+    assert done.value.value == 5
+    assert not review_repository.has_orphans()
+    deferred.clear()
+
+
+def test_sweep_jobs_cannot_be_cancelled_and_are_retried_on_failure():
+    async def scenario():
+        scheduler = JobScheduler(workers=1)
+        attempts = []
+
+        async def sweep():
+            attempts.append(len(attempts))
+            if len(attempts) == 1:
+                raise RuntimeError("boom")
+
+        scheduler.start()
+        job = scheduler.defer("sweep", sweep, key="sweep", retry=0.0)
+        assert not scheduler.cancel(job.id)
+        for _ in range(20):
+            await asyncio.sleep(0)
+        await scheduler.stop()
+        return job, attempts
+
+    job, attempts = asyncio.run(scenario())
+    assert attempts == [0, 1]
+    assert (job.state, job.failures, job.runs) == ("done", 1, 2)
+
+
+def test_inline_sweeps_run_to_completion_without_the_scheduler(client, listing):
+    property_id, review_id, comment_id = listing
+    assert not api.main.jobs.started
+    client.delete(f"/api/properties/{property_id}")
+    assert review_repository._table.get(review_id) is None
+    assert comment_repository._table.get(comment_id) is None
+    assert not review_repository.has_orphans()
@@ -0,0 +1,121 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.main import app
+from repository.indexes import HashIndex, IndexSet, OrderedIndex
+from repository.query import Predicate, QuerySpec, parse_query, plan_query
+
+FIELDS = {"id": int, "city": str, "rating": int}
+
+
+@pytest.mark.parametrize(
+    "expr, expected",
+    [
+        ("rating>=4", [Predicate("rating", ">=", 4)]),
+        ("rating==3", [Predicate("rating", "=", 3)]),
+        ("rating!=-1", [Predicate("rating", "!=", -1)]),
+        ("city='Lima', rating<5", [Predicate("city", "=", "Lima"), Predicate("rating", "<", 5)]),
+    ],
+)
+def test_parse_query_converts_values_to_the_field_type(expr, expected):
+    assert parse_query(expr, None, None, FIELDS).predicates == expected
+
+
+@pytest.mark.parametrize(
+    "expr, message",
+    [
+        ("rating>=4.5", "Invalid value for rating"),
+        ("rating>=abc", "Invalid value for rating"),
+        ("rating=", "Invalid value for rating"),
+        ("rating=>4", "Unknown operator"),
+        ("rating!4", "Unknown operator"),
+        ("owner=1", "Unknown field"),
+        ("rating", "Invalid filter condition"),
+    ],
+)
+def test_parse_query_rejects_bad_filters(expr, message):
+    with pytest.raises(ValueError, match=message):
+        parse_query(expr, None, None, FIELDS)
+
+
+def test_parse_query_sort_and_limit():
+    spec = parse_query(None, "-rating", 3, FIELDS)
+    assert (spec.sort, spec.descending, spec.limit) == ("rating", True, 3)
+    with pytest.raises(ValueError):
+        parse_query(None, "owner", None, FIELDS)
+    with pytest.raises(ValueError):
+        parse_query(None, None, -1, FIELDS)
+
+
+@pytest.fixture
+def table():
+    rows = [SimpleNamespace(id=i, city="Lima" if i % 4 == 0 else "Cusco", rating=i % 5 + 1) for i in range(1, 201)]
+    indexes = IndexSet(OrderedIndex("rating"), HashIndex("city"))
+    indexes.on_bulk_create(rows)
+    by_id = {row.id: row for row in rows}
+
+    def plan(spec):
+        return plan_query(spec, indexes, lambda: rows, len(rows), lambda ids: [by_id[i] for i in ids if i in by_id])
+
+    return rows, plan
+
+
+def brute_force(rows, spec):
+    matched = [r for r in rows if all(p.matches(r) for p in spec.predicates)]
+    if spec.sort:
+        matched.sort(key=lambda r: (getattr(r, spec.sort), r.id), reverse=spec.descending)
+    return matched if spec.limit is None else matched[: spec.limit]
+
+
+@pytest.mark.parametrize(
+    "spec, access",
+    [
+        (QuerySpec(), "full_scan"),
+        (QuerySpec([Predicate("city", "=", "Lima")]), "index_scan"),
+        (QuerySpec([Predicate("rating", "=", 5)]), "index_scan"),
+        (QuerySpec([Predicate("rating", ">=", 5), Predicate("city", "=", "Cusco")]), "range_scan"),
+        (QuerySpec([Predicate("rating", ">", 1), Predicate("rating", "<", 3)], sort="rating", descending=True), "range_scan"),
+        # Recorrer el índice de orden hasta 5 filas es más barato que leer la cubeta.
+        (QuerySpec([Predicate("city", "=", "Lima")], sort="rating", limit=5), "range_scan"),
+        (QuerySpec(sort="rating", limit=10), "range_scan"),
+        (QuerySpec([Predicate("id", "in", (7, 3, 999))]), "id_lookup"),
+    ],
+)
+def test_plans_return_the_same_rows_as_a_full_scan(table, spec, access):
+    rows, plan = table
+    chosen = plan(spec)
+    assert chosen.explain()["access"] == access
+    result = chosen.execute()
+    if spec.sort is None:
+        result = sorted(result, key=lambda r: r.id)
+    assert result == brute_force(rows, spec)
+
+
+def test_id_lookup_keeps_the_requested_order(table):
+    _rows, plan = table
+    result = plan(QuerySpec([Predicate("id", "in", (7, 3, 999))])).execute()
+    assert [r.id for r in result] == [7, 3]
+
+
+def test_sorted_limit_uses_a_bounded_heap_when_the_filter_is_selective(table):
+    _rows, plan = table
+    explained = plan(QuerySpec([Predicate("city", "=", "Lima")], sort="id", limit=3)).explain()
+    assert explained["order"] == "top_k_heap"
+    assert explained["residual"] == []
+
+
+@pytest.mark.parametrize("expr", ["rating>=4.5", "rating>=abc", "rating=>4", "nope=1"])
+def test_bad_filters_are_a_400_not_a_500(expr):
+    client = TestClient(app)
+    assert client.get("/api/properties", params={"filter": expr}).status_code == 400
+    assert client.get("/api/reviews", params={"filter": expr}).status_code == 400
+
+
+def test_explain_over_http():
+    client = TestClient(app)
+    client.post("/api/properties", json={"address": "Planner 1", "body": "b", "rating": 4})
+    explained = client.get("/api/properties", params={"filter": "rating>=4", "explain": "true"}).json()
+    assert explained["access"] in ("range_scan", "full_scan")
+    assert explained["bounds"] is None or explained["bounds"]["low"] == 4
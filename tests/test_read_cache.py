@@ -0,0 +1,160 @@
+import asyncio
+
+import pytest
+
+from api.read_cache import ReadCoalescer, read_cache
+from api.settings import settings
+from repository.events import Change
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def counting(value):
+    calls = []
+
+    def compute():
+        calls.append(value)
+        return value
+
+    return compute, calls
+
+
+def test_identical_concurrent_reads_share_one_computation():
+    cache = ReadCoalescer(ttl=0)
+    compute, calls = counting("body")
+
+    async def scenario():
+        return await asyncio.gather(*(cache.get("k", compute) for _ in range(5)))
+
+    assert run(scenario()) == ["body"] * 5
+    assert calls == ["body"]
+    assert cache.stats()["coalesced"] == 4
+    assert cache.stats()["cached"] == 0
+
+
+def test_errors_reach_every_waiter_and_are_not_cached():
+    cache = ReadCoalescer(ttl=10)
+
+    def fail():
+        raise KeyError("boom")
+
+    async def scenario():
+        return await asyncio.gather(*(cache.get("k", fail) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(result, KeyError) for result in run(scenario()))
+    assert cache.stats()["computed"] == 1
+    assert cache.stats()["cached"] == 0
+
+
+def test_ttl_expiry_recomputes(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("api.read_cache.monotonic", lambda: now[0])
+    cache = ReadCoalescer(ttl=1.0)
+    compute, calls = counting("v")
+    run(cache.get("k", compute))
+    run(cache.get("k", compute))
+    assert len(calls) == 1
+    now[0] += 1.5
+    run(cache.get("k", compute))
+    assert len(calls) == 2
+
+
+def test_max_entries_evicts_the_oldest_result():
+    cache = ReadCoalescer(ttl=60, max_entries=2)
+    for key in "abc":
+        run(cache.get(key, lambda key=key: key, [("property", ord(key))]))
+    assert list(cache._cache) == ["b", "c"]
+    # La etiqueta de la clave descartada ya no apunta a ella.
+    assert ("property", ord("a")) not in cache._by_tag
+    compute, calls = counting("a")
+    run(cache.get("a", compute))
+    assert calls == ["a"]
+    assert list(cache._cache) == ["c", "a"]
+
+
+def test_invalidation_only_drops_reads_of_the_changed_entity():
+    cache = ReadCoalescer(ttl=60)
+    run(cache.get("detail-1", lambda: 1, [("property", 1)]))
+    run(cache.get("detail-2", lambda: 2, [("property", 2)]))
+    run(cache.get("favorites", lambda: [], [("favorite", None), ("property", None)]))
+    run(cache.get("untagged", lambda: 0))
+
+    cache.invalidate(Change("review", "create", 10, parent_id=1, seq=1))
+    assert set(cache._cache) == {"detail-2", "favorites"}
+
+    cache.invalidate(Change("favorite", "create", 2, parent_id=2, seq=2))
+    assert set(cache._cache) == set()
+
+
+def test_property_change_drops_its_views_and_every_favorites_list():
+    cache = ReadCoalescer(ttl=60)
+    run(cache.get("detail-1", lambda: 1, [("property", 1)]))
+    run(cache.get("detail-2", lambda: 2, [("property", 2)]))
+    run(cache.get("favorites", lambda: [], [("favorite", None), ("property", None)]))
+    cache.invalidate(Change("property", "update", 1, seq=1))
+    assert set(cache._cache) == {"detail-2"}
+    assert cache.stats()["invalidated_entries"] == 2
+
+
+def test_bulk_load_flushes_everything():
+    cache = ReadCoalescer(ttl=60)
+    run(cache.get("detail-1", lambda: 1, [("property", 1)]))
+    cache.invalidate(Change("review", "bulk_create", seq=1))
+    assert cache.stats()["cached"] == 0
+    assert cache._by_tag == {}
+
+
+def test_write_during_computation_detaches_it_from_later_readers():
+    cache = ReadCoalescer(ttl=60)
+    compute, calls = counting("old")
+
+    async def scenario():
+        first = asyncio.create_task(cache.get("detail-1", compute, [("property", 1)]))
+        other = asyncio.create_task(cache.get("detail-2", lambda: "two", [("property", 2)]))
+        await asyncio.sleep(0)
+        cache.invalidate(Change("property", "update", 1, seq=1))
+        assert "detail-1" not in cache._inflight
+        assert "detail-2" in cache._inflight
+        return await first, await other
+
+    assert run(scenario()) == ("old", "two")
+    # El resultado desligado no se guarda; el de otra propiedad sí.
+    assert set(cache._cache) == {"detail-2"}
+
+
+@pytest.fixture
+def client(client):
+    """El cliente de conftest con un TTL largo, para que nada venza durante el test."""
+    read_cache.configure(ttl=60, max_entries=settings.read_cache_entries)
+    yield client
+    read_cache.configure(settings.read_cache_ttl, settings.read_cache_entries)
+
+
+def test_reviews_endpoint_sees_writes_to_its_property_only(client):
+    first = client.post("/api/properties", json={"address": "Cache 1", "body": "b", "rating": 3}).json()["id"]
+    second = client.post("/api/properties", json={"address": "Cache 2", "body": "b", "rating": 3}).json()["id"]
+    assert client.get(f"/api/properties/{first}/reviews").json() == []
+    assert client.get(f"/api/properties/{second}/reviews").json() == []
+    cached = read_cache.stats()["cached"]
+
+    review = {"title": "t", "body": "cached review body", "rating": 4}
+    client.post(f"/api/properties/{first}/reviews", json=review)
+    assert read_cache.stats()["cached"] == cached - 1
+    assert [r["title"] for r in client.get(f"/api/properties/{first}/reviews").json()] == ["t"]
+
+    hits = read_cache.hits
+    assert client.get(f"/api/properties/{second}/reviews").json() == []
+    assert read_cache.hits == hits + 1
+
+
+def test_property_detail_page_reflects_favorites_and_edits(client):
+    property_id = client.post("/api/properties", json={"address": "Cache page", "body": "b", "rating": 3}).json()["id"]
+    assert f'action="/favorites/{property_id}"' in client.get(f"/properties/{property_id}").text
+    client.post(f"/api/favorites/{property_id}")
+    page = client.get(f"/properties/{property_id}").text
+    assert f'action="/favorites/{property_id}/delete"' in page
+    client.put(f"/api/properties/{property_id}", json={"address": "Cache page 2", "body": "b", "rating": 3})
+    assert "Cache page 2" in client.get(f"/properties/{property_id}").text
+    assert any(p["address"] == "Cache page 2" for p in client.get("/api/favorites").json())
@@ -0,0 +1,63 @@
+import random
+
+import pytest
+
+from datastructures.DoubleLinkedList import DoubleLinkedList
+
+
+def linked(items):
+    lst = DoubleLinkedList()
+    for item in items:
+        lst.append(item)
+    return lst
+
+
+def assert_links_consistent(lst):
+    assert list(reversed(lst)) == list(lst)[::-1]
+    assert lst.size() == len(list(lst))
+
+
+@pytest.mark.parametrize("size", [0, 1, 2, 3, 7, 64, 129])
+@pytest.mark.parametrize("reverse", [False, True])
+def test_merge_sort_matches_sorted_and_is_stable(size, reverse):
+    rng = random.Random(size)
+    pairs = [(rng.randint(0, 5), i) for i in range(size)]
+    lst = linked(pairs)
+    lst.sort(key=lambda pair: pair[0], reverse=reverse)
+    assert list(lst) == sorted(pairs, key=lambda pair: pair[0], reverse=reverse)
+    assert_links_consistent(lst)
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_insert_sorted_keeps_the_order_of_a_sorted_list(reverse):
+    rng = random.Random(42)
+    lst = DoubleLinkedList()
+    inserted = []
+    for i in range(200):
+        item = (rng.randint(0, 20), i)
+        inserted.append(item)
+        lst.insert_sorted(item, key=lambda pair: pair[0], reverse=reverse)
+    assert list(lst) == sorted(inserted, key=lambda pair: pair[0], reverse=reverse)
+    assert_links_consistent(lst)
+
+
+def test_sorted_review_views_follow_creates_edits_and_deletes(client):
+    property_id = client.post("/api/properties", json={"address": "Sorted 1", "body": "b", "rating": 3}).json()["id"]
+    url = f"/api/properties/{property_id}/reviews"
+
+    def create(title, rating):
+        return client.post(url, json={"title": title, "body": f"sorted body {title} {rating}", "rating": rating}).json()
+
+    create("b", 3)
+    low = create("c", 1)
+    create("a", 5)
+    # Construye las vistas mantenidas antes de los cambios.
+    assert [r["title"] for r in client.get(url, params={"sort": "title"}).json()] == ["a", "b", "c"]
+    assert [r["rating"] for r in client.get(url, params={"sort": "-rating"}).json()] == [5, 3, 1]
+
+    create("d", 4)
+    client.put(f"/api/reviews/{low['id']}", json={"title": "c", "body": "edited", "rating": 5})
+    assert [r["title"] for r in client.get(url, params={"sort": "-rating"}).json()] == ["a", "c", "d", "b"]
+    client.delete(f"/api/reviews/{low['id']}")
+    assert [r["title"] for r in client.get(url, params={"sort": "title"}).json()] == ["a", "b", "d"]
+    assert client.get(url, params={"sort": "body"}).status_code == 400
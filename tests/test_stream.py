@@ -0,0 +1,127 @@
+import asyncio
+
+import pytest
+
+from api.main import change_stream
+from api.stream import ChangeStream, Subscription, change_topics, parse_topics
+from repository.events import Change
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def change(seq, entity="review", entity_id=1, parent_id=10, op="update"):
+    return Change(entity, op, entity_id, parent_id, seq)
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        ("reviews", ("reviews",)),
+        ("property:042, reviews,reviews", ("property:42", "reviews")),
+        ("review:7,comment:3", ("review:7", "comment:3")),
+    ],
+)
+def test_parse_topics(raw, expected):
+    assert parse_topics(raw) == expected
+
+
+@pytest.mark.parametrize("raw", ["", " , ", "nope", "property:x", "favorite:1", ",".join(f"review:{i}" for i in range(33))])
+def test_parse_topics_rejects(raw):
+    with pytest.raises(ValueError):
+        parse_topics(raw)
+
+
+def test_a_change_reaches_its_collection_itself_and_its_parent():
+    assert change_topics(change(1)) == ("reviews", "review:1", "property:10")
+    assert change_topics(Change("favorite", "create", 5, 5, 1)) == ("favorites", "property:5")
+    assert change_topics(Change("property", "bulk_create", seq=1)) == ("properties",)
+
+
+def test_publish_only_reaches_matching_subscribers():
+    stream = ChangeStream()
+    on_property = stream.subscribe(("property:10",))
+    on_comments = stream.subscribe(("comments",))
+    stream.publish(change(1))
+    assert len(on_property.queue) == 1
+    assert not on_comments.queue
+    assert b"id: 1\n" in on_property.drain()
+
+
+def overflowing(policy):
+    stream = ChangeStream(queue_size=2, policy=policy)
+    subscription = stream.subscribe(("reviews",))
+    for seq in range(1, 5):
+        stream.publish(change(seq))
+    return stream, subscription
+
+
+def test_drop_oldest_keeps_the_newest_messages_and_reports_the_loss():
+    stream, subscription = overflowing("drop_oldest")
+    body = subscription.drain().decode()
+    assert body.startswith('event: overflow\ndata: {"dropped": 2}')
+    assert "id: 3\n" in body and "id: 4\n" in body and "id: 1\n" not in body
+    assert stream.dropped == 2
+
+
+def test_drop_newest_keeps_the_oldest_messages():
+    stream, subscription = overflowing("drop_newest")
+    body = subscription.drain().decode()
+    assert '"dropped": 2' in body
+    assert "id: 1\n" in body and "id: 2\n" in body and "id: 3\n" not in body
+
+
+def test_disconnect_closes_and_unregisters_the_slow_subscriber():
+    stream, subscription = overflowing("disconnect")
+    assert subscription.closed
+    assert stream.subscribers() == 0
+    assert stream.disconnected == 1
+    assert subscription.drain() == b'event: overflow\ndata: {"dropped": 1}\n\n'
+
+
+def test_wait_times_out_and_wakes_on_a_message():
+    async def scenario():
+        subscription = Subscription(1, ("reviews",), 4)
+        assert await subscription.wait(0.01) is False
+        waiting = asyncio.create_task(subscription.wait(1.0))
+        await asyncio.sleep(0)
+        subscription.offer(b"x", "drop_oldest")
+        return await waiting
+
+    assert run(scenario()) is True
+
+
+def test_messages_subscribes_on_first_iteration_and_unsubscribes_on_close():
+    async def scenario():
+        stream = ChangeStream(heartbeat=0.01)
+        body = stream.messages(("reviews",))
+        # Sin recorrer el generador no queda nada registrado.
+        assert stream.subscribers() == 0
+        assert (await body.__anext__()).startswith(b"retry: ")
+        assert stream.subscribers() == 1
+        assert await body.__anext__() == b": keepalive\n\n"
+        stream.publish(change(1))
+        assert b"id: 1\n" in await body.__anext__()
+        await body.aclose()
+        return stream
+
+    assert run(scenario()).subscribers() == 0
+
+
+def test_messages_past_the_cap_only_ask_the_client_to_retry():
+    async def scenario():
+        stream = ChangeStream(max_subscribers=1)
+        stream.subscribe(("reviews",))
+        return [chunk async for chunk in stream.messages(("reviews",))], stream.subscribers()
+
+    assert run(scenario()) == ([b"retry: 3000\n\n"], 1)
+
+
+def test_stream_endpoint_validates_topics_and_caps_connections(client, monkeypatch):
+    assert client.get("/api/stream", params={"topics": "nope"}).status_code == 400
+    monkeypatch.setattr(change_stream, "max_subscribers", 0)
+    response = client.get("/api/stream", params={"topics": "reviews"})
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "5"
+    assert change_stream.subscribers() == 0